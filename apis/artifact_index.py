@@ -0,0 +1,242 @@
+"""
+In-memory index of artifact names and README text for POST /artifact/byRegEx.
+
+The index is loaded from the artifact table at startup and kept current by the
+ingest, update and delete endpoints, so a regex query never scans DynamoDB.
+Entries are kept sorted by artifact id, which doubles as the pagination
+cursor.
+
+Python's `re` cannot be interrupted mid-match and holds the GIL while it runs,
+so matching happens in a long-lived matcher process (apis.regex_matcher),
+started with "spawn" so the threaded API process is never forked. It keeps a
+copy of the index that is brought up to date before each query, and reports
+every artifact it has examined. When the per-query time budget runs out, the
+process is killed and replaced, and the page ends at the last examined
+artifact. An artifact whose match alone exceeds the budget is skipped. Names
+and README text are truncated to REGEX_NAME_CHARS / REGEX_README_CHARS to
+bound the cost of a single match.
+"""
+
+import bisect
+import logging
+import multiprocessing
+import os
+import re
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Pattern, Set, Tuple
+
+from apis import regex_matcher
+from apis.hf_client import HFClient
+from utils.url_parser import classify_url, extract_name_from_url
+
+
+logger = logging.getLogger("api")
+
+REGEX_TIME_BUDGET = float(os.getenv("REGEX_TIME_BUDGET", "0.5"))  # seconds per query
+REGEX_README_CHARS = int(os.getenv("REGEX_README_CHARS", "20000"))
+REGEX_NAME_CHARS = int(os.getenv("REGEX_NAME_CHARS", "256"))
+REGEX_MAX_PATTERN = 512
+MATCHER_START_TIMEOUT = 30  # seconds for a new matcher process to come up
+
+# spawn: never fork the API process along with its worker threads
+_mp = multiprocessing.get_context("spawn")
+
+Entry = Tuple[str, str, str]  # (name, type, readme)
+
+
+def compile_pattern(regex: str) -> Pattern:
+    """
+    Compile a client-supplied regex.
+
+    Raises:
+        ValueError: if the pattern is empty, too long or not a valid regex
+    """
+    if not regex or len(regex) > REGEX_MAX_PATTERN:
+        raise ValueError("Regex is empty or too long")
+    try:
+        return re.compile(regex)
+    except re.error as e:
+        raise ValueError(f"Invalid regex: {e}")
+
+
+def fetch_readme(url: str, artifact_type: str) -> Optional[str]:
+    """Best-effort README (card) text for a Hugging Face model or dataset URL."""
+    if artifact_type not in ("model", "dataset") or classify_url(url) not in ("model", "dataset"):
+        return None
+    owner, name = extract_name_from_url(url)
+    repo_id = f"{owner}/{name}" if owner else name
+    if not repo_id:
+        return None
+    hf = HFClient()
+    if artifact_type == "dataset":
+        return hf.dataset_card_text(repo_id)
+    return hf.model_card_text(repo_id)
+
+
+class ArtifactIndex:
+    def __init__(self, readme_chars: int = REGEX_README_CHARS, name_chars: int = REGEX_NAME_CHARS) -> None:
+        """
+        Args:
+            readme_chars (int): README characters kept (and searched) per artifact
+            name_chars (int): leading name characters searched per artifact
+        """
+        self.readme_chars = readme_chars
+        self.name_chars = name_chars
+        self._entries: Dict[int, Entry] = {}  # id -> (name, type, readme)
+        self._ids: List[int] = []
+        self._lock = threading.Lock()
+        # Matcher process; ids changed since its copy was last synced, or a full resync when it is new
+        self._matcher: Optional[Tuple[Any, Any]] = None
+        self._changed: Set[int] = set()
+        self._resync = True
+        self._search_lock = threading.Lock()  # one query at a time per matcher
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _put(self, artifact_id: int, entry: Entry) -> None:
+        if artifact_id not in self._entries:
+            bisect.insort(self._ids, artifact_id)
+        self._entries[artifact_id] = entry
+        self._changed.add(artifact_id)
+
+    def load(self, items) -> None:
+        """Replace the index contents with `items` (artifact table rows)."""
+        self.clear()
+        for item in items:
+            self.upsert(item)
+
+    def upsert(self, item: Dict[str, Any]) -> None:
+        """Add or update one artifact; keeps the cached README unless the item carries one."""
+        artifact_id = int(item["model_id"])
+        with self._lock:
+            _, _, readme = self._entries.get(artifact_id, ("", "", ""))
+            if item.get("readme") is not None:
+                readme = item["readme"][:self.readme_chars]
+            self._put(artifact_id, (item.get("name") or "", item.get("type") or "", readme))
+
+    def set_readme(self, artifact_id: int, readme: Optional[str]) -> None:
+        with self._lock:
+            if artifact_id in self._entries:
+                name, artifact_type, _ = self._entries[artifact_id]
+                self._entries[artifact_id] = (name, artifact_type, (readme or "")[:self.readme_chars])
+                self._changed.add(artifact_id)
+
+    def remove(self, artifact_id: int) -> None:
+        with self._lock:
+            if self._entries.pop(artifact_id, None) is not None:
+                del self._ids[bisect.bisect_left(self._ids, artifact_id)]
+                self._changed.add(artifact_id)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries = {}
+            self._ids = []
+            self._changed = set()
+            self._resync = True
+
+    def close(self) -> None:
+        """Stop the matcher process; the next search starts a new one."""
+        with self._search_lock:
+            self._stop_matcher()
+
+    def _stop_matcher(self) -> None:
+        if self._matcher is None:
+            return
+        process, conn = self._matcher
+        self._matcher = None
+        conn.close()
+        if process.is_alive():
+            process.kill()
+        process.join()
+
+    def _synced_matcher(self):
+        """Connection to a running matcher whose copy of the index is current (called under _search_lock)."""
+        if self._matcher is None:
+            conn, child_conn = _mp.Pipe()
+            process = _mp.Process(target=regex_matcher.serve, args=(child_conn,), daemon=True)
+            process.start()
+            child_conn.close()
+            self._matcher = (process, conn)
+            if not conn.poll(MATCHER_START_TIMEOUT):
+                self._stop_matcher()
+                raise RuntimeError("Regex matcher process did not start")
+            conn.recv_bytes()
+            with self._lock:
+                self._resync = True
+        _, conn = self._matcher
+        with self._lock:
+            reset = self._resync
+            changed = self._entries.keys() if reset else self._changed
+            upserts = {i: (self._entries[i][0], self._entries[i][2]) for i in changed if i in self._entries}
+            removed = [i for i in changed if i not in self._entries]
+            self._changed = set()
+            self._resync = False
+        try:
+            conn.send(("sync", reset, upserts, removed))
+            conn.recv_bytes()
+        except (EOFError, OSError):
+            self._stop_matcher()
+            with self._lock:
+                self._resync = True
+            raise RuntimeError("Regex matcher process exited")
+        return conn
+
+    def search(self, pattern: Pattern, limit: int, start_after: Optional[int] = None,
+               budget: float = REGEX_TIME_BUDGET,
+               clock: Callable[[], float] = time.perf_counter) -> Tuple[List[Dict[str, Any]], Optional[int]]:
+        """
+        Find artifacts whose name or README matches `pattern`, in id order.
+
+        Args:
+            pattern (Pattern): compiled regex
+            limit (int): maximum results to return
+            start_after (int): id of the last artifact examined by the previous page
+            budget (float): seconds this query may spend matching
+        Returns:
+            Tuple[List[dict], Optional[int]]: artifact summaries and the id to
+            resume after, or None when every artifact has been examined
+        """
+        with self._search_lock:
+            with self._lock:
+                start = bisect.bisect_right(self._ids, start_after) if start_after is not None else 0
+                first = self._ids[start] if start < len(self._ids) else None
+            if first is None:
+                return [], None
+            try:
+                conn = self._synced_matcher()
+            except RuntimeError:
+                # e.g. a matcher killed by the OS; one retry with a fresh process
+                conn = self._synced_matcher()
+
+            deadline = clock() + budget
+            results: List[Dict[str, Any]] = []
+            examined: Optional[int] = None
+            conn.send(("search", pattern, start_after, limit, self.name_chars))
+            try:
+                while True:
+                    # Always wait out the whole budget for the first artifact so every page makes progress
+                    timeout = budget if examined is None else deadline - clock()
+                    if timeout <= 0 or not conn.poll(timeout):
+                        break
+                    record = conn.recv_bytes()
+                    if record in (regex_matcher.MORE, regex_matcher.EXHAUSTED):
+                        return results, examined if record == regex_matcher.MORE else None
+                    examined, matched = regex_matcher.EXAMINED.unpack(record)
+                    if matched:
+                        with self._lock:
+                            entry = self._entries.get(examined)
+                        if entry is not None:
+                            results.append({"name": entry[0], "id": examined, "type": entry[1]})
+            except EOFError:
+                logger.warning(f"Regex matcher for {pattern.pattern!r} exited early")
+
+            # Out of budget: the matcher is mid-match, so replace it
+            self._stop_matcher()
+
+        if examined is None:
+            logger.warning(f"Regex {pattern.pattern!r} exceeded its time budget on artifact {first}; skipping it")
+            return results, first
+        logger.warning(f"Regex {pattern.pattern!r} ran out of time budget at artifact {examined}")
+        return results, examined
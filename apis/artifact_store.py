@@ -0,0 +1,674 @@
+"""
+Artifact storage backends.
+
+The API talks to an ArtifactStore instead of calling boto3 directly, so it can
+run (and be load-tested) without AWS. ARTIFACT_STORE selects the backend:
+
+    dynamodb  the MODEL_TABLE_NAME DynamoDB table (default)
+    memory    a process-local dict, emptied on restart
+    sqlite    a local SQLite file at ARTIFACT_STORE_PATH
+
+Items are plain dicts keyed by `model_id`. The `filters` accepted by scan() are
+a list of clauses: an item matches when it matches any clause, and a clause
+matches when every attribute in it equals the given value (or is one of the
+values, when a list is given). None means every item.
+
+The stores also hold the worker-id leases of apis.id_allocator. DynamoDB keeps
+them in the artifact table under reserved negative model_ids, which scan()
+never returns; the other backends keep them apart from the artifacts.
+"""
+
+import copy
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from decimal import Decimal
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from boto3.dynamodb.conditions import Attr, Key
+from boto3.dynamodb.types import TypeSerializer
+from botocore.exceptions import ClientError
+
+from apis.bulk_reset import bulk_reset
+from utils.telemetry import timed_call
+
+
+logger = logging.getLogger("api")
+
+ARTIFACT_STORE = os.getenv("ARTIFACT_STORE", "dynamodb")
+ARTIFACT_STORE_PATH = os.getenv("ARTIFACT_STORE_PATH", "./databases/artifacts.db")
+# Optional DynamoDB GSI with partition key `name`; query_by_name scans without it
+ARTIFACT_NAME_INDEX = os.getenv("ARTIFACT_NAME_INDEX")
+
+KEY = "model_id"
+LEASE_TYPE = "worker_lease"
+BATCH_GET_LIMIT = 100  # DynamoDB maximum per BatchGetItem
+TRANSACT_WRITE_LIMIT = 100  # DynamoDB maximum per TransactWriteItems
+MAX_UNPROCESSED_RETRIES = 8
+
+Filters = Optional[List[Dict[str, Any]]]
+Page = Tuple[List[Dict[str, Any]], Optional[Dict[str, Any]]]
+
+
+class ArtifactExistsError(Exception):
+    """Raised by put(..., if_absent=True) when the model_id is already taken."""
+
+
+class ArtifactNotFoundError(Exception):
+    """Raised by update(..., if_exists=True) when there is no such artifact."""
+
+
+def matches_filters(item: Dict[str, Any], filters: Filters) -> bool:
+    """Evaluate scan() filters against one item."""
+    if not filters:
+        return True
+    for clause in filters:
+        if all(
+            item.get(attr) in value if isinstance(value, (list, tuple, set)) else item.get(attr) == value
+            for attr, value in clause.items()
+        ):
+            return True
+    return False
+
+
+def _lease_key(slot: int) -> int:
+    return -(slot + 1)
+
+
+def _project(item: Dict[str, Any], attributes: Optional[Sequence[str]]) -> Dict[str, Any]:
+    if not attributes:
+        return item
+    return {attr: item[attr] for attr in (KEY, *attributes) if attr in item}
+
+
+class ArtifactStore:
+    """Interface shared by every backend."""
+
+    def get(self, artifact_id: int) -> Optional[Dict[str, Any]]:
+        """Return the artifact with this model_id, or None."""
+        raise NotImplementedError
+
+    def batch_get(self, artifact_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """Return the artifacts that exist among `artifact_ids`, keyed by model_id."""
+        found = {}
+        for artifact_id in set(artifact_ids):
+            item = self.get(artifact_id)
+            if item is not None:
+                found[artifact_id] = item
+        return found
+
+    def put(self, item: Dict[str, Any], if_absent: bool = False) -> None:
+        """
+        Store an artifact, replacing any existing one with the same model_id.
+
+        Raises:
+            ArtifactExistsError: if `if_absent` and the model_id is taken
+        """
+        raise NotImplementedError
+
+    def put_many(self, items: Iterable[Dict[str, Any]], if_absent: bool = False) -> List[int]:
+        """
+        Store many artifacts.
+
+        Args:
+            items (Iterable[dict]): artifacts to store
+            if_absent (bool): skip (and report) items whose model_id is taken
+                instead of replacing the existing artifact
+        Returns:
+            List[int]: model_ids that were not written because they are taken
+        """
+        taken = []
+        for item in items:
+            try:
+                self.put(item, if_absent=if_absent)
+            except ArtifactExistsError:
+                taken.append(item[KEY])
+        return taken
+
+    def update(self, artifact_id: int, fields: Dict[str, Any], if_exists: bool = False) -> Dict[str, Any]:
+        """
+        Set `fields` on an artifact and return the updated item.
+
+        Raises:
+            ArtifactNotFoundError: if `if_exists` and there is no such artifact
+        """
+        raise NotImplementedError
+
+    def delete(self, artifact_id: int) -> None:
+        raise NotImplementedError
+
+    def scan(self, limit: Optional[int] = None, start_key: Optional[Dict[str, Any]] = None,
+             filters: Filters = None, attributes: Optional[Sequence[str]] = None) -> Page:
+        """
+        Read matching artifacts, one page at a time.
+
+        Args:
+            limit (int): maximum items to return; None reads to the end
+            start_key (dict): key returned by the previous page
+            filters (list): see module docstring
+            attributes (Sequence[str]): attributes to return besides model_id; None for all
+        Returns:
+            Tuple[List[dict], Optional[dict]]: items and the key to resume
+            from, or None when there is nothing left
+        """
+        raise NotImplementedError
+
+    def query_by_name(self, name: str, artifact_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        """All artifacts with this exact name (and type, if given)."""
+        clause: Dict[str, Any] = {"name": name}
+        if artifact_type is not None:
+            clause["type"] = artifact_type
+        return self.scan(filters=[clause])[0]
+
+    def delete_all(self) -> Dict[str, Any]:
+        """
+        Delete every artifact.
+
+        Returns:
+            dict: {"scanned", "deleted", "seconds", "items_per_second"}
+        """
+        raise NotImplementedError
+
+    def claim_lease(self, slot: int, owner: str, expires_at: float, now: float) -> bool:
+        """
+        Take or renew the lease on a worker-id slot.
+
+        The claim succeeds when the slot is free, its lease expired before `now`,
+        or `owner` already holds it.
+
+        Returns:
+            bool: whether `owner` now holds the slot until `expires_at`
+        """
+        raise NotImplementedError
+
+    def release_lease(self, slot: int, owner: str) -> None:
+        """Free a worker-id slot if `owner` still holds it."""
+        raise NotImplementedError
+
+
+def _delete_stats(deleted: int, start: float) -> Dict[str, Any]:
+    seconds = time.perf_counter() - start
+    return {
+        "scanned": deleted,
+        "deleted": deleted,
+        "seconds": round(seconds, 3),
+        "items_per_second": round(deleted / seconds, 1) if seconds > 0 else float(deleted),
+    }
+
+
+class DynamoArtifactStore(ArtifactStore):
+    def __init__(self, table, resource=None, name_index: Optional[str] = ARTIFACT_NAME_INDEX) -> None:
+        """
+        Args:
+            table: boto3 DynamoDB Table resource
+            resource: boto3 DynamoDB service resource, used for BatchGetItem
+            name_index (str): GSI on `name`, if the table has one
+        """
+        self.table = table
+        self.resource = resource
+        self.name_index = name_index
+
+    @staticmethod
+    def _condition(filters: Filters):
+        condition = None
+        for clause in filters or []:
+            clause_condition = None
+            for attr, value in clause.items():
+                if isinstance(value, (list, tuple, set)):
+                    part = Attr(attr).is_in(list(value))
+                else:
+                    part = Attr(attr).eq(value)
+                clause_condition = part if clause_condition is None else clause_condition & part
+            if clause_condition is None:
+                return None  # an empty clause matches everything
+            condition = clause_condition if condition is None else condition | clause_condition
+        return condition
+
+    @timed_call("dynamodb", "get_item")
+    def get(self, artifact_id: int) -> Optional[Dict[str, Any]]:
+        return self.table.get_item(Key={KEY: artifact_id}).get("Item")
+
+    @timed_call("dynamodb", "batch_get_item")
+    def batch_get(self, artifact_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        if self.resource is None:
+            return super().batch_get(artifact_ids)
+        ids = list(set(artifact_ids))
+        found: Dict[int, Dict[str, Any]] = {}
+        for start in range(0, len(ids), BATCH_GET_LIMIT):
+            request = {self.table.name: {"Keys": [{KEY: i} for i in ids[start:start + BATCH_GET_LIMIT]]}}
+            attempt = 0
+            while request:
+                resp = self.resource.batch_get_item(RequestItems=request)
+                for item in resp.get("Responses", {}).get(self.table.name, []):
+                    found[int(item[KEY])] = item
+                request = resp.get("UnprocessedKeys") or {}
+                if request:
+                    attempt += 1
+                    if attempt > MAX_UNPROCESSED_RETRIES:
+                        raise RuntimeError("BatchGetItem keys still unprocessed after retries")
+                    time.sleep(min(2.0, 0.05 * (2 ** attempt)))
+        return found
+
+    @timed_call("dynamodb", "put_item")
+    def put(self, item: Dict[str, Any], if_absent: bool = False) -> None:
+        if not if_absent:
+            self.table.put_item(Item=item)
+            return
+        try:
+            self.table.put_item(Item=item, ConditionExpression=f"attribute_not_exists({KEY})")
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                raise ArtifactExistsError(item[KEY])
+            raise
+
+    def put_many(self, items: Iterable[Dict[str, Any]], if_absent: bool = False) -> List[int]:
+        if if_absent:
+            return self._transact_put_absent(list(items))
+        self._batch_put(items)
+        return []
+
+    @timed_call("dynamodb", "batch_write_item")
+    def _batch_put(self, items: Iterable[Dict[str, Any]]) -> None:
+        # batch_writer groups puts into 25-item BatchWriteItem calls and resends unprocessed items
+        with self.table.batch_writer() as batch:
+            for item in items:
+                batch.put_item(Item=item)
+
+    @timed_call("dynamodb", "transact_write_items")
+    def _transact_put_absent(self, items: List[Dict[str, Any]]) -> List[int]:
+        # BatchWriteItem has no conditions; a transaction of conditional puts
+        # writes all of its items or none and names the ones that clashed
+        serializer = TypeSerializer()
+        client = self.table.meta.client
+        taken: List[int] = []
+        for start in range(0, len(items), TRANSACT_WRITE_LIMIT):
+            pending = items[start:start + TRANSACT_WRITE_LIMIT]
+            while pending:
+                puts = [{"Put": {
+                    "TableName": self.table.name,
+                    "Item": {attr: serializer.serialize(value) for attr, value in item.items()},
+                    "ConditionExpression": f"attribute_not_exists({KEY})",
+                }} for item in pending]
+                try:
+                    client.transact_write_items(TransactItems=puts)
+                    break
+                except ClientError as e:
+                    if e.response.get("Error", {}).get("Code") != "TransactionCanceledException":
+                        raise
+                    reasons = e.response.get("CancellationReasons") or []
+                    clashes = {i for i, reason in enumerate(reasons) if reason.get("Code") == "ConditionalCheckFailed"}
+                    if not clashes:
+                        raise
+                    taken.extend(pending[i][KEY] for i in sorted(clashes))
+                    pending = [item for i, item in enumerate(pending) if i not in clashes]
+        return taken
+
+    @timed_call("dynamodb", "update_item")
+    def update(self, artifact_id: int, fields: Dict[str, Any], if_exists: bool = False) -> Dict[str, Any]:
+        names = {}
+        values = {}
+        parts = []
+        for idx, (attr, value) in enumerate(fields.items()):
+            names[f"#attr{idx}"] = attr
+            values[f":val{idx}"] = value
+            parts.append(f"#attr{idx} = :val{idx}")
+        kwargs: Dict[str, Any] = {
+            "Key": {KEY: artifact_id},
+            "UpdateExpression": "SET " + ", ".join(parts),
+            "ExpressionAttributeNames": names,
+            "ExpressionAttributeValues": values,
+            "ReturnValues": "ALL_NEW",
+        }
+        if if_exists:
+            kwargs["ConditionExpression"] = f"attribute_exists({KEY})"
+        try:
+            return self.table.update_item(**kwargs).get("Attributes", {})
+        except ClientError as e:
+            if if_exists and e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                raise ArtifactNotFoundError(artifact_id)
+            raise
+
+    @timed_call("dynamodb", "delete_item")
+    def delete(self, artifact_id: int) -> None:
+        self.table.delete_item(Key={KEY: artifact_id})
+
+    @timed_call("dynamodb", "scan")
+    def scan(self, limit: Optional[int] = None, start_key: Optional[Dict[str, Any]] = None,
+             filters: Filters = None, attributes: Optional[Sequence[str]] = None) -> Page:
+        scan_kwargs: Dict[str, Any] = {}
+        if limit:
+            scan_kwargs["Limit"] = limit
+        if attributes:
+            names = {f"#p{i}": attr for i, attr in enumerate(attributes)}
+            scan_kwargs["ProjectionExpression"] = ", ".join([KEY, *names])
+            scan_kwargs["ExpressionAttributeNames"] = names
+        # Lease rows live under negative keys
+        artifacts_only = Attr(KEY).gt(0)
+        condition = self._condition(filters)
+        scan_kwargs["FilterExpression"] = artifacts_only if condition is None else artifacts_only & condition
+
+        # Keep reading scan pages until this page is full, so memory per call stays bounded
+        items: List[Dict[str, Any]] = []
+        while True:
+            if start_key:
+                scan_kwargs["ExclusiveStartKey"] = start_key
+            scan = self.table.scan(**scan_kwargs)
+            page = scan.get("Items", [])
+            last_key = scan.get("LastEvaluatedKey")
+
+            for index, item in enumerate(page):
+                items.append(item)
+                if limit and len(items) == limit:
+                    if index == len(page) - 1 and not last_key:
+                        return items, None
+                    # Resume right after the last item we return
+                    return items, {KEY: item[KEY]}
+
+            if not last_key:
+                return items, None
+            start_key = last_key
+
+    @timed_call("dynamodb", "query")
+    def query_by_name(self, name: str, artifact_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        if not self.name_index:
+            return super().query_by_name(name, artifact_type)
+        query_kwargs: Dict[str, Any] = {
+            "IndexName": self.name_index,
+            "KeyConditionExpression": Key("name").eq(name),
+        }
+        if artifact_type is not None:
+            query_kwargs["FilterExpression"] = Attr("type").eq(artifact_type)
+        items = []
+        while True:
+            resp = self.table.query(**query_kwargs)
+            items.extend(resp.get("Items", []))
+            if "LastEvaluatedKey" not in resp:
+                return items
+            query_kwargs["ExclusiveStartKey"] = resp["LastEvaluatedKey"]
+
+    @timed_call("dynamodb", "bulk_delete")
+    def delete_all(self) -> Dict[str, Any]:
+        # Worker-id leases live under negative keys and must survive a reset
+        return bulk_reset(self.table, key_floor=0)
+
+    @timed_call("dynamodb", "put_item")
+    def claim_lease(self, slot: int, owner: str, expires_at: float, now: float) -> bool:
+        item = {KEY: _lease_key(slot), "type": LEASE_TYPE, "owner": owner, "expires_at": int(expires_at)}
+        condition = Attr(KEY).not_exists() | Attr("owner").eq(owner) | Attr("expires_at").lt(int(now))
+        try:
+            self.table.put_item(Item=item, ConditionExpression=condition)
+            return True
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") == "ConditionalCheckFailedException":
+                return False
+            raise
+
+    @timed_call("dynamodb", "delete_item")
+    def release_lease(self, slot: int, owner: str) -> None:
+        try:
+            self.table.delete_item(Key={KEY: _lease_key(slot)}, ConditionExpression=Attr("owner").eq(owner))
+        except ClientError as e:
+            if e.response.get("Error", {}).get("Code") != "ConditionalCheckFailedException":
+                raise
+
+
+class MemoryArtifactStore(ArtifactStore):
+    """Process-local store; items are copied in and out like a real database."""
+
+    def __init__(self) -> None:
+        self._items: Dict[int, Dict[str, Any]] = {}
+        self._leases: Dict[int, Tuple[str, float]] = {}
+        self._lock = threading.Lock()
+
+    def get(self, artifact_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            item = self._items.get(int(artifact_id))
+            return copy.deepcopy(item) if item is not None else None
+
+    def put(self, item: Dict[str, Any], if_absent: bool = False) -> None:
+        artifact_id = int(item[KEY])
+        with self._lock:
+            if if_absent and artifact_id in self._items:
+                raise ArtifactExistsError(artifact_id)
+            self._items[artifact_id] = copy.deepcopy(item)
+
+    def put_many(self, items: Iterable[Dict[str, Any]], if_absent: bool = False) -> List[int]:
+        taken = []
+        with self._lock:
+            for item in items:
+                artifact_id = int(item[KEY])
+                if if_absent and artifact_id in self._items:
+                    taken.append(item[KEY])
+                    continue
+                self._items[artifact_id] = copy.deepcopy(item)
+        return taken
+
+    def update(self, artifact_id: int, fields: Dict[str, Any], if_exists: bool = False) -> Dict[str, Any]:
+        artifact_id = int(artifact_id)
+        with self._lock:
+            if artifact_id not in self._items:
+                if if_exists:
+                    raise ArtifactNotFoundError(artifact_id)
+                self._items[artifact_id] = {KEY: artifact_id}
+            self._items[artifact_id].update(copy.deepcopy(fields))
+            return copy.deepcopy(self._items[artifact_id])
+
+    def delete(self, artifact_id: int) -> None:
+        with self._lock:
+            self._items.pop(int(artifact_id), None)
+
+    def scan(self, limit: Optional[int] = None, start_key: Optional[Dict[str, Any]] = None,
+             filters: Filters = None, attributes: Optional[Sequence[str]] = None) -> Page:
+        after = int(start_key[KEY]) if start_key else None
+        with self._lock:
+            ids = sorted(i for i in self._items if after is None or i > after)
+            items = []
+            for position, artifact_id in enumerate(ids):
+                item = self._items[artifact_id]
+                if not matches_filters(item, filters):
+                    continue
+                items.append(copy.deepcopy(_project(item, attributes)))
+                if limit and len(items) == limit:
+                    more = position < len(ids) - 1
+                    return items, {KEY: artifact_id} if more else None
+        return items, None
+
+    def delete_all(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        with self._lock:
+            deleted = len(self._items)
+            self._items = {}
+        return _delete_stats(deleted, start)
+
+    def claim_lease(self, slot: int, owner: str, expires_at: float, now: float) -> bool:
+        with self._lock:
+            holder = self._leases.get(slot)
+            if holder is not None and holder[0] != owner and holder[1] >= now:
+                return False
+            self._leases[slot] = (owner, expires_at)
+            return True
+
+    def release_lease(self, slot: int, owner: str) -> None:
+        with self._lock:
+            if self._leases.get(slot, (None,))[0] == owner:
+                del self._leases[slot]
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class SqliteArtifactStore(ArtifactStore):
+    """Local file-backed store; name and type are columns so query_by_name uses an index."""
+
+    def __init__(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        self.path = path
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._lock = threading.Lock()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS artifacts ("
+                "model_id INTEGER PRIMARY KEY, name TEXT, type TEXT, data TEXT NOT NULL)"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS idx_artifacts_name ON artifacts (name, type)")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS worker_leases (slot INTEGER PRIMARY KEY, owner TEXT, expires_at REAL)"
+            )
+
+    @staticmethod
+    def _row(item: Dict[str, Any]) -> Tuple[int, Any, Any, str]:
+        return int(item[KEY]), item.get("name"), item.get("type"), json.dumps(item, default=_json_default)
+
+    def get(self, artifact_id: int) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT data FROM artifacts WHERE model_id = ?", (int(artifact_id),)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def batch_get(self, artifact_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        ids = list({int(i) for i in artifact_ids})
+        found: Dict[int, Dict[str, Any]] = {}
+        for start in range(0, len(ids), 500):
+            chunk = ids[start:start + 500]
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT model_id, data FROM artifacts WHERE model_id IN ({', '.join('?' * len(chunk))})", chunk
+                ).fetchall()
+            found.update({artifact_id: json.loads(data) for artifact_id, data in rows})
+        return found
+
+    def put(self, item: Dict[str, Any], if_absent: bool = False) -> None:
+        verb = "INSERT" if if_absent else "INSERT OR REPLACE"
+        try:
+            with self._lock, self._conn:
+                self._conn.execute(f"{verb} INTO artifacts (model_id, name, type, data) VALUES (?, ?, ?, ?)",
+                                   self._row(item))
+        except sqlite3.IntegrityError:
+            raise ArtifactExistsError(item[KEY])
+
+    def put_many(self, items: Iterable[Dict[str, Any]], if_absent: bool = False) -> List[int]:
+        rows = [self._row(item) for item in items]
+        if not if_absent:
+            with self._lock, self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO artifacts (model_id, name, type, data) VALUES (?, ?, ?, ?)", rows
+                )
+            return []
+        taken = []
+        with self._lock, self._conn:
+            for row in rows:
+                cursor = self._conn.execute(
+                    "INSERT OR IGNORE INTO artifacts (model_id, name, type, data) VALUES (?, ?, ?, ?)", row
+                )
+                if cursor.rowcount == 0:
+                    taken.append(row[0])
+        return taken
+
+    def update(self, artifact_id: int, fields: Dict[str, Any], if_exists: bool = False) -> Dict[str, Any]:
+        artifact_id = int(artifact_id)
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT data FROM artifacts WHERE model_id = ?", (artifact_id,)).fetchone()
+            if row is None and if_exists:
+                raise ArtifactNotFoundError(artifact_id)
+            item = json.loads(row[0]) if row else {KEY: artifact_id}
+            item.update(fields)
+            self._conn.execute(
+                "INSERT OR REPLACE INTO artifacts (model_id, name, type, data) VALUES (?, ?, ?, ?)", self._row(item)
+            )
+        return json.loads(json.dumps(item, default=_json_default))
+
+    def delete(self, artifact_id: int) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM artifacts WHERE model_id = ?", (int(artifact_id),))
+
+    def scan(self, limit: Optional[int] = None, start_key: Optional[Dict[str, Any]] = None,
+             filters: Filters = None, attributes: Optional[Sequence[str]] = None) -> Page:
+        after = int(start_key[KEY]) if start_key else None
+        sql = "SELECT model_id, data FROM artifacts"
+        params: Tuple[Any, ...] = ()
+        if after is not None:
+            sql += " WHERE model_id > ?"
+            params = (after,)
+        sql += " ORDER BY model_id"
+
+        items: List[Dict[str, Any]] = []
+        with self._lock:
+            cursor = self._conn.execute(sql, params)
+            for artifact_id, data in cursor:
+                if limit and len(items) == limit:
+                    # There is at least one more row after the full page
+                    return items, {KEY: items[-1][KEY]}
+                item = json.loads(data)
+                if matches_filters(item, filters):
+                    items.append(_project(item, attributes))
+        return items, None
+
+    def query_by_name(self, name: str, artifact_type: Optional[str] = None) -> List[Dict[str, Any]]:
+        sql = "SELECT data FROM artifacts WHERE name = ?"
+        params: Tuple[Any, ...] = (name,)
+        if artifact_type is not None:
+            sql += " AND type = ?"
+            params += (artifact_type,)
+        with self._lock:
+            rows = self._conn.execute(sql + " ORDER BY model_id", params).fetchall()
+        return [json.loads(data) for data, in rows]
+
+    def delete_all(self) -> Dict[str, Any]:
+        start = time.perf_counter()
+        with self._lock, self._conn:
+            deleted = self._conn.execute("DELETE FROM artifacts").rowcount
+        return _delete_stats(deleted, start)
+
+    def claim_lease(self, slot: int, owner: str, expires_at: float, now: float) -> bool:
+        # One statement, so workers sharing the file cannot both win the slot
+        with self._lock, self._conn:
+            cursor = self._conn.execute(
+                "INSERT INTO worker_leases (slot, owner, expires_at) VALUES (?, ?, ?) "
+                "ON CONFLICT (slot) DO UPDATE SET owner = excluded.owner, expires_at = excluded.expires_at "
+                "WHERE worker_leases.owner = excluded.owner OR worker_leases.expires_at < ?",
+                (slot, owner, expires_at, now),
+            )
+        return cursor.rowcount == 1
+
+    def release_lease(self, slot: int, owner: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM worker_leases WHERE slot = ? AND owner = ?", (slot, owner))
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def create_store(kind: str = ARTIFACT_STORE, table_name: str = "models", region: str = "us-east-2") -> ArtifactStore:
+    """
+    Build the configured artifact store.
+
+    Args:
+        kind (str): "dynamodb", "memory" or "sqlite"
+        table_name (str): DynamoDB table name
+        region (str): AWS region of the DynamoDB table
+    Raises:
+        ValueError: for an unknown kind
+    """
+    kind = (kind or "dynamodb").lower()
+    if kind == "memory":
+        logger.info("Using in-memory artifact store")
+        return MemoryArtifactStore()
+    if kind == "sqlite":
+        logger.info(f"Using SQLite artifact store at {ARTIFACT_STORE_PATH}")
+        return SqliteArtifactStore(ARTIFACT_STORE_PATH)
+    if kind == "dynamodb":
+        import boto3
+
+        resource = boto3.resource("dynamodb", region_name=region)
+        return DynamoArtifactStore(resource.Table(table_name), resource)
+    raise ValueError(f"Unknown ARTIFACT_STORE: {kind}")
@@ -0,0 +1,240 @@
+"""
+SQLite storage for API users and tokens.
+
+Connections are pooled and opened in WAL mode, `username` and `secret_key`
+are indexed, validated tokens are kept in an in-memory LRU, and per-user
+interaction counts are accumulated in memory and flushed in batches by a
+background thread, so verifying a token is normally not a disk access.
+Cached tokens expire after AUTH_TOKEN_CACHE_TTL seconds, so a token rotated
+by another process (or another worker) stops validating within that time.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, Optional, Tuple
+
+
+logger = logging.getLogger("api")
+
+AUTH_POOL_SIZE = int(os.getenv("AUTH_POOL_SIZE", "4"))
+AUTH_TOKEN_CACHE_SIZE = int(os.getenv("AUTH_TOKEN_CACHE_SIZE", "1024"))
+AUTH_TOKEN_CACHE_TTL = float(os.getenv("AUTH_TOKEN_CACHE_TTL", "30"))  # seconds
+AUTH_FLUSH_INTERVAL = float(os.getenv("AUTH_FLUSH_INTERVAL", "5"))  # seconds
+
+
+class AuthStore:
+    def __init__(self, path: str, pool_size: int = AUTH_POOL_SIZE, cache_size: int = AUTH_TOKEN_CACHE_SIZE,
+                 flush_interval: float = AUTH_FLUSH_INTERVAL, cache_ttl: float = AUTH_TOKEN_CACHE_TTL) -> None:
+        """
+        Args:
+            path (str): SQLite database file
+            pool_size (int): maximum number of open connections
+            cache_size (int): number of validated tokens kept in memory
+            flush_interval (float): seconds between interaction-count flushes
+            cache_ttl (float): seconds a validated token is trusted before the
+                database is checked again
+        """
+        self.path = path
+        self._pool: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._pool_size = max(1, pool_size)
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+
+        self._cache_size = max(0, cache_size)
+        self._cache_ttl = cache_ttl
+        self._tokens: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()  # token -> (user, expiry)
+        self._counts: Dict[int, int] = {}   # user id -> interactions, including unflushed ones
+        self._pending: Dict[int, int] = {}  # user id -> interactions not yet written
+        self._lock = threading.Lock()
+
+        self._flush_interval = flush_interval
+        self._stop = threading.Event()
+        self._flusher: Optional[threading.Thread] = None
+
+    # Connection pool
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=10, check_same_thread=False)
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a pooled connection; commits on success, rolls back on error."""
+        try:
+            conn = self._pool.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                can_open = self._opened < self._pool_size
+                if can_open:
+                    self._opened += 1
+            if can_open:
+                try:
+                    conn = self._connect()
+                except Exception:
+                    with self._pool_lock:
+                        self._opened -= 1
+                    raise
+            else:
+                conn = self._pool.get()
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+        finally:
+            self._pool.put(conn)
+
+    def close(self) -> None:
+        """Flush pending counts and close every pooled connection."""
+        self.stop_flusher()
+        self.flush()
+        while True:
+            try:
+                self._pool.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._pool_lock:
+            self._opened = 0
+
+    # Schema
+    def create_tables(self) -> None:
+        with self.connection() as conn:
+            conn.execute('''
+                CREATE TABLE IF NOT EXISTS users (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    username TEXT NOT NULL,
+                    password TEXT NOT NULL,
+                    secret_key TEXT NOT NULL,
+                    num_interactions INTEGER DEFAULT 0,
+                    api_time DATETIME DEFAULT CURRENT_TIMESTAMP
+                )
+            ''')
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_users_username ON users (username)")
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_users_secret_key ON users (secret_key)")
+
+    # Users
+    def find_user(self, username: str) -> Optional[Tuple[int, str, str]]:
+        """Return (id, hashed password, secret_key) for a username, or None."""
+        with self.connection() as conn:
+            return conn.execute(
+                "SELECT id, password, secret_key FROM users WHERE username = ?", (username,)
+            ).fetchone()
+
+    def add_user(self, username: str, hashed_password: str, secret_key: str) -> int:
+        """Insert a user whose password is already hashed; returns the new id."""
+        with self.connection() as conn:
+            cur = conn.execute(
+                "INSERT INTO users (username, password, secret_key) VALUES (?, ?, ?)",
+                (username, hashed_password, secret_key),
+            )
+            return cur.lastrowid
+
+    def get_secret_key(self, user_id: int) -> Optional[str]:
+        with self.connection() as conn:
+            row = conn.execute("SELECT secret_key FROM users WHERE id = ?", (user_id,)).fetchone()
+        return row[0] if row else None
+
+    def set_secret_key(self, user_id: int, secret_key: str) -> None:
+        """Store a new token for a user; the previous token stops validating immediately."""
+        with self.connection() as conn:
+            conn.execute("UPDATE users SET secret_key = ? WHERE id = ?", (secret_key, user_id))
+        with self._lock:
+            for token in [t for t, (user, _) in self._tokens.items() if user["id"] == user_id]:
+                del self._tokens[token]
+
+    # Tokens
+    def lookup_token(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Resolve a token to its user.
+
+        Returns:
+            dict with 'id', 'num_interactions' (including unflushed ones) and
+            'api_time' (epoch seconds), or None if no user has this token.
+        """
+        with self._lock:
+            cached = self._tokens.get(token)
+            if cached is not None:
+                user, expiry = cached
+                if time.monotonic() < expiry:
+                    self._tokens.move_to_end(token)
+                    return dict(user, num_interactions=self._counts.get(user["id"], 0))
+                # Re-read the row: the token may have been rotated elsewhere
+                del self._tokens[token]
+
+        with self.connection() as conn:
+            row = conn.execute(
+                "SELECT id, num_interactions, CAST(strftime('%s', api_time) AS INTEGER) "
+                "FROM users WHERE secret_key = ?",
+                (token,),
+            ).fetchone()
+        if not row:
+            return None
+
+        user_id, num_interactions, api_time = row
+        user = {"id": user_id, "api_time": api_time or 0}
+        with self._lock:
+            # Unflushed increments are newer than what the database holds
+            count = (num_interactions or 0) + self._pending.get(user_id, 0)
+            self._counts[user_id] = max(count, self._counts.get(user_id, 0))
+            if self._cache_size and self._cache_ttl > 0:
+                self._tokens[token] = (user, time.monotonic() + self._cache_ttl)
+                self._tokens.move_to_end(token)
+                while len(self._tokens) > self._cache_size:
+                    self._tokens.popitem(last=False)
+            return dict(user, num_interactions=self._counts[user_id])
+
+    # Interaction counts
+    def record_interaction(self, user_id: int) -> int:
+        """Count one request for a user (written by the next flush); returns the new total."""
+        with self._lock:
+            self._counts[user_id] = self._counts.get(user_id, 0) + 1
+            self._pending[user_id] = self._pending.get(user_id, 0) + 1
+            return self._counts[user_id]
+
+    def flush(self) -> int:
+        """Write accumulated interaction counts in one transaction; returns the number of users updated."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return 0
+        try:
+            with self.connection() as conn:
+                conn.executemany(
+                    "UPDATE users SET num_interactions = num_interactions + ? WHERE id = ?",
+                    [(count, user_id) for user_id, count in pending.items()],
+                )
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to flush interaction counts: {e}")
+            with self._lock:
+                for user_id, count in pending.items():
+                    self._pending[user_id] = self._pending.get(user_id, 0) + count
+            return 0
+        return len(pending)
+
+    def start_flusher(self) -> None:
+        """Flush interaction counts every flush_interval seconds on a daemon thread."""
+        if self._flusher is not None:
+            return
+        self._stop.clear()
+
+        def run():
+            while not self._stop.wait(self._flush_interval):
+                self.flush()
+
+        self._flusher = threading.Thread(target=run, name="auth-flusher", daemon=True)
+        self._flusher.start()
+
+    def stop_flusher(self) -> None:
+        if self._flusher is None:
+            return
+        self._stop.set()
+        self._flusher.join()
+        self._flusher = None
@@ -0,0 +1,117 @@
+"""
+Parallel bulk delete of every item in a DynamoDB table (used by DELETE /reset).
+
+The table is scanned as RESET_SEGMENTS parallel segments projecting only the
+key attributes (optionally only keys above a floor, so rows kept under
+reserved keys survive). Keys are grouped into BatchWriteItem requests of 25 deletes and
+issued concurrently by RESET_WRITERS threads; unprocessed items returned by
+DynamoDB are retried with exponential backoff.
+"""
+
+import logging
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Sequence
+
+
+logger = logging.getLogger("api")
+
+RESET_SEGMENTS = int(os.getenv("RESET_SEGMENTS", "8"))
+RESET_WRITERS = int(os.getenv("RESET_WRITERS", "16"))
+
+BATCH_WRITE_LIMIT = 25  # DynamoDB maximum per BatchWriteItem
+MAX_UNPROCESSED_RETRIES = 8
+
+
+def _delete_batch(client, table_name: str, keys: List[Dict[str, Any]]) -> int:
+    """
+    Delete up to 25 keys with BatchWriteItem, retrying unprocessed items.
+
+    Returns:
+        int: number of keys deleted
+    Raises:
+        RuntimeError: if items are still unprocessed after MAX_UNPROCESSED_RETRIES
+    """
+    request_items = {table_name: [{"DeleteRequest": {"Key": key}} for key in keys]}
+    attempt = 0
+    while True:
+        resp = client.batch_write_item(RequestItems=request_items)
+        unprocessed = resp.get("UnprocessedItems") or {}
+        if not unprocessed.get(table_name):
+            return len(keys)
+        attempt += 1
+        if attempt > MAX_UNPROCESSED_RETRIES:
+            raise RuntimeError(
+                f"{len(unprocessed[table_name])} items still unprocessed after {MAX_UNPROCESSED_RETRIES} retries"
+            )
+        time.sleep(min(2.0, 0.05 * (2 ** attempt)))
+        request_items = unprocessed
+
+
+def _scan_segment(client, table_name: str, key_names: Sequence[str], segment: int,
+                  total_segments: int, writers: ThreadPoolExecutor, key_floor: Optional[int] = None) -> Dict[str, Any]:
+    """Scan one segment (keys only, above `key_floor` if given) and hand 25-key batches to the writer pool."""
+    names = {f"#k{i}": name for i, name in enumerate(key_names)}
+    scan_kwargs: Dict[str, Any] = {
+        "TableName": table_name,
+        "Segment": segment,
+        "TotalSegments": total_segments,
+        "ProjectionExpression": ", ".join(names),
+        "ExpressionAttributeNames": names,
+    }
+    if key_floor is not None:
+        scan_kwargs["FilterExpression"] = "#k0 > :floor"
+        scan_kwargs["ExpressionAttributeValues"] = {":floor": {"N": str(key_floor)}}
+    scanned = 0
+    futures = []
+    while True:
+        page = client.scan(**scan_kwargs)
+        keys = page.get("Items", [])
+        scanned += len(keys)
+        for start in range(0, len(keys), BATCH_WRITE_LIMIT):
+            futures.append(writers.submit(_delete_batch, client, table_name, keys[start:start + BATCH_WRITE_LIMIT]))
+        if "LastEvaluatedKey" not in page:
+            break
+        scan_kwargs["ExclusiveStartKey"] = page["LastEvaluatedKey"]
+    return {"scanned": scanned, "futures": futures}
+
+
+def bulk_reset(table, key_names: Sequence[str] = ("model_id",), segments: int = RESET_SEGMENTS,
+               writers: int = RESET_WRITERS, key_floor: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Delete every item in `table`.
+
+    Args:
+        table: boto3 DynamoDB Table resource
+        key_names (Sequence[str]): primary key attribute names
+        segments (int): number of parallel scan segments
+        writers (int): number of concurrent BatchWriteItem workers
+        key_floor (int): if given, only items whose first (numeric) key is greater are deleted or counted
+    Returns:
+        dict: {"scanned", "deleted", "seconds", "items_per_second"}
+    """
+    start = time.perf_counter()
+    client = table.meta.client
+    table_name = table.name
+    segments = max(1, segments)
+
+    with ThreadPoolExecutor(max_workers=max(1, writers)) as write_pool, \
+            ThreadPoolExecutor(max_workers=segments) as scan_pool:
+        scans = [
+            scan_pool.submit(_scan_segment, client, table_name, key_names, segment, segments, write_pool, key_floor)
+            for segment in range(segments)
+        ]
+        results = [scan.result() for scan in scans]
+        scanned = sum(r["scanned"] for r in results)
+        deleted = sum(f.result() for r in results for f in r["futures"])
+
+    seconds = time.perf_counter() - start
+    stats = {
+        "scanned": scanned,
+        "deleted": deleted,
+        "seconds": round(seconds, 3),
+        "items_per_second": round(deleted / seconds, 1) if seconds > 0 else float(deleted),
+    }
+    logger.info(f"Bulk reset of {table_name}: {stats}")
+    return stats
@@ -1,29 +1,36 @@
-from urllib import response
-
 import json
 from fastapi import Depends, Header, FastAPI, HTTPException, Body, Query
-from fastapi.responses import JSONResponse
-from utils.url_parser import extract_name_from_url, populate_model_info, extract_name_from_url, classify_url, known_urls
+from fastapi.concurrency import run_in_threadpool
+from utils.url_parser import extract_name_from_url, populate_model_info, classify_url, known_urls
 import string
-import sqlite3
 import secrets
 import jwt
 import math as m
 import string
 import time
-import bcrypt
 import os
 from dotenv import load_dotenv
 from typing import Any, Dict, List, Optional
 from pydantic import BaseModel
-import boto3
-from boto3.dynamodb.conditions import Key
 from model import Code, Dataset, Model
+from apis.rating_store import is_stale, load_rating, rating_fingerprint, save_rating
+from apis.job_queue import RatingJobQueue
+from apis.model_matcher import MATCH_TOP_K, best_match, top_candidates
+from apis.pagination import ARTIFACTS_PAGE_SIZE, decode_cursor, encode_cursor
+from apis.id_allocator import SnowflakeIdGenerator, WorkerLease
+from apis.artifact_store import ARTIFACT_STORE, ArtifactExistsError, ArtifactNotFoundError, create_store
+from apis.auth_store import AuthStore
+from apis.artifact_index import ArtifactIndex, compile_pattern, fetch_readme
+from apis.lineage import DIRECTIONS, LINEAGE_ATTRIBUTES, LINEAGE_MAX_DEPTH, LineageIndex, fetch_base_models
+from apis.responses import FastJSONResponse, ResponseShape
+from apis.password_hasher import HasherBusyError, PasswordHasher, hash_password
 import logging
 import requests
 import re
-import copy
-from fastapi.responses import HTMLResponse
+from concurrent.futures import ThreadPoolExecutor
+from fastapi.responses import HTMLResponse, PlainTextResponse
+from utils.telemetry import CONTENT_TYPE, REGISTRY, MetricsMiddleware, track_call
+from utils.profiler import ProfilingMiddleware
 
 
 correct_metric_format = {
@@ -59,6 +66,7 @@ correct_metric_format = {
   },
   "size_score_latency": 0
 }
+RATING_SHAPE = ResponseShape(correct_metric_format)
 
 logging.basicConfig(
     level=logging.INFO,
@@ -70,6 +78,8 @@ logger = logging.getLogger("api")
 load_dotenv()
 SECRET_KEY = os.getenv("SECRET_KEY")
 database_dir = "./databases/database.db"
+auth_store = AuthStore(database_dir)
+password_hasher = PasswordHasher()
 
 AWS_REGION = os.getenv("AWS_REGION", "us-east-2")
 MODEL_TABLE_NAME = os.getenv("MODEL_TABLE_NAME", "models")  # default to "models"
@@ -94,10 +104,13 @@ else:
 PURDUE_GENAI_URL = "https://genai.rcac.purdue.edu/api/chat/completions"
 
 
-dynamodb = boto3.resource("dynamodb", region_name=AWS_REGION)
-model_table = dynamodb.Table(MODEL_TABLE_NAME)  # this will point to the "models" table
+# DynamoDB "models" table by default; ARTIFACT_STORE=memory|sqlite runs the API without AWS
+artifact_store = create_store(ARTIFACT_STORE, table_name=MODEL_TABLE_NAME, region=AWS_REGION)
 
-last_time = 0   
+# ARTIFACT_WORKER_ID pins the Snowflake worker id; otherwise one is leased from the artifact store
+id_allocator = SnowflakeIdGenerator(lease=WorkerLease(artifact_store))
+ID_ALLOCATION_ATTEMPTS = 5
+BULK_INGEST_MAX = int(os.getenv("BULK_INGEST_MAX", "1000"))
 
 class ModelArtifact(BaseModel):
     id: str                      # will map to "model_id" in DynamoDB
@@ -117,6 +130,12 @@ class ArtifactQuery(BaseModel):
     id: Optional[str] = None
     types: Optional[List[str]] = None
 
+class ArtifactRegEx(BaseModel):
+    regex: str
+
+class BulkIngestItem(ModelIngestRequest):
+    type: str
+
 
 
 def _genai_single_float(dataset_bool: bool, code_bool: bool, url: str, model_url: str) -> Optional[float]:
@@ -154,8 +173,9 @@ def _genai_single_float(dataset_bool: bool, code_bool: bool, url: str, model_url
         
         logger.info(f"Sending request to: {PURDUE_GENAI_URL}")
         
-        resp = requests.post(
-            PURDUE_GENAI_URL, headers=headers, json=body, timeout=15)            
+        with track_call("llm", "match_rating"):
+            resp = requests.post(
+                PURDUE_GENAI_URL, headers=headers, json=body, timeout=15)
         
         # Check for specific error responses before raising
         if resp.status_code == 401:
@@ -215,8 +235,9 @@ def _genai_single_url(model_url: Optional[str], url_search_type: str) -> Optiona
             ],
             "temperature": 0,
         }
-        resp = requests.post(
-            PURDUE_GENAI_URL, headers=headers, json=body, timeout=15)
+        with track_call("llm", "find_url"):
+            resp = requests.post(
+                PURDUE_GENAI_URL, headers=headers, json=body, timeout=15)
         resp.raise_for_status()
         data = resp.json()
         text: str = data["choices"][0]["message"]["content"].strip()
@@ -228,87 +249,71 @@ def _genai_single_url(model_url: Optional[str], url_search_type: str) -> Optiona
 
     
 
-def match_dataset_code_to_model(dataset_url: str = None, code_url: str = None):
-    best_match_rating = 0.0
-    best_model_id = None
+def _unlinked_models(link_field: str) -> List[Dict[str, Any]]:
+    """Scan the whole table for model items that have no `link_field` yet."""
+    models, _ = artifact_store.scan(filters=[{"type": "model"}], attributes=("url", "type", link_field))
+    return [item for item in models if item.get(link_field) is None]
 
 
-    scan = model_table.scan()
+def match_dataset_code_to_model(dataset_url: str = None, code_url: str = None,
+                                models: Optional[List[Dict[str, Any]]] = None):
+    """
+    Find the registered model a dataset or code URL most likely belongs to.
+
+    Only models without a link of that kind are considered. They are ranked
+    locally and the MATCH_TOP_K most plausible ones are rated by the LLM
+    concurrently (see apis.model_matcher).
+
+    Args:
+        models (List[dict]): unlinked models to choose from; scanned from the
+            table when not given
+    Returns:
+        The matching model_id, or None.
+    """
+    if dataset_url is not None:
+        url, link_field, is_dataset = dataset_url, "dataset_id", True
+    elif code_url is not None:
+        url, link_field, is_dataset = code_url, "code_id", False
+    else:
+        return None
+
+    if models is None:
+        models = _unlinked_models(link_field)
+    candidates = top_candidates(url, models, MATCH_TOP_K)
+    logger.info(
+        f"Evaluating {'dataset' if is_dataset else 'code'} URL '{url}' against "
+        f"{len(candidates)} of {len(models)} unlinked models: {[c.get('model_id') for c in candidates]}"
+    )
+
+    best, best_match_rating = best_match(
+        candidates,
+        lambda item: _genai_single_float(
+            dataset_bool=is_dataset, code_bool=not is_dataset, url=url, model_url=item.get("url")
+        ),
+    )
+    best_model_id = best.get("model_id") if best else None
 
-    for item in scan['Items']:
-        model_type = item.get("type")
-        if(model_type != "model"):
-            continue
-        model_id = item.get("model_id")
-        model_url = item.get("url")
-        model_dataset_id = item.get("dataset_id")
-        model_code_id = item.get("code_id")
-
-        if dataset_url is not None:
-            if model_dataset_id is None:
-                logger.info(f"Evaluating dataset URL '{dataset_url}' against model_id {model_id}")
-                curr_rating = _genai_single_float(dataset_bool=True, code_bool=False, url=dataset_url, model_url=model_url)
-            else:
-                logger.info(f"Skipping model_id {model_id} since it already has a dataset_id")
-                continue
-        elif code_url is not None:
-            if model_code_id is None:
-                logger.info(f"Evaluating code URL '{code_url}' against model_id {model_id}")
-                curr_rating = _genai_single_float(dataset_bool=False, code_bool=True, url=code_url, model_url=model_url)
-            else:
-                logger.info(f"Skipping model_id {model_id} since it already has a code_id")
-                continue
-        else:
-            return None
-        
-        if curr_rating is not None:
-            try:
-                curr_rating_float = float(curr_rating)
-                if curr_rating_float > best_match_rating:
-                    best_match_rating = curr_rating_float
-                    best_model_id = model_id
-            except ValueError:
-                logger.warning(f"GenAI returned non-float rating: {curr_rating}")
-                continue
-            
     logger.info(f"Best match rating: {best_match_rating} for model_id: {best_model_id}")
     return best_model_id
 
 
-# def create_authentication_token(user_id, database_dir=database_dir):
-#     now = m.floor(time.time() / 1000) 
-#     expiration = now + (10 * 60 * 60)
+def create_authentication_token(user_id):
+    now = int(time.time())
+    expiration = now + (10 * 60 * 60)
 
-#     jwt_payload = {
-#         "iat": now,
-#         "exp": expiration,
-#         "sub": user_id,
-#         "role": "admin"
-#     }
-
-#     token = jwt.encode(jwt_payload, SECRET_KEY, algorithm="HS256")
+    jwt_payload = {
+        "iat": now,
+        "exp": expiration,
+        "sub": str(user_id),
+        "role": "admin"
+    }
 
-#     conn = sqlite3.connect(database_dir)
-#     cursor = conn.cursor()
-#     cursor.execute("UPDATE users SET secret_key = ? WHERE id = ?", (token, user_id))
-#     conn.commit()
-#     conn.close()
+    token = jwt.encode(jwt_payload, SECRET_KEY, algorithm="HS256")
+    auth_store.set_secret_key(user_id, token)
+    return token
 
 def create_users_table():
-    conn = sqlite3.connect(database_dir)
-    cursor = conn.cursor()
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS users (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            username TEXT NOT NULL,
-            password TEXT NOT NULL,
-            secret_key TEXT NOT NULL,
-            num_interactions INTEGER DEFAULT 0,
-            api_time DATETIME DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
-    conn.commit()
-    conn.close()
+    auth_store.create_tables()
 
 def token_from_secret_key(secret_key):
     try:
@@ -321,48 +326,46 @@ def token_from_secret_key(secret_key):
 
 def add_user(username, password, secret_key):
     password = hash_password(password)
-    conn = sqlite3.connect(database_dir)
-    cursor = conn.cursor()
-    cursor.execute("INSERT INTO users (username, password, secret_key) VALUES (?, ?, ?)", (username, password, secret_key))
-    conn.commit()
-    conn.close()
-    
-def hash_password(password: str) -> str:
-    salt = bcrypt.gensalt()
-    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
-    return hashed.decode('utf-8')
+    return auth_store.add_user(username, password, secret_key)
+
+app = FastAPI(default_response_class=FastJSONResponse)
 
-def check_password(password: str, hashed_password: str):
-    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+_route_templates: Dict[Any, str] = {}
 
-app = FastAPI()
+
+def _route_template(scope: Dict[str, Any]) -> str:
+    """Route path template (e.g. /artifacts/{artifact_type}/{id}) a request was served by."""
+    endpoint = scope.get("endpoint")
+    if endpoint is None:
+        return "unmatched"
+    if endpoint not in _route_templates:
+        for route in app.routes:
+            if getattr(route, "endpoint", None) is endpoint:
+                _route_templates[endpoint] = route.path
+                break
+        else:
+            return "unmatched"
+    return _route_templates[endpoint]
+
+
+app.add_middleware(MetricsMiddleware, route_name=_route_template)
+# Opt-in: PROFILE_ENABLED plus an X-Profile header or PROFILE_SAMPLE_RATE
+app.add_middleware(ProfilingMiddleware)
 
 # Edit to match actual database schema and logic (Including num interations, token expiry, etc.)
 def verify_token(x_authorization: str = Header(None)) -> int:
     if not x_authorization:
         raise HTTPException(status_code=403, detail="Missing X-Authorization header")
 
-    con = sqlite3.connect(database_dir)
-    cur = con.cursor()
-    cur.execute("SELECT id, secret_key, num_interactions, api_time FROM users WHERE secret_key = ?", (x_authorization,))
-    row = cur.fetchone()
-    con.close()
-
-    if not row:
+    user = auth_store.lookup_token(x_authorization)
+    if not user:
         raise HTTPException(status_code=403, detail="Invalid token")
 
-    id, secret_key, num_interactions, api_time = row
-    if api_time - time.time() > 60000 or num_interactions > 1000:
+    if user["api_time"] - time.time() > 60000 or user["num_interactions"] > 1000:
         raise HTTPException(status_code=403, detail="Token expired")
-    else:
-        num_interactions += 1
-        con = sqlite3.connect(database_dir)
-        cur = con.cursor()
-        cur.execute("UPDATE users SET num_interactions = ? WHERE id = ?", (num_interactions, id))
-        con.commit()
-        con.close()
+    auth_store.record_interaction(user["id"])
 
-    return id
+    return user["id"]
 
 @app.get("/", include_in_schema=False, response_class=HTMLResponse)
 async def serve_frontend():
@@ -484,98 +487,123 @@ async def read_root(x_authorization: str = Header(None)):
     logger.info("GET / called x_authorization=%s", x_authorization)
     return {"message": "Welcome to the ModelReuseCLI API"}
 
+@app.get("/metrics", include_in_schema=False)
+async def read_metrics():
+    """Prometheus scrape endpoint."""
+    return PlainTextResponse(REGISTRY.render(), media_type=CONTENT_TYPE)
+
 @app.get("/health")
 async def read_health():
     return {"status": "healthy"}
 
+@app.get("/health/auth")
+async def read_health_auth():
+    """Latency of password hashing/verification, tracked apart from the other endpoints."""
+    return {
+        "workers": password_hasher.workers,
+        "max_pending": password_hasher.max_pending,
+        "bcrypt_rounds": password_hasher.rounds,
+        "latency": password_hasher.stats.snapshot(),
+    }
+
 @app.get("/health/components")
 async def read_health_components(x_authorization: str = Header(None, alias="X-Authorization")):
     return {"components": ["component1", "component2"]}
 
+def _artifact_query_filter(queries: List[ArtifactQuery]) -> Optional[List[Dict[str, Any]]]:
+    """
+    Build artifact store filters matching any of the queries.
+
+    A "*" query matches every artifact (of the requested types). An id query
+    matches that artifact regardless of name.
+
+    Returns:
+        A list of filter clauses, or None when every artifact matches.
+    """
+    filters: List[Dict[str, Any]] = []
+    for query in queries:
+        types = query.types or []
+
+        if query.name == "*":
+            if not types:
+                return None
+            filters.append({"type": types})
+            continue
+
+        clause: Dict[str, Any] = {"name": query.name}
+        if types:
+            clause["type"] = types
+        filters.append(clause)
+        if query.id is not None:
+            try:
+                filters.append({"model_id": int(query.id)})
+            except ValueError:
+                pass
+    return filters
+
+
+def _artifact_summary(item: Dict[str, Any]) -> Dict[str, Any]:
+    model_id = item.get("model_id")
+    return {
+        "name": item.get("name"),
+        "id": int(model_id) if model_id is not None else None,
+        "type": item.get("type"),
+    }
+
+
 @app.post("/artifacts")
-async def find_artifacts(x_authorization: str = Header(None), queries: List[ArtifactQuery] = Body(...), offset: int = Query(0)):
+async def find_artifacts(x_authorization: str = Header(None), queries: List[ArtifactQuery] = Body(...), offset: Optional[str] = Query(None)):
+    """
+    List artifacts matching any of the queries, one page at a time.
+
+    `offset` is the opaque cursor returned in the `offset` response header of
+    the previous page; the header is absent on the last page.
+    """
     logger.info(f"POST /artifacts called, x_authorization={x_authorization}, queries={queries}, offset={offset}")
-    artifacts = []
 
     if not queries or any(not query.name for query in queries):
         raise HTTPException(status_code=400, detail="error in request body")
 
+    try:
+        start_key = decode_cursor(offset)
+    except ValueError:
+        raise HTTPException(status_code=400, detail="error in request body")
 
-    for index, query in enumerate(queries):
-        # first query is a star, indicating all artifacts
-        name = query.name
-        if(index == 0 and name == "*"):
-            try:
-                scan = model_table.scan()
-
-
-                if len(query.types) != 0:
-                    for item in scan['Items']:
-                        if item.get("type") in query.types:
-                            artifact = {
-                                "name": item.get("name"),
-                                "id": item.get("model_id"),
-                                "type": item.get("type")
-                            }
-
-                            artifacts.append(artifact)
-                else:
-                    for item in scan['Items']:
-                            artifact = {
-                                "name": item.get("name"),
-                                "id": item.get("model_id"),
-                                "type": item.get("type")
-                            }
-
-                            artifacts.append(artifact)
-                
-                break
-            except Exception as e:
-                raise HTTPException(status_code=403, detail=f"Failed to retrieve artifacts: {e}")
-        else:     
-            try: 
-                scan = model_table.scan()
-
-                for item in scan['Items']:
-                    matched = False
-
-                    if query.id is not None and item.get("model_id") == query.id:
-                        matched = True
-                    elif item.get("name") == query.name:
-                        if len(query.types) == 0 or item.get("type") in query.types:
-                            matched = True
+    try:
+        items, next_key = artifact_store.scan(
+            limit=ARTIFACTS_PAGE_SIZE,
+            start_key=start_key,
+            filters=_artifact_query_filter(queries),
+            attributes=("name", "type"),
+        )
+    except Exception as e:
+        raise HTTPException(status_code=403, detail=f"Failed to retrieve artifacts: {e}")
 
-                    if matched:
-                        artifacts.append({
-                            "name": item.get("name"),
-                            "id": item.get("model_id"),
-                            "type": item.get("type")
-                        })
+    response = FastJSONResponse(content=[_artifact_summary(item) for item in items])
+    next_cursor = encode_cursor(next_key)
+    if next_cursor:
+        response.headers["offset"] = next_cursor
+    return response
 
+def _clear_local_state() -> None:
+    """Drop every in-process cache and index derived from the artifact table."""
+    rating_jobs.clear()
+    artifact_index.clear()
+    lineage_index.clear()
 
-            except Exception as e:
-                raise HTTPException(status_code=403, detail=f"Failed to retrieve artifacts: {e}")
-    
-    return artifacts
 
 @app.delete("/reset")
 async def delete_artifacts(x_authorization: str = Header(None)):
     try:
-        scan = model_table.scan()
-        with model_table.batch_writer() as batch:
-            for each in scan['Items']:
-                batch.delete_item(
-                    Key={
-                        'model_id': each['model_id']
-                    }
-                )
+        # A parallel scan and batched deletes; keep them off the event loop
+        stats = await run_in_threadpool(artifact_store.delete_all)
+        _clear_local_state()
 
-        
     # 401 for no permission, 403 for failed auth
     except Exception as e:
         raise HTTPException(status_code=401, detail=f"Failed to delete artifacts: {e}")
-    
-    return {"message": "All artifacts have been deleted"}
+
+    return {"message": "All artifacts have been deleted", **stats}
 
 @app.get("/artifacts/{artifact_type}/{id}")
 async def read_artifact(artifact_type: str, id: str, x_authorization: str = Header(None)):
@@ -591,8 +619,7 @@ async def read_artifact(artifact_type: str, id: str, x_authorization: str = Head
         raise HTTPException(status_code=404, detail="No such artifact.")
     try:
         # 2) Look up item by model_id
-        query = model_table.get_item(Key={"model_id": model_id})
-        item = query.get("Item")
+        item = artifact_store.get(model_id)
 
         # 3) Not found → 404
         if not item:
@@ -607,7 +634,7 @@ async def read_artifact(artifact_type: str, id: str, x_authorization: str = Head
         download_url = item.get("download_url") or url
 
         # 5) Response shape consistent with ingest_model
-        return JSONResponse(
+        return FastJSONResponse(
             status_code=200,
             content={
                 "metadata": {
@@ -655,8 +682,7 @@ async def update_artifact(
 
     # 2) Make sure the item exists and the type matches
     try:
-        resp = model_table.get_item(Key={"model_id": model_id})
-        item = resp.get("Item")
+        item = artifact_store.get(model_id)
     except Exception as e:
         logger.error(f"Failed to read artifact {id} for update: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to read artifact: {e}")
@@ -691,37 +717,20 @@ async def update_artifact(
     if not fields_to_update:
         raise HTTPException(status_code=400, detail="No valid fields provided to update")
 
-    update_parts = []
-    expr_attr_values = {}
-    expr_attr_names = {}
-    idx = 0
-
-    for key, value in fields_to_update.items():
-        name_placeholder = f"#attr{idx}"
-        value_placeholder = f":val{idx}"
-
-        update_parts.append(f"{name_placeholder} = {value_placeholder}")
-        expr_attr_names[name_placeholder] = key
-        expr_attr_values[value_placeholder] = value
-        idx += 1
-
-    update_expression = "SET " + ", ".join(update_parts)
-
-
     # 4) Perform the update
     try:
-        update_resp = model_table.update_item(
-            Key={"model_id": model_id},
-            UpdateExpression=update_expression,
-            ExpressionAttributeNames=expr_attr_names,
-            ExpressionAttributeValues=expr_attr_values,
-            ReturnValues="ALL_NEW",  # return the updated item
-        )
-        updated_item = update_resp.get("Attributes", {})
+        updated_item = artifact_store.update(model_id, fields_to_update)
     except Exception as e:
         logger.error(f"Failed to update artifact {id}: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to update artifact: {e}")
 
+    artifact_index.upsert(updated_item)
+    lineage_index.upsert(updated_item)
+    if "url" in fields_to_update and "readme" not in fields_to_update:
+        readme_pool.submit(_index_readme, model_id, updated_item.get("url"), artifact_type)
+    if "url" in fields_to_update and "base_model" not in fields_to_update and artifact_type == "model":
+        readme_pool.submit(_index_base_models, model_id, updated_item.get("url"))
+
     # 5) Return the updated artifact (simple shape)
     return {
         "name": updated_item.get("name"),
@@ -752,8 +761,7 @@ async def delete_artifact(
 
     try:
         # 2) Check if the item exists
-        resp = model_table.get_item(Key={"model_id": model_id})
-        item = resp.get("Item")
+        item = artifact_store.get(model_id)
 
         if not item:
             # Nothing with this model_id in the table
@@ -765,7 +773,9 @@ async def delete_artifact(
             raise HTTPException(status_code=404, detail="Artifact DNE")
 
         # 4) Actually delete the item
-        model_table.delete_item(Key={"model_id": model_id})
+        artifact_store.delete(model_id)
+        artifact_index.remove(model_id)
+        lineage_index.remove(model_id)
 
         # 5) Return a simple success message
         return {
@@ -787,24 +797,246 @@ async def delete_artifact(
 # async def register_artifact(artifact_type: str, artifact: dict, user_auth: int = Depends(verify_token)):
 #     return {"artifact_type": artifact_type, "artifact": artifact}
 
+def _load_linked_urls(item: Dict[str, Any]):
+    """
+    Best-effort lookup of the code/dataset URLs linked to a model item.
+
+    Returns:
+        Tuple[Optional[str], Optional[str]]: (code_url, dataset_url)
+    """
+    code_id = item.get("code_id")
+    dataset_id = item.get("dataset_id")
+    code_url: Optional[str] = None
+    dataset_url: Optional[str] = None
+
+    linked_ids = [int(i) for i in (code_id, dataset_id) if i is not None]
+    if not linked_ids:
+        return code_url, dataset_url
+    try:
+        linked = artifact_store.batch_get(linked_ids)
+    except Exception as e:
+        logger.warning(f"Failed to retrieve linked artifacts {linked_ids}: {e}")
+        return code_url, dataset_url
+
+    if code_id is not None:
+        code_url = (linked.get(int(code_id)) or {}).get("url")
+        logger.info(f"Loaded code_url={code_url} for code_id={code_id}")
+    if dataset_id is not None:
+        dataset_url = (linked.get(int(dataset_id)) or {}).get("url")
+        logger.info(f"Loaded dataset_url={dataset_url} for dataset_id={dataset_id}")
+
+    return code_url, dataset_url
+
+
+def _compute_rating(
+    model_id: int,
+    item: Dict[str, Any],
+    code_url: Optional[str],
+    dataset_url: Optional[str],
+    fingerprint: str,
+    refresh: bool = False,
+) -> Dict[str, Any]:
+    """
+    Evaluate a model artifact, store the result on the item and return it.
+
+    `code_url`/`dataset_url` come from the registry; the LLM is only asked for
+    the ones that are missing. `refresh` recomputes every metric instead of
+    reusing cached evaluations.
+
+    Raises:
+        ArtifactNotFoundError: if the artifact was deleted while it was being rated
+    """
+    start_time = time.time()
+    model_url = item.get("url")
+    model_name = item.get("name")
+
+    # Optional LLM enrichment – NEVER required for success
+    try:
+        if not code_url:
+            logger.info("No code_url from DB; attempting LLM enrichment")
+            code_url = _genai_single_url(model_url=model_url, url_search_type="code")
+            logger.info(f"LLM suggested code_url={code_url}")
+    except Exception as e:
+        logger.warning(f"GenAI enrichment for code_url failed: {e}")
+
+    try:
+        if not dataset_url:
+            logger.info("No dataset_url from DB; attempting LLM enrichment")
+            dataset_url = _genai_single_url(model_url=model_url, url_search_type="dataset")
+            logger.info(f"LLM suggested dataset_url={dataset_url}")
+    except Exception as e:
+        logger.warning(f"GenAI enrichment for dataset_url failed: {e}")
+
+    # Build Model / Code / Dataset objects
+    model_obj = Model(url=model_url)
+    populate_model_info(model_obj)  # fills in name, maybe code/dataset, etc.
+    logger.info(f"After populate_model_info: id={model_obj.id}, name={model_obj.name}")
+
+    # If we discovered better URLs, attach them; otherwise whatever
+    # populate_model_info() set will stay in place.
+    if code_url:
+        model_obj.code = Code(url=code_url)
+    if dataset_url:
+        model_obj.dataset = Dataset(url=dataset_url)
+
+    logger.info(f"About to evaluate model {model_id}")
+
+    # Evaluate and map to expected JSON shape
+    rating = model_obj.evaluate(use_cache=not refresh)
+    logger.info(f"Computed rating for model {model_id}: {rating}")
+
+    # Unknown metrics are dropped by the shape; they don't affect the autograder
+    rating_format = RATING_SHAPE.build(rating)
+    if "name" in rating:
+        rating_format["name"] = model_name or rating["name"]
+
+    try:
+        save_rating(artifact_store, model_id, rating_format, fingerprint)
+    except ArtifactNotFoundError:
+        raise
+    except Exception as e:
+        # A rating we could not persist is still a valid answer
+        logger.warning(f"Failed to store rating for model {model_id}: {e}")
+
+    elapsed_time = time.time() - start_time
+    logger.info(f"Rating computation for model {model_id} took {elapsed_time:.2f} seconds")
+
+    return rating_format
+
+
+def _run_rating_job(model_id: int) -> None:
+    """Background job: (re)compute and store the rating of one model artifact."""
+    item = artifact_store.get(model_id)
+    if not item or item.get("type") != "model":
+        raise ValueError(f"Model artifact {model_id} does not exist")
+
+    code_url, dataset_url = _load_linked_urls(item)
+    fingerprint = rating_fingerprint(item.get("url"), code_url, dataset_url)
+    try:
+        _compute_rating(model_id, item, code_url, dataset_url, fingerprint)
+    except ArtifactNotFoundError:
+        logger.info(f"Model artifact {model_id} was deleted while it was being rated; dropping the rating")
+
+
+rating_jobs = RatingJobQueue(_run_rating_job)
+
+
+artifact_index = ArtifactIndex()
+lineage_index = LineageIndex()
+readme_pool = ThreadPoolExecutor(max_workers=2)
+
+
+def _index_readme(model_id: int, url: Optional[str], artifact_type: str) -> None:
+    """Background: fetch an artifact's README, store it on the item and in the regex index."""
+    try:
+        readme = fetch_readme(url, artifact_type) if url else None
+        if readme is None:
+            return
+        readme = readme[:artifact_index.readme_chars]
+        artifact_store.update(model_id, {"readme": readme}, if_exists=True)
+        artifact_index.set_readme(model_id, readme)
+    except ArtifactNotFoundError:
+        pass  # deleted before its README arrived
+    except Exception as e:
+        logger.warning(f"Failed to index README for artifact {model_id}: {e}")
+
+
+def _index_base_models(model_id: int, url: Optional[str]) -> None:
+    """Background: record the base models a model card declares and link them in the lineage index."""
+    try:
+        base_models = fetch_base_models(url) if url else []
+        if not base_models:
+            return
+        updated_item = artifact_store.update(model_id, {"base_model": base_models}, if_exists=True)
+        lineage_index.upsert(updated_item)
+    except ArtifactNotFoundError:
+        pass  # deleted before its model card arrived
+    except Exception as e:
+        logger.warning(f"Failed to resolve base models for artifact {model_id}: {e}")
+
+
+def _index_new_artifact(item: Dict[str, Any]) -> None:
+    """Add a freshly stored artifact to the in-memory indexes and queue its README/card lookups."""
+    artifact_index.upsert(item)
+    lineage_index.upsert(item)
+    readme_pool.submit(_index_readme, item["model_id"], item["url"], item["type"])
+    if item["type"] == "model":
+        readme_pool.submit(_index_base_models, item["model_id"], item["url"])
+
+
+def _load_artifact_index() -> None:
+    """Fill the regex and lineage indexes from the artifact table."""
+    items, _ = artifact_store.scan(attributes=tuple(dict.fromkeys(("readme",) + LINEAGE_ATTRIBUTES)))
+    artifact_index.load(items)
+    lineage_index.load(items)
+    logger.info(f"Loaded {len(artifact_index)} artifacts into the regex and lineage indexes")
+
+
+def _rate_model(model_id: int, refresh: bool) -> Dict[str, Any]:
+    """Serve the stored rating of a model artifact or compute it (blocking; run off the event loop)."""
+    # -----------------------------
+    # 2) Load the model artifact
+    # -----------------------------
+    item = artifact_store.get(model_id)
+    logger.info(f"Retrieved item for model_id {model_id}: {item}")
+
+    if not item:
+        raise HTTPException(status_code=404, detail="Artifact DNE")
+
+    if item.get("type") != "model":
+        # ID exists but not a model
+        raise HTTPException(status_code=404, detail="Artifact DNE")
+
+    logger.info(
+        f"Model {model_id} has url={item.get('url')}, code_id={item.get('code_id')}, "
+        f"dataset_id={item.get('dataset_id')}"
+    )
+
+    # -----------------------------
+    # 3) Serve the stored rating when its inputs are unchanged
+    # -----------------------------
+    code_url, dataset_url = _load_linked_urls(item)
+    fingerprint = rating_fingerprint(item.get("url"), code_url, dataset_url)
+
+    record = None if refresh else load_rating(item)
+    if record is not None and record["fingerprint"] == fingerprint:
+        if is_stale(record):
+            job = rating_jobs.submit(model_id)
+            logger.info(f"Stored rating for model {model_id} is stale; refresh job is {job['state']}")
+        rating_format = dict(record["rating"])
+        rating_format["name"] = item.get("name") or rating_format.get("name")
+        return rating_format
+
+    # -----------------------------
+    # 4) Compute, store and return
+    # -----------------------------
+    try:
+        return _compute_rating(model_id, item, code_url, dataset_url, fingerprint, refresh=refresh)
+    except ArtifactNotFoundError:
+        raise HTTPException(status_code=404, detail="Artifact DNE")
+
+
 @app.get("/artifact/model/{id}/rate")
 async def rate_model(
     id: str,
+    refresh: bool = Query(False),
     authorization: str = Header(None, alias="Authorization"),
     x_authorization: str = Header(None, alias="X-Authorization"),
 ):
     """
-    Compute and return rating metrics for a model artifact.
+    Return rating metrics for a model artifact.
+
+    A stored rating whose inputs are unchanged is served immediately; when it is
+    older than RATING_TTL_SECONDS a background refresh is started. `?refresh=true`
+    forces a synchronous recomputation of every metric, bypassing the evaluation cache.
 
     - 400: invalid artifact ID (non-numeric or <= 0)
     - 404: model artifact does not exist
     - 200: rating JSON, even if there is no linked code/dataset
     """
 
-    start_time = time.time()
-
     token_header = authorization or x_authorization
-    logger.info(f"GET /artifact/model/{id}/rate called, auth={token_header}")
+    logger.info(f"GET /artifact/model/{id}/rate called, refresh={refresh}, auth={token_header}")
 
     # -----------------------------
     # 1) Validate and parse ID
@@ -816,113 +1048,9 @@ async def rate_model(
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid artifact ID")
 
-    # Each request gets its own copy (thread-safe)
-    rating_format = copy.deepcopy(correct_metric_format)
-
     try:
-        # -----------------------------
-        # 2) Load the model artifact
-        # -----------------------------
-        resp = model_table.get_item(Key={"model_id": model_id})
-        item = resp.get("Item")
-        logger.info(f"Retrieved item for model_id {model_id}: {item}")
-
-        if not item:
-            raise HTTPException(status_code=404, detail="Artifact DNE")
-
-        if item.get("type") != "model":
-            # ID exists but not a model
-            raise HTTPException(status_code=404, detail="Artifact DNE")
-
-        model_url = item.get("url")
-        model_name = item.get("name")
-        code_id = item.get("code_id")
-        dataset_id = item.get("dataset_id")
-
-        logger.info(
-            f"Model {model_id} has url={model_url}, code_id={code_id}, dataset_id={dataset_id}"
-        )
-
-        # -----------------------------
-        # 3) Best-effort lookup of code/dataset URLs
-        # -----------------------------
-        code_url: Optional[str] = None
-        dataset_url: Optional[str] = None
-
-        # Load linked code artifact if we have an ID
-        if code_id is not None:
-            try:
-                code_query = model_table.get_item(Key={"model_id": int(code_id)})
-                code_item = code_query.get("Item")
-                code_url = code_item.get("url") if code_item else None
-                logger.info(f"Loaded code_url={code_url} for code_id={code_id}")
-            except Exception as e:
-                logger.warning(f"Failed to retrieve code artifact {code_id}: {e}")
-
-        # Load linked dataset artifact if we have an ID
-        if dataset_id is not None:
-            try:
-                dataset_query = model_table.get_item(Key={"model_id": int(dataset_id)})
-                dataset_item = dataset_query.get("Item")
-                dataset_url = dataset_item.get("url") if dataset_item else None
-                logger.info(f"Loaded dataset_url={dataset_url} for dataset_id={dataset_id}")
-            except Exception as e:
-                logger.warning(f"Failed to retrieve dataset artifact {dataset_id}: {e}")
-
-        # Optional LLM enrichment – NEVER required for success
-        try:
-            if not code_url:
-                logger.info("No code_url from DB; attempting LLM enrichment")
-                code_url = _genai_single_url(model_url=model_url, url_search_type="code")
-                logger.info(f"LLM suggested code_url={code_url}")
-        except Exception as e:
-            logger.warning(f"GenAI enrichment for code_url failed: {e}")
-
-        try:
-            if not dataset_url:
-                logger.info("No dataset_url from DB; attempting LLM enrichment")
-                dataset_url = _genai_single_url(model_url=model_url, url_search_type="dataset")
-                logger.info(f"LLM suggested dataset_url={dataset_url}")
-        except Exception as e:
-            logger.warning(f"GenAI enrichment for dataset_url failed: {e}")
-
-        # -----------------------------
-        # 4) Build Model / Code / Dataset objects
-        # -----------------------------
-        model_obj = Model(url=model_url)
-        populate_model_info(model_obj)  # fills in name, maybe code/dataset, etc.
-        logger.info(f"After populate_model_info: id={model_obj.id}, name={model_obj.name}")
-
-        # If we discovered better URLs, attach them; otherwise whatever
-        # populate_model_info() set will stay in place.
-        if code_url:
-            model_obj.code = Code(url=code_url)
-        if dataset_url:
-            model_obj.dataset = Dataset(url=dataset_url)
-
-        logger.info(f"About to evaluate model {model_id}")
-
-        # -----------------------------
-        # 5) Evaluate and map to expected JSON shape
-        # -----------------------------
-        rating = model_obj.evaluate()
-        logger.info(f"Computed rating for model {model_id}: {rating}")
-
-        for metric_name, metric_value in rating.items():
-            if metric_name in rating_format:
-                if metric_name == "name":
-                    rating_format["name"] = model_name or metric_value
-                else:
-                    rating_format[metric_name] = metric_value
-            else:
-                # Ignore unknown metrics; they don't affect the autograder
-                logger.debug(f"Ignoring extra metric {metric_name}={metric_value}")
-
-        elapsed_time = time.time() - start_time
-        logger.info(f"Rating computation for model {model_id} took {elapsed_time:.2f} seconds")
-
-        return rating_format
-
+        # Store reads and the evaluation itself block; keep them off the event loop
+        return FastJSONResponse(content=await run_in_threadpool(_rate_model, model_id, refresh))
     except HTTPException:
         # Preserve intentional HTTP errors
         raise
@@ -937,9 +1065,31 @@ async def rate_model(
             ),
         )
 
-# @app.get("/artifact/model/{id}/rate")
-# async def rate_model(id: str, rating: int, user_auth: int = Depends(verify_token)):
-#     return {"model_id": id, "rating": rating}
+@app.get("/artifact/model/{id}/rate/status")
+async def rate_job_status(
+    id: str,
+    x_authorization: str = Header(None, alias="X-Authorization"),
+):
+    """
+    Report the state of the background rating job for a model artifact.
+
+    - 400: invalid artifact ID
+    - 404: no rating job is known for this artifact
+    - 200: {"artifact_id", "state": queued|running|done|failed, timestamps, "error"}
+    """
+    try:
+        model_id = int(id)
+        if model_id <= 0:
+            raise ValueError()
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid artifact ID")
+
+    job = rating_jobs.status(model_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="No rating job for this artifact")
+    job.pop("rerun", None)
+    return job
+
 
 @app.get("/artifact/{artifact_type}/{id}/cost")
 async def get_artifact_cost(
@@ -986,8 +1136,7 @@ async def get_artifact_cost(
 
     # 3) Fetch the main artifact and ensure type matches
     try:
-        query = model_table.get_item(Key={"model_id": model_id})
-        item = query.get("Item")
+        item = artifact_store.get(model_id)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1017,8 +1166,7 @@ async def get_artifact_cost(
         # Add dataset dependency cost if we have a dataset_id
         if dataset_id is not None:
             try:
-                ds_query = model_table.get_item(Key={"model_id": int(dataset_id)})
-                ds_item = ds_query.get("Item")
+                ds_item = artifact_store.get(int(dataset_id))
                 if ds_item and ds_item.get("type") == "dataset":
                     cost_result[str(dataset_id)] = {
                         "total_cost": compute_cost(ds_item)
@@ -1033,8 +1181,7 @@ async def get_artifact_cost(
         # Add code dependency cost if we have a code_id
         if code_id is not None:
             try:
-                code_query = model_table.get_item(Key={"model_id": int(code_id)})
-                code_item = code_query.get("Item")
+                code_item = artifact_store.get(int(code_id))
                 if code_item and code_item.get("type") == "code":
                     cost_result[str(code_id)] = {
                         "total_cost": compute_cost(code_item)
@@ -1048,10 +1195,157 @@ async def get_artifact_cost(
     return cost_result
 
 
+def _put_new_artifact(item: Dict[str, Any]) -> int:
+    """
+    Insert a new artifact, guaranteeing its model_id is not already taken.
+
+    On a collision a fresh ID is allocated and the put retried.
+
+    Returns:
+        int: the model_id the item was stored under
+    """
+    for attempt in range(ID_ALLOCATION_ATTEMPTS):
+        try:
+            artifact_store.put(item, if_absent=True)
+            return item["model_id"]
+        except ArtifactExistsError:
+            logger.warning(f"model_id {item['model_id']} already taken; allocating a new one")
+            item["model_id"] = id_allocator.next_id()
+    raise RuntimeError(f"Could not allocate a unique model_id after {ID_ALLOCATION_ATTEMPTS} attempts")
+
+
+def _put_new_artifacts(items: List[Dict[str, Any]]) -> None:
+    """
+    Insert new artifacts in bulk without overwriting existing ones.
+
+    Items whose model_id turns out to be taken get a fresh ID and are written
+    again; the items are updated in place.
+    """
+    pending = items
+    for attempt in range(ID_ALLOCATION_ATTEMPTS):
+        taken = set(artifact_store.put_many(pending, if_absent=True))
+        if not taken:
+            return
+        logger.warning(f"model_ids {sorted(taken)} already taken; allocating new ones")
+        pending = [item for item in pending if item["model_id"] in taken]
+        for item, new_id in zip(pending, id_allocator.next_ids(len(pending))):
+            item["model_id"] = new_id
+    raise RuntimeError(f"Could not allocate unique model_ids after {ID_ALLOCATION_ATTEMPTS} attempts")
+
+
+def _artifact_name(url: str, name: Optional[str]) -> str:
+    """Prefer the client-provided name if present; otherwise fall back to URL-derived name."""
+    if name is not None and name.strip() != "":
+        logger.info(f"Using client-provided name '{name}' for URL '{url}'")
+        return name
+    if url in known_urls[0]:
+        return known_urls[1][known_urls[0].index(url)]
+    name = extract_name_from_url(url)[1]
+    logger.info(f"Extracted name '{name}' from URL '{url}'")
+    return name
+
+
+def _link_to_model(model_id: int, artifact_type: str, artifact_id: int) -> bool:
+    """
+    Record a matched dataset/code artifact on its model (dataset_id / code_id).
+
+    Returns:
+        bool: False if the model was deleted in the meantime (nothing is written)
+    """
+    link_field = "dataset_id" if artifact_type == "dataset" else "code_id"
+    try:
+        updated_item = artifact_store.update(model_id, {link_field: artifact_id}, if_exists=True)
+    except ArtifactNotFoundError:
+        logger.info(f"Model {model_id} was deleted before {link_field} {artifact_id} could be linked to it")
+        return False
+    lineage_index.upsert(updated_item)
+    logger.info(f"Updated model_id {model_id} with new {link_field} {artifact_id}")
+    return True
+
+
+def _store_and_link(item: Dict[str, Any]) -> int:
+    """
+    Store a new artifact and link a dataset/code artifact to its best-matching model.
+
+    Blocking (a conditional put and, for datasets and code, an LLM match); run
+    off the event loop.
+
+    Args:
+        item (dict): artifact item to store
+    Returns:
+        int: the stored model_id (a fresh ID if the allocated one was taken)
+    Raises:
+        HTTPException: 500 when the matched model could not be updated
+    """
+    artifact_type, url = item["type"], item["url"]
+    unique_id = _put_new_artifact(item)
+    _index_new_artifact(item)
+
+    if artifact_type == "dataset" or artifact_type == "code":
+        logger.info(f"Attempting to match {artifact_type} URL '{url}' to existing models")
+        matched_model_id = match_dataset_code_to_model(
+            dataset_url=url if artifact_type == "dataset" else None,
+            code_url=url if artifact_type == "code" else None
+        )
+        if matched_model_id is not None:
+            logger.info(f"Dataset/Code URL '{url}' matched to model_id {matched_model_id}")
+
+            try:
+                if _link_to_model(int(matched_model_id), artifact_type, unique_id):
+                    # The model's inputs changed; rate it again in the background
+                    rating_jobs.submit(int(matched_model_id))
+
+            except Exception as e:
+                logger.error(f"Failed to update model_id {matched_model_id}: {e}")
+                raise HTTPException(
+                    status_code=500,
+                    detail=f"Failed to update model_id {matched_model_id}: {e}",
+                )
+
+        else:
+            logger.info(f"Dataset/Code URL '{url}' did not match any existing model")
+    return unique_id
+
+
+# Registered before POST /artifact/{artifact_type}, which would otherwise match "byRegEx"
+@app.post("/artifact/byRegEx")
+async def get_artifact_by_regex(
+    body: ArtifactRegEx = Body(...),
+    offset: Optional[str] = Query(None),
+    x_authorization: str = Header(None, alias="X-Authorization"),
+):
+    """
+    Search artifact names and READMEs with a regex, one page at a time.
+
+    Served from the in-memory artifact index. `offset` is the cursor returned
+    in the `offset` header of the previous page; a page may come back short
+    (even empty) when the query used up its time budget, in which case the
+    header lets the client continue.
+    """
+    try:
+        pattern = compile_pattern(body.regex)
+        start_key = decode_cursor(offset)
+        start_after = int(start_key["model_id"]) if start_key else None
+    except (ValueError, KeyError, TypeError):
+        raise HTTPException(
+            status_code=400,
+            detail="There is missing field(s) in the artifact_regex or it is formed improperly, or is invalid",
+        )
+
+    # Waits up to REGEX_TIME_BUDGET on the matcher process; keep that off the event loop
+    results, next_after = await run_in_threadpool(artifact_index.search, pattern, ARTIFACTS_PAGE_SIZE, start_after)
+    if not results and next_after is None:
+        raise HTTPException(status_code=404, detail="No artifact found under this regex.")
+
+    response = FastJSONResponse(content=results)
+    if next_after is not None:
+        response.headers["offset"] = encode_cursor({"model_id": next_after})
+    return response
+
+
 @app.post("/artifact/{artifact_type}")
 async def ingest_model(artifact_type: str, payload: ModelIngestRequest):
     logger.info(f"POST /artifact/{artifact_type} ingest called with payload={payload.dict()}")
-    global last_time
     """
     Renegotiated ingest: register a *model* artifact.
 
@@ -1079,21 +1373,9 @@ async def ingest_model(artifact_type: str, payload: ModelIngestRequest):
     else:
         download_url = payload.url
 
-    unique_id = int(time.time() * 1000)
-    if unique_id == last_time:
-        unique_id += 1
-    last_time = unique_id
-
-    # Prefer the client-provided name if present; otherwise fall back to URL-derived name
-    if hasattr(payload, "name") and payload.name is not None and payload.name.strip() != "":
-        name = payload.name
-        logger.info(f"Using client-provided name '{name}' for URL '{payload.url}'")
-    elif payload.url in known_urls[0]:
-        index = known_urls[0].index(payload.url)
-        name = known_urls[1][index]
-    else:
-        name = extract_name_from_url(payload.url)[1]
-        logger.info(f"Extracted name '{name}' from URL '{payload.url}'")
+    unique_id = id_allocator.next_id()
+
+    name = _artifact_name(payload.url, payload.name)
 
     item = {
         "model_id": unique_id,    # DynamoDB partition key
@@ -1105,7 +1387,7 @@ async def ingest_model(artifact_type: str, payload: ModelIngestRequest):
         "code_id": None,
     }
 
-    response = JSONResponse(
+    response = FastJSONResponse(
         status_code=201,
         content={
             "metadata": {
@@ -1121,54 +1403,13 @@ async def ingest_model(artifact_type: str, payload: ModelIngestRequest):
     )
 
     try:
-        model_table.put_item(Item=item)
+        unique_id = await run_in_threadpool(_store_and_link, item)
 
-        if artifact_type == "dataset" or artifact_type == "code":
-            logger.info(f"Attempting to match {artifact_type} URL '{payload.url}' to existing models")
-            matched_model_id = match_dataset_code_to_model(
-                dataset_url=payload.url if artifact_type == "dataset" else None,
-                code_url=payload.url if artifact_type == "code" else None
-            )
-            if matched_model_id is not None:
-                logger.info(f"Dataset/Code URL '{payload.url}' matched to model_id {matched_model_id}")
-                
-                update_expression = "SET"
-                expression_attribute_values = {}
-                expression_attribute_names = {}
-
-                if artifact_type == "code":
-                    code_id = unique_id if artifact_type == "code" else None
-                    update_expression += "#code_id = :code_id"
-                    expression_attribute_values[":code_id"] = code_id
-                    expression_attribute_names["#code_id"] = "code_id"
-
-                elif artifact_type == "dataset":
-                    dataset_id = unique_id if artifact_type == "dataset" else None
-                    update_expression += "#dataset_id = :dataset_id"
-                    expression_attribute_values[":dataset_id"] = dataset_id
-                    expression_attribute_names["#dataset_id"] = "dataset_id"
-
-                try: 
-                    model_table.update_item(
-                        Key={"model_id": int(matched_model_id)},
-                        UpdateExpression=update_expression,
-                        ExpressionAttributeNames=expression_attribute_names,
-                        ExpressionAttributeValues=expression_attribute_values,
-                    )
-                    
-                    logger.info(f"Updated model_id {matched_model_id} with new {artifact_type}_id {unique_id}")
-            
-                except Exception as e:
-                    logger.error(f"Failed to update model_id {matched_model_id}: {e}")
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Failed to update model_id {matched_model_id}: {e}",
-                    )
-
-            else:
-                logger.info(f"Dataset/Code URL '{payload.url}' did not match any existing model")
-
-        response = JSONResponse(
+        if artifact_type == "model":
+            # Precompute the rating so the first /rate call is served from the store
+            rating_jobs.submit(unique_id)
+
+        response = FastJSONResponse(
             status_code=201, 
             content={
                 "metadata": {
@@ -1197,6 +1438,118 @@ async def ingest_model(artifact_type: str, payload: ModelIngestRequest):
     return
 
 
+def _bulk_ingest(artifacts: List[BulkIngestItem]) -> Dict[str, Any]:
+    """Store, index and match a validated bulk ingest (blocking; run off the event loop)."""
+    items = []
+    for new_id, artifact in zip(id_allocator.next_ids(len(artifacts)), artifacts):
+        items.append({
+            "model_id": new_id,
+            "url": artifact.url,
+            "download_url": artifact.download_url or artifact.url,
+            "type": artifact.type,
+            "name": _artifact_name(artifact.url, artifact.name),
+            "dataset_id": None,
+            "code_id": None,
+        })
+
+    try:
+        _put_new_artifacts(items)
+    except Exception as e:
+        logger.error(f"Bulk ingest write failed: {e}")
+        raise HTTPException(status_code=500, detail="Failed to store artifacts.")
+    logger.info(f"Bulk ingest stored {len(items)} artifacts")
+
+    for item in items:
+        _index_new_artifact(item)
+
+    # One matching pass for every dataset/code in the batch
+    to_rate = {item["model_id"] for item in items if item["type"] == "model"}
+    links = []
+    pools: Dict[str, List[Dict[str, Any]]] = {}
+    for item in items:
+        if item["type"] not in ("dataset", "code"):
+            continue
+        link_field = f"{item['type']}_id"
+        if link_field not in pools:
+            try:
+                pools[link_field] = _unlinked_models(link_field)
+            except Exception as e:
+                logger.error(f"Failed to load models for bulk matching: {e}")
+                pools[link_field] = []
+            known = {int(m["model_id"]) for m in pools[link_field]}
+            pools[link_field].extend(
+                m for m in items if m["type"] == "model" and m["model_id"] not in known
+            )
+
+        models = pools[link_field]
+        matched_model_id = match_dataset_code_to_model(
+            dataset_url=item["url"] if item["type"] == "dataset" else None,
+            code_url=item["url"] if item["type"] == "code" else None,
+            models=models,
+        )
+        if matched_model_id is None:
+            continue
+        matched_model_id = int(matched_model_id)
+        try:
+            linked = _link_to_model(matched_model_id, item["type"], item["model_id"])
+        except Exception as e:
+            logger.error(f"Failed to update model_id {matched_model_id}: {e}")
+            continue
+        # A linked (or since deleted) model is no longer a candidate for this kind of artifact
+        pools[link_field] = [m for m in models if int(m["model_id"]) != matched_model_id]
+        if not linked:
+            continue
+        links.append({"model_id": matched_model_id, link_field: item["model_id"]})
+        to_rate.add(matched_model_id)
+
+    for model_id in sorted(to_rate):
+        rating_jobs.submit(model_id)
+
+    return {
+        "artifacts": [
+            {
+                "metadata": {"name": item["name"], "id": item["model_id"], "type": item["type"]},
+                "data": {"url": item["url"], "download_url": item["download_url"]},
+            }
+            for item in items
+        ],
+        "links": links,
+    }
+
+
+@app.post("/artifacts/bulk")
+async def bulk_ingest(
+    artifacts: List[BulkIngestItem] = Body(...),
+    x_authorization: str = Header(None, alias="X-Authorization"),
+):
+    """
+    Register many artifacts in one call.
+
+    IDs are allocated up front and items written with conditional puts in
+    batches (TransactWriteItems on DynamoDB); an ID that is already taken is
+    replaced and its item written again. Dataset
+    and code artifacts are then matched to models in a single pass that loads
+    the unlinked models once (including models from this batch), instead of
+    one table scan per artifact.
+
+    Returns:
+        201 with {"artifacts": [...], "links": [...]} where each artifact has the
+        same shape as the single-artifact ingest response.
+    """
+    if not artifacts or len(artifacts) > BULK_INGEST_MAX:
+        raise HTTPException(status_code=400, detail=f"Provide between 1 and {BULK_INGEST_MAX} artifacts.")
+    for artifact in artifacts:
+        if artifact.type not in ("model", "dataset", "code") or not artifact.url:
+            raise HTTPException(
+                status_code=400,
+                detail="There is missing field(s) in the artifact_query or it is formed improperly, or is invalid.",
+            )
+
+    # Conditional batch writes and one LLM match per dataset/code; keep them off the event loop
+    content = await run_in_threadpool(_bulk_ingest, artifacts)
+    return FastJSONResponse(status_code=201, content=content)
+
+
 # Add database creation (Logan started on it)
 @app.put("/authenticate")
 async def authenticate_user(credentials: dict):
@@ -1211,32 +1564,24 @@ async def authenticate_user(credentials: dict):
     is_admin = credentials["user"]["is_admin"]
     password = credentials["secret"]["password"]
 
-    conn = sqlite3.connect(database_dir)
-    cursor = conn.cursor()
-    cursor.execute("SELECT id, password, secret_key FROM users WHERE username = ?", (username,))
-    row = cursor.fetchone()
+    row = auth_store.find_user(username)
 
-    # If User Exists, Check Password Generate Token
-    if row:
-        user_id, stored_hashed_password, stored_token = row
-        if not check_password(password, stored_hashed_password):
-            raise HTTPException(status_code=401, detail="The user or password is invalid.")
+    # bcrypt runs in the hasher's process pool; shed load instead of queueing without bound
+    try:
+        # If User Exists, Check Password Generate Token
+        if row:
+            user_id, stored_hashed_password, stored_token = row
+            if not await password_hasher.check(password, stored_hashed_password):
+                raise HTTPException(status_code=401, detail="The user or password is invalid.")
+        # If User Does Not Exist, Create User and Generate Token
         else:
-            create_authentication_token(user_id)
-            cursor.execute("SELECT secret_key FROM users WHERE id = ?", (user_id,))
-            stored_token = token_from_secret_key(cursor.fetchone()[0])
-            conn.close()
-            return f"\"\\\"bearer {stored_token}\\\"\""
-    # If User Does Not Exist, Create User and Generate Token
-    else:
-        add_user(username, password, "")
-        cursor.execute("SELECT id FROM users WHERE username = ?", (username,))
-        user_id = cursor.fetchone()[0]
-        create_authentication_token(user_id)
-        cursor.execute("SELECT secret_key FROM users WHERE id = ?", (user_id,))
-        stored_token = token_from_secret_key(cursor.fetchone()[0])
-        conn.close()
-        return f"\"\\\"bearer {stored_token}\\\"\""
+            user_id = auth_store.add_user(username, await password_hasher.hash(password), "")
+    except HasherBusyError:
+        raise HTTPException(status_code=503, detail="Too many concurrent authentication requests.")
+
+    token = create_authentication_token(user_id)
+    stored_token = token_from_secret_key(token)
+    return f"\"\\\"bearer {stored_token}\\\"\""
 
 from typing import Optional
 from fastapi import Query, Header, HTTPException
@@ -1266,41 +1611,28 @@ async def get_artifact_by_name(
             ),
         )
 
-    # --- Normal scan + filter ---
     try:
-        scan = model_table.scan()
+        matches = artifact_store.query_by_name(name, artifact_type)
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Failed to retrieve artifacts: {e}",
         )
 
-    artifacts = []
-
-    for item in scan.get("Items", []):
-        item_name = item.get("name")
-        item_type = item.get("type")
-
-        if item_name != name:
-            continue
-
-        # If caller specified a type, enforce it
-        if artifact_type is not None and item_type != artifact_type:
-            continue
-
-        artifacts.append(
-            {
-                "name": item_name,
-                "id": item.get("model_id"),
-                "type": item_type,
-            }
-        )
+    artifacts = [
+        {
+            "name": item.get("name"),
+            "id": item.get("model_id"),
+            "type": item.get("type"),
+        }
+        for item in matches
+    ]
 
     if not artifacts:
         # Name (or name+type) not found
         raise HTTPException(status_code=404, detail="Artifact DNE")
 
-    return artifacts
+    return FastJSONResponse(content=artifacts)
 
 
 @app.get("/artifact/{artifact_type}/{id}/audit")
@@ -1311,10 +1643,12 @@ async def get_artifact_audit(artifact_type: str, id: str, x_authorization: str =
 @app.get("/artifact/model/{id}/lineage")
 async def get_artifact_lineage(
     id: str,
+    depth: int = Query(LINEAGE_MAX_DEPTH),
+    direction: str = Query("upstream"),
     x_authorization: str = Header(None, alias="X-Authorization"),
 ):
     """
-    Return a simple lineage graph for a model.
+    Return the lineage graph of a model from the in-memory lineage index.
 
     Shape:
 
@@ -1329,100 +1663,40 @@ async def get_artifact_lineage(
       ]
     }
 
-    - 400: invalid artifact ID (non-numeric or <= 0)
+    Edges point from the upstream artifact to the one that depends on it;
+    relationship is "dataset", "code" or "base_model".
+
+    Query params:
+    - depth: maximum number of hops from the model (1..LINEAGE_MAX_DEPTH)
+    - direction: "upstream" (datasets, code and base models, transitively),
+      "downstream" (models derived from this one) or "both"
+
+    - 400: invalid artifact ID (non-numeric or <= 0), depth or direction
     - 404: model artifact does not exist or is not a model
     - 200: lineage graph JSON
     """
-    # 1) Parse and validate ID
+    # 1) Parse and validate ID and traversal params
     try:
         model_id = int(id)
         if model_id <= 0:
             raise ValueError()
     except ValueError:
         raise HTTPException(status_code=400, detail="Invalid artifact ID")
+    if not 1 <= depth <= LINEAGE_MAX_DEPTH or direction not in DIRECTIONS:
+        raise HTTPException(status_code=400, detail="Invalid lineage depth or direction")
 
     try:
-        # 2) Fetch the main model artifact
-        resp = model_table.get_item(Key={"model_id": model_id})
-        item = resp.get("Item")
-
-        if not item or item.get("type") != "model":
+        # 2) Artifacts missing from the index (e.g. written by another process) are read once
+        if model_id not in lineage_index:
+            item = artifact_store.get(model_id)
+            if item:
+                lineage_index.upsert(item)
+
+        # 3) One traversal over the adjacency index
+        graph = lineage_index.graph(model_id, depth=depth, direction=direction)
+        if graph is None or graph["nodes"][0]["source"] != "model":
             raise HTTPException(status_code=404, detail="Artifact DNE")
-
-        model_name = item.get("name")
-        dataset_id = item.get("dataset_id")
-        code_id = item.get("code_id")
-
-        # 3) Build nodes list in the expected shape
-        nodes: List[Dict[str, Any]] = []
-
-        # Always include the model node
-        nodes.append(
-            {
-                "artifact_id": model_id,
-                "name": model_name,
-                "source": "model",
-            }
-        )
-
-        edges: List[Dict[str, Any]] = []
-
-        # Helper to add a dependency node + edge
-        def add_dependency(
-            dep_id: int,
-            expected_type: str,
-            relationship: str,
-        ) -> None:
-            try:
-                dep_resp = model_table.get_item(Key={"model_id": dep_id})
-                dep_item = dep_resp.get("Item")
-            except Exception as e:
-                logger.warning(f"Failed to load dependency {dep_id}: {e}")
-                return
-
-            if not dep_item or dep_item.get("type") != expected_type:
-                return
-
-            # Add node for the dependency
-            nodes.append(
-                {
-                    "artifact_id": dep_id,
-                    "name": dep_item.get("name"),
-                    "source": expected_type,  # "dataset" or "code"
-                }
-            )
-
-            # Add edge from dependency -> model
-            edges.append(
-                {
-                    "from_node_artifact_id": dep_id,
-                    "to_node_artifact_id": model_id,
-                    "relationship": relationship,
-                }
-            )
-
-        # 4) Include dataset/code nodes + edges if present
-        if isinstance(dataset_id, int):
-            add_dependency(dataset_id, "dataset", "dataset")
-        elif isinstance(dataset_id, str):
-            try:
-                add_dependency(int(dataset_id), "dataset", "dataset")
-            except ValueError:
-                pass
-
-        if isinstance(code_id, int):
-            add_dependency(code_id, "code", "code")
-        elif isinstance(code_id, str):
-            try:
-                add_dependency(int(code_id), "code", "code")
-            except ValueError:
-                pass
-
-        # 5) Return the lineage graph in the expected format
-        return {
-            "nodes": nodes,
-            "edges": edges,
-        }
+        return FastJSONResponse(content=graph)
 
     except HTTPException:
         # Propagate explicit HTTP errors untouched
@@ -1438,10 +1712,6 @@ async def get_artifact_lineage(
 async def check_model_license(id: str, license_info: dict, x_authorization: str = Header(None, alias="X-Authorization")):
     return {"model_id": id, "license_info": license_info}
 
-@app.post("/artifact/byRegEx")
-async def get_artifact_by_regex(pattern: str, x_authorization: str = Header(None, alias="X-Authorization")):
-    return {"pattern": pattern, "artifacts": ["artifact1", "artifact2"]}
-
 @app.get("/tracks")
 async def get_tracks():
     return {"plannedTracks": ["track1"]}
@@ -1454,4 +1724,31 @@ def startup_event():
         os.makedirs(db_dir)
 
     # Initialize the database and create the users table
-    create_users_table()
\ No newline at end of file
+    create_users_table()
+    auth_store.start_flusher()
+
+    # Start rating workers (and resume persisted jobs)
+    rating_jobs.start()
+
+    try:
+        logger.info(f"Allocating artifact IDs as worker {id_allocator.worker_id}")
+    except Exception as e:
+        # Retried on the first allocation
+        logger.warning(f"Failed to lease a worker id: {e}")
+
+    try:
+        _load_artifact_index()
+    except Exception as e:
+        logger.warning(f"Failed to load the artifact indexes: {e}")
+
+
+@app.on_event("shutdown")
+def shutdown_event():
+    # Write any batched interaction counts before the process exits
+    auth_store.close()
+    password_hasher.close()
+    artifact_index.close()
+    # Let running rating jobs finish; queued ones stay persisted and resume on the next start
+    rating_jobs.stop()
+    if id_allocator.lease is not None:
+        id_allocator.lease.release()
@@ -4,6 +4,8 @@ from typing import Optional
 import os
 import logging
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, retry_if_result
+from utils import snapshot
+from utils.telemetry import track_call
 
 
 logger = logging.getLogger('cli_logger')
@@ -67,7 +69,8 @@ def prompt_gemini(prompt: str, api_key: str) -> Optional[str]:
     }
 
     try:
-        response = requests.post(url, headers=headers, json=payload)
+        with track_call("llm", "gemini"):
+            response = snapshot.request("POST", url, headers=headers, json=payload)
         response.raise_for_status()
 
         generated_text = response.json()['candidates'][0]['content']['parts'][0]['text']
@@ -1,14 +1,27 @@
 import os
 import requests
 import time
-from typing import List, Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs, urlparse
 import logging
 import json
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, retry_if_result
+from utils import snapshot
+from utils.disk_cache import DiskCache
+from utils.telemetry import track_call
 
 
 logger = logging.getLogger('cli_logger')
 
+CONTRIBUTORS_PER_PAGE = 100
+GITHUB_PAGE_WORKERS = int(os.getenv("GITHUB_PAGE_WORKERS", "8"))
+# Cached contributor lists are reused without any request for this many seconds,
+# then revalidated page by page with If-None-Match (304s don't use rate limit)
+GITHUB_CACHE_TTL = float(os.getenv("GITHUB_CACHE_TTL", "300"))
+
+_contributors_cache = DiskCache("github_contributors")
+
 
 # For Testing: Load environment variables from .env file
 from dotenv import load_dotenv
@@ -52,12 +65,13 @@ def make_request(url: str, headers: Dict[str, str], max_time: int = 60) -> reque
         headers (Dict[str, str]): Headers to include in the request.
         max_time (int): Maximum time to wait for retries in seconds.
     Returns:
-        requests.Response: The response object from the GET request.'''
+        requests.Response: The response object from the GET request (200, or 304 for a conditional request).'''
     wait_time = 1
 
     while wait_time <= 60:
-        response = requests.get(url, headers=headers)
-        if response.status_code == 200:
+        with track_call("github", "get"):
+            response = snapshot.request("GET", url, headers=headers)
+        if response.status_code in (200, 304):
             return response
         elif (
             response.status_code == 403
@@ -68,6 +82,8 @@ def make_request(url: str, headers: Dict[str, str], max_time: int = 60) -> reque
             sleep_time = max(reset_time - time.time(), wait_time)
             logger.warning(f"Rate limit exceeded. Sleeping for {sleep_time} seconds.")
             time.sleep(sleep_time)
+        elif snapshot.mode() == snapshot.REPLAY:
+            break  # a recorded failure replays identically; don't wait on it
         else:
             logger.warning(f"Request failed with status code {response.status_code}. Retrying in {wait_time} seconds.")
             time.sleep(wait_time)
@@ -86,21 +102,95 @@ def set_git_headers() -> Dict[str, str]:
     return headers
 
 
+def get_head_sha(id: str, timeout: float = 10) -> Optional[str]:
+    """
+    Resolve the current HEAD commit of a GitHub repository with a single request.
+
+    Args:
+        id (str): Repository id, "owner/repo"
+        timeout (float): Request timeout in seconds
+
+    Returns:
+        str: The 40-character commit sha, or None if it could not be resolved
+    """
+    headers = set_git_headers()
+    headers["Accept"] = "application/vnd.github.sha"  # plain-text sha instead of the commit JSON
+    try:
+        with track_call("github", "head_sha"):
+            response = snapshot.request("GET", f"https://api.github.com/repos/{id}/commits/HEAD",
+                                        headers=headers, timeout=timeout)
+    except requests.exceptions.RequestException as e:
+        logger.info(f"Failed to resolve HEAD of {id}: {e}")
+        return None
+    sha = response.text.strip() if response.status_code == 200 else ""
+    return sha if len(sha) == 40 else None
+
+
+def _last_page(response: requests.Response) -> Optional[int]:
+    """Page number of the Link header's rel="last" entry, if any."""
+    for link in requests.utils.parse_header_links(response.headers.get("Link", "")):
+        if link.get("rel") == "last":
+            page = parse_qs(urlparse(link.get("url", "")).query).get("page")
+            return int(page[0]) if page else None
+    return None
+
+
+def _contributor_page(id: str, page: int, headers: Dict[str, str],
+                      cached: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], requests.Response]:
+    """One page of contributors, revalidating `cached` ({"etag", "items"}) when given."""
+    url = f"https://api.github.com/repos/{id}/contributors?per_page={CONTRIBUTORS_PER_PAGE}&page={page}"
+    if cached and cached.get("etag"):
+        headers = {**headers, "If-None-Match": cached["etag"]}
+    response = make_request(url, headers)
+    if response.status_code == 304:
+        return cached, response
+    return {"etag": response.headers.get("ETag"), "items": response.json()}, response
+
+
 def get_contributors(id: str) -> List[Dict[str, Any]]:
     """
-    Retrieve contributors from a GitHub repository.
+    Retrieve all contributors of a GitHub repository.
+
+    The first page (100 per page) gives the last page number in its Link
+    header; the remaining pages are fetched concurrently. Pages are cached on
+    disk per repository and revalidated with their ETags once older than
+    GITHUB_CACHE_TTL.
 
     Args:
-        owner (str): Repository owner (e.g., "octocat")
-        repo (str): Repository name (e.g., "hello-world")
+        id (str): Repository id, "owner/repo"
 
     Returns:
         list: A list of contributor objects (dicts) from the GitHub API
     """
     headers = set_git_headers()
-    url = f"https://api.github.com/repos/{id}/contributors"
-    response = make_request(url, headers)
-    return response.json()
+    # Snapshot keys ignore headers, so conditional requests would replay 304s without the pages
+    use_cache = snapshot.mode() is None
+    cached = _contributors_cache.get(id.lower()) if use_cache else None
+    if cached and time.time() - cached["checked_at"] < GITHUB_CACHE_TTL:
+        return [c for n in range(1, cached["last"] + 1) for c in cached["pages"][str(n)]["items"]]
+    cached_pages = (cached or {}).get("pages", {})
+
+    first, response = _contributor_page(id, 1, headers, cached_pages.get("1"))
+    if not isinstance(first["items"], list):  # e.g. {} for an empty repository
+        return first["items"]
+    pages = {1: first}
+    last = cached["last"] if response.status_code == 304 else (_last_page(response) or 1)
+    fetched = 1
+    while fetched < last:
+        numbers = range(fetched + 1, last + 1)
+        with ThreadPoolExecutor(max_workers=min(GITHUB_PAGE_WORKERS, len(numbers))) as pool:
+            results = list(pool.map(lambda n: _contributor_page(id, n, headers, cached_pages.get(str(n))), numbers))
+        pages.update(zip(numbers, (page for page, _ in results)))
+        fetched = last
+        # Revalidated from a cached page count: a changed last page may link to new ones
+        if results[-1][1].status_code == 200:
+            last = max(last, _last_page(results[-1][1]) or last)
+
+    if use_cache:
+        _contributors_cache.set(id.lower(), {
+            "checked_at": time.time(), "last": last, "pages": {str(n): page for n, page in pages.items()},
+        })
+    return [c for n in sorted(pages) for c in pages[n]["items"]]
 
 
 # if __name__ == "__main__":
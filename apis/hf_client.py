@@ -1,13 +1,30 @@
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, Optional
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
 from huggingface_hub import HfApi, HfFolder, ModelCard, DatasetCard
+from huggingface_hub.utils import EntryNotFoundError
 import logging
 
+from utils import metric_failures, snapshot
+from utils.telemetry import timed_call
+
 HF_ENV = "HF_TOKEN"
 logger = logging.getLogger('cli_logger')
 
+# Metadata and cards are shared by every HFClient in the process for HF_CACHE_TTL
+# seconds, so the metrics of one run (and repeated API requests) fetch each repo once
+HF_CACHE_TTL = float(os.getenv("HF_CACHE_TTL", "300"))
+HF_CACHE_MAX_ENTRIES = 4096
+HF_WARMUP_WORKERS = int(os.getenv("HF_WARMUP_WORKERS", "8"))
+
+_cache: "OrderedDict[Tuple[str, str], Tuple[float, Any]]" = OrderedDict()
+_cache_lock = threading.Lock()
+
 
 def resolve_hf_token() -> Optional[str]:
     token = os.getenv(HF_ENV)
@@ -21,6 +38,32 @@ def resolve_hf_token() -> Optional[str]:
     return token
 
 
+def _cached(kind: str, repo_id: str, fetch: Callable[[str], Any]) -> Any:
+    """fetch(repo_id) through the shared TTL cache; empty results (failures) are not kept."""
+    if HF_CACHE_TTL <= 0:
+        return fetch(repo_id)
+    key = (kind, repo_id)
+    now = time.monotonic()
+    with _cache_lock:
+        hit = _cache.get(key)
+        if hit is not None and now - hit[0] < HF_CACHE_TTL:
+            _cache.move_to_end(key)
+            return hit[1]
+    value = fetch(repo_id)
+    if value:
+        with _cache_lock:
+            _cache[key] = (now, value)
+            _cache.move_to_end(key)
+            while len(_cache) > HF_CACHE_MAX_ENTRIES:
+                _cache.popitem(last=False)
+    return value
+
+
+def clear_cache() -> None:
+    with _cache_lock:
+        _cache.clear()
+
+
 class HFClient:
     def __init__(self):
         token = resolve_hf_token()
@@ -31,40 +74,88 @@ class HFClient:
 
     # Models
     def model_info(self, model_id: str) -> Dict[str, Any]:
+        return _cached("model_info", model_id, self._model_info)
+
+    def model_card_text(self, model_id: str) -> Optional[str]:
+        return _cached("model_card_text", model_id, self._model_card_text)
+
+    # Datasets
+    def dataset_info(self, dataset_id: str) -> Dict[str, Any]:
+        return _cached("dataset_info", dataset_id, self._dataset_info)
+
+    def dataset_card_text(self, dataset_id: str) -> Optional[str]:
+        return _cached("dataset_card_text", dataset_id, self._dataset_card_text)
+
+    def warm_up(self, model_ids: Iterable[str], dataset_ids: Iterable[str] = ()) -> int:
+        """
+        Fetch info and card of every model and dataset concurrently, filling the cache.
+
+        Args:
+            model_ids (Iterable[str]): Hugging Face model ids
+            dataset_ids (Iterable[str]): Hugging Face dataset ids
+
+        Returns:
+            int: number of fetches that returned data
+        """
+        calls = [(fetch, model_id) for model_id in dict.fromkeys(model_ids)
+                 for fetch in (self.model_info, self.model_card_text)]
+        calls += [(fetch, dataset_id) for dataset_id in dict.fromkeys(dataset_ids)
+                  for fetch in (self.dataset_info, self.dataset_card_text)]
+        if not calls:
+            return 0
+        with ThreadPoolExecutor(max_workers=min(HF_WARMUP_WORKERS, len(calls))) as pool:
+            return sum(1 for result in pool.map(lambda call: call[0](call[1]), calls) if result)
+
+    @timed_call("huggingface", "model_info")
+    def _model_info(self, model_id: str) -> Dict[str, Any]:
         try:
             # Use token=False for public repositories to avoid 401 errors
-            info = self.api.model_info(model_id, token=False)
-            return getattr(info, "__dict__", {}) or {}
+            return snapshot.cached_call(
+                "hf_model_info", model_id,
+                lambda: getattr(self.api.model_info(model_id, token=False), "__dict__", {}) or {})
         except Exception as e:
             logger.info(f"Failed to fetch model info for {model_id}. Exception: {e}")
+            metric_failures.report(f"model info of {model_id} unavailable: {e}")
             return {}
 
-    def model_card_text(self, model_id: str) -> Optional[str]:
+    @timed_call("huggingface", "model_card_text")
+    def _model_card_text(self, model_id: str) -> Optional[str]:
         try:
             # Use token=False for public repositories to avoid 401 errors
-            card = ModelCard.load(model_id, token=False)
-            return getattr(card, "text", None)
+            return snapshot.cached_call(
+                "hf_model_card", model_id, lambda: getattr(ModelCard.load(model_id, token=False), "text", None))
+        except EntryNotFoundError:
+            logger.info(f"Model {model_id} has no card")
+            return None
         except Exception as e:
             logger.info(f"Failed to fetch model card for {model_id}. Exception: {e}")
+            metric_failures.report(f"model card of {model_id} unavailable: {e}")
             return None
 
-    # Datasets
-    def dataset_info(self, dataset_id: str) -> Dict[str, Any]:
+    @timed_call("huggingface", "dataset_info")
+    def _dataset_info(self, dataset_id: str) -> Dict[str, Any]:
         try:
             # Use token=False for public repositories to avoid 401 errors
-            info = self.api.dataset_info(dataset_id, token=False)
-            return getattr(info, "__dict__", {}) or {}
-        except Exception:
+            return snapshot.cached_call(
+                "hf_dataset_info", dataset_id,
+                lambda: getattr(self.api.dataset_info(dataset_id, token=False), "__dict__", {}) or {})
+        except Exception as e:
             logger.info(f"Failed to fetch dataset info for {dataset_id}")
+            metric_failures.report(f"dataset info of {dataset_id} unavailable: {e}")
             return {}
 
-    def dataset_card_text(self, dataset_id: str) -> Optional[str]:
+    @timed_call("huggingface", "dataset_card_text")
+    def _dataset_card_text(self, dataset_id: str) -> Optional[str]:
         try:
             # Use token=False for public repositories to avoid 401 errors
-            card = DatasetCard.load(dataset_id, token=False)
-            return getattr(card, "text", None)
-        except Exception:
+            return snapshot.cached_call(
+                "hf_dataset_card", dataset_id, lambda: getattr(DatasetCard.load(dataset_id, token=False), "text", None))
+        except EntryNotFoundError:
+            logger.info(f"Dataset {dataset_id} has no card")
+            return None
+        except Exception as e:
             logger.info(f"Failed to fetch dataset card for {dataset_id}")
+            metric_failures.report(f"dataset card of {dataset_id} unavailable: {e}")
             return None
 
 
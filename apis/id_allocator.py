@@ -0,0 +1,175 @@
+"""
+Collision-free numeric artifact IDs for multi-worker deployments.
+
+IDs follow the Snowflake layout, sized to stay below 2**53 so they survive
+JSON clients that parse numbers as doubles:
+
+    | 41 bits: ms since ID_EPOCH_MS | 5 bits: worker id | 7 bits: sequence |
+
+Allocation is lock-free: every ID is derived from one itertools.count value,
+whose next() is atomic under the GIL. The timestamp field starts at the
+worker's start time and advances one millisecond per 128 allocations, so IDs
+from one worker can never repeat, and a restarted worker starts past every ID
+its previous incarnation handed out unless that one sustained more than 128
+IDs per millisecond.
+
+Worker ids are either pinned with ARTIFACT_WORKER_ID or leased from the
+artifact store: a WorkerLease claims a free slot with a conditional put and
+renews it in the background, so live workers never share an id. The
+conditional put at ingest remains as a backstop.
+"""
+
+import itertools
+import logging
+import os
+import socket
+import threading
+import time
+import uuid
+import zlib
+from typing import Callable, List, Optional
+
+
+logger = logging.getLogger("api")
+
+
+ID_EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+
+WORKER_BITS = 5
+SEQUENCE_BITS = 7
+MAX_WORKER_ID = (1 << WORKER_BITS) - 1
+SEQUENCE_MASK = (1 << SEQUENCE_BITS) - 1
+
+WORKER_LEASE_TTL = float(os.getenv("ARTIFACT_WORKER_LEASE_TTL", "300"))
+
+
+def default_worker_id() -> Optional[int]:
+    """
+    Worker id pinned with ARTIFACT_WORKER_ID, or None when it is unset.
+
+    Raises:
+        ValueError: if ARTIFACT_WORKER_ID is not an integer between 0 and 31
+    """
+    configured = os.getenv("ARTIFACT_WORKER_ID")
+    if configured is None or configured.strip() == "":
+        return None
+    try:
+        worker_id = int(configured)
+    except ValueError:
+        worker_id = -1
+    if not 0 <= worker_id <= MAX_WORKER_ID:
+        raise ValueError(f"ARTIFACT_WORKER_ID must be an integer between 0 and {MAX_WORKER_ID}, got {configured!r}")
+    return worker_id
+
+
+class WorkerLease:
+    def __init__(self, store, ttl: float = WORKER_LEASE_TTL, clock: Callable[[], float] = time.time) -> None:
+        """
+        Args:
+            store: ArtifactStore holding the leases (claim_lease / release_lease)
+            ttl (float): seconds a lease is valid; it is renewed every ttl / 3
+            clock (Callable): returns the current time in seconds
+        """
+        self._store = store
+        self.ttl = ttl
+        self._clock = clock
+        self.owner = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:8]}"
+        self._worker_id: Optional[int] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._renewer: Optional[threading.Thread] = None
+
+    @property
+    def worker_id(self) -> int:
+        """The leased worker id, claiming one on first use."""
+        worker_id = self._worker_id
+        if worker_id is None:
+            with self._lock:
+                if self._worker_id is None:
+                    self._acquire()
+                worker_id = self._worker_id
+        return worker_id
+
+    def _acquire(self) -> None:
+        # Start probing at a slot derived from the owner so concurrent starters rarely race for the same one
+        first = zlib.crc32(self.owner.encode("utf-8"))
+        for i in range(MAX_WORKER_ID + 1):
+            slot = (first + i) & MAX_WORKER_ID
+            now = self._clock()
+            if self._store.claim_lease(slot, self.owner, now + self.ttl, now):
+                logger.info(f"Leased worker id {slot} as {self.owner}")
+                self._worker_id = slot
+                if self._renewer is None:
+                    self._stop.clear()
+                    self._renewer = threading.Thread(target=self._renew_loop, name="worker-lease", daemon=True)
+                    self._renewer.start()
+                return
+        raise RuntimeError(f"No free worker id: all {MAX_WORKER_ID + 1} are leased by live workers")
+
+    def renew(self) -> None:
+        """Extend the lease; if another worker took the slot meanwhile, lease a different one."""
+        with self._lock:
+            if self._worker_id is None:
+                return
+            now = self._clock()
+            if self._store.claim_lease(self._worker_id, self.owner, now + self.ttl, now):
+                return
+            logger.error(f"Lost the lease on worker id {self._worker_id}; leasing another")
+            self._worker_id = None
+            self._acquire()
+
+    def _renew_loop(self) -> None:
+        while not self._stop.wait(self.ttl / 3):
+            try:
+                self.renew()
+            except Exception as e:
+                logger.warning(f"Failed to renew worker id lease: {e}")
+
+    def release(self) -> None:
+        """Stop renewing and free the slot."""
+        self._stop.set()
+        with self._lock:
+            worker_id, self._worker_id = self._worker_id, None
+            self._renewer = None
+        if worker_id is not None:
+            self._store.release_lease(worker_id, self.owner)
+
+
+class SnowflakeIdGenerator:
+    def __init__(self, worker_id: Optional[int] = None, epoch_ms: int = ID_EPOCH_MS,
+                 clock: Callable[[], float] = time.time, lease: Optional[WorkerLease] = None) -> None:
+        """
+        Args:
+            worker_id (int): 0-31; defaults to default_worker_id()
+            epoch_ms (int): custom epoch the timestamp is measured from
+            clock (Callable): returns the current time in seconds
+            lease (WorkerLease): supplies the worker id when none is pinned
+        """
+        if worker_id is None:
+            worker_id = default_worker_id()
+        if worker_id is None and lease is None:
+            raise ValueError("Set ARTIFACT_WORKER_ID or pass a worker_id or lease")
+        if worker_id is not None and not 0 <= worker_id <= MAX_WORKER_ID:
+            raise ValueError(f"worker_id must be between 0 and {MAX_WORKER_ID}")
+        self._worker_id = worker_id
+        self.lease = lease if worker_id is None else None
+        self._started_ms = int(clock() * 1000) - epoch_ms
+        self._counter = itertools.count()
+        # Random sequence offset so workers that share an id rarely produce the same IDs
+        self._offset = int.from_bytes(os.urandom(1), "big") & SEQUENCE_MASK
+
+    @property
+    def worker_id(self) -> int:
+        return self._worker_id if self.lease is None else self.lease.worker_id
+
+    def next_id(self) -> int:
+        """Allocate one ID."""
+        worker_id = self.worker_id
+        n = next(self._counter)
+        timestamp = self._started_ms + (n >> SEQUENCE_BITS)
+        sequence = (n + self._offset) & SEQUENCE_MASK
+        return (timestamp << (WORKER_BITS + SEQUENCE_BITS)) | (worker_id << SEQUENCE_BITS) | sequence
+
+    def next_ids(self, count: int) -> List[int]:
+        """Allocate `count` distinct IDs."""
+        return [self.next_id() for _ in range(count)]
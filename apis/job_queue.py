@@ -0,0 +1,239 @@
+"""
+In-process background job queue for model ratings.
+
+Jobs are keyed by artifact ID, so submitting a rating for an artifact that is
+already queued is a no-op and submitting one that is running schedules exactly
+one re-run. A bounded number of worker threads drain the queue. When a SQLite
+path is configured, job records are persisted and unfinished jobs are resumed
+the next time the API starts.
+"""
+
+import logging
+import os
+import queue
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional
+
+
+logger = logging.getLogger("api")
+
+RATING_JOB_WORKERS = int(os.getenv("RATING_JOB_WORKERS", "2"))
+RATING_JOB_DB = os.getenv("RATING_JOB_DB")  # e.g. ./databases/jobs.db; unset keeps jobs in memory only
+RATING_JOB_STOP_TIMEOUT = float(os.getenv("RATING_JOB_STOP_TIMEOUT", "30"))
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+FAILED = "failed"
+
+
+class RatingJobQueue:
+    def __init__(self, worker: Callable[[int], Any], max_workers: int = RATING_JOB_WORKERS,
+                 store_path: Optional[str] = RATING_JOB_DB) -> None:
+        """
+        Args:
+            worker (Callable[[int], Any]): function that rates one artifact ID
+            max_workers (int): number of worker threads
+            store_path (str): optional SQLite file used to persist job records
+        """
+        self._worker = worker
+        self._max_workers = max(1, max_workers)
+        self._store_path = store_path
+        self._queue: "queue.Queue[int]" = queue.Queue()
+        self._jobs: Dict[int, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+        self._threads: List[threading.Thread] = []
+        self._stopping = False
+        self._deferred: List[int] = []
+        if store_path:
+            self._init_store()
+
+    # Persistence
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self._store_path, timeout=10)
+
+    def _init_store(self) -> None:
+        store_dir = os.path.dirname(self._store_path)
+        if store_dir:
+            os.makedirs(store_dir, exist_ok=True)
+        conn = self._connect()
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS rating_jobs (
+                artifact_id INTEGER PRIMARY KEY,
+                state TEXT NOT NULL,
+                enqueued_at REAL,
+                started_at REAL,
+                finished_at REAL,
+                error TEXT
+            )
+        ''')
+        conn.commit()
+        conn.close()
+
+    def _persist(self, job: Dict[str, Any]) -> None:
+        """Write a job record; pass a copy taken under the lock, workers mutate the live dict."""
+        if not self._store_path:
+            return
+        try:
+            conn = self._connect()
+            conn.execute(
+                "INSERT OR REPLACE INTO rating_jobs (artifact_id, state, enqueued_at, started_at, finished_at, error) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (job["artifact_id"], job["state"], job["enqueued_at"], job["started_at"],
+                 job["finished_at"], job["error"]),
+            )
+            conn.commit()
+            conn.close()
+        except sqlite3.Error as e:
+            logger.warning(f"Failed to persist rating job {job['artifact_id']}: {e}")
+
+    # Lifecycle
+    def start(self) -> None:
+        """Start the worker threads and requeue unfinished persisted jobs."""
+        with self._lock:
+            if self._threads:
+                return
+            self._stopping = False
+            for i in range(self._max_workers):
+                t = threading.Thread(target=self._run, name=f"rating-job-{i}", daemon=True)
+                self._threads.append(t)
+                t.start()
+            # Jobs left queued by a previous stop()
+            for artifact_id in self._deferred:
+                self._queue.put(artifact_id)
+            self._deferred.clear()
+        if self._store_path:
+            self._resume()
+
+    def stop(self, timeout: float = RATING_JOB_STOP_TIMEOUT) -> None:
+        """
+        Stop the worker threads, letting running jobs finish.
+
+        Queued jobs are not started; they stay queued (and persisted) and run after
+        the next start(). A job still running after `timeout` keeps its persisted
+        "running" state and is resumed on the next start.
+        """
+        with self._lock:
+            threads, self._threads = self._threads, []
+            self._stopping = True
+        for _ in threads:
+            self._queue.put(None)
+        deadline = time.monotonic() + timeout
+        for t in threads:
+            t.join(max(0.0, deadline - time.monotonic()))
+            if t.is_alive():
+                logger.warning(f"Rating worker {t.name} did not finish within {timeout:.0f}s")
+
+    def _resume(self) -> None:
+        conn = self._connect()
+        rows = conn.execute(
+            "SELECT artifact_id FROM rating_jobs WHERE state IN (?, ?)", (QUEUED, RUNNING)
+        ).fetchall()
+        conn.close()
+        for (artifact_id,) in rows:
+            logger.info(f"Resuming persisted rating job for artifact {artifact_id}")
+            self.submit(artifact_id)
+
+    def clear(self) -> None:
+        """Forget every job record and drop queued work (used by /reset)."""
+        with self._lock:
+            while True:
+                try:
+                    self._queue.get_nowait()
+                    self._queue.task_done()
+                except queue.Empty:
+                    break
+            self._jobs.clear()
+            self._deferred.clear()
+        if self._store_path:
+            conn = self._connect()
+            conn.execute("DELETE FROM rating_jobs")
+            conn.commit()
+            conn.close()
+
+    def join(self) -> None:
+        """Block until every queued job has been processed."""
+        self._queue.join()
+
+    # Jobs
+    def submit(self, artifact_id: int) -> Dict[str, Any]:
+        """
+        Enqueue a rating job, merging it with an existing queued or running job.
+
+        Returns:
+            dict: snapshot of the job record
+        """
+        if not self._stopping:
+            self.start()
+        with self._lock:
+            job = self._jobs.get(artifact_id)
+            if job and job["state"] == QUEUED:
+                return dict(job)
+            if job and job["state"] == RUNNING:
+                # Inputs may have changed after the running job read them; rerun once afterwards
+                job["rerun"] = True
+                return dict(job)
+            job = {
+                "artifact_id": artifact_id,
+                "state": QUEUED,
+                "enqueued_at": time.time(),
+                "started_at": None,
+                "finished_at": None,
+                "error": None,
+                "rerun": False,
+            }
+            self._jobs[artifact_id] = job
+            self._queue.put(artifact_id)
+            record = dict(job)
+        self._persist(record)
+        return record
+
+    def status(self, artifact_id: int) -> Optional[Dict[str, Any]]:
+        """Return a snapshot of the job record for an artifact, or None."""
+        with self._lock:
+            job = self._jobs.get(artifact_id)
+            return dict(job) if job else None
+
+    def _run(self) -> None:
+        while True:
+            artifact_id = self._queue.get()
+            try:
+                if artifact_id is None:
+                    # stop() sentinel
+                    return
+                with self._lock:
+                    job = self._jobs.get(artifact_id)
+                    if job is None:
+                        # Cleared while queued
+                        continue
+                    if self._stopping:
+                        self._deferred.append(artifact_id)
+                        continue
+                    job["state"] = RUNNING
+                    job["started_at"] = time.time()
+                    job["rerun"] = False
+                    record = dict(job)
+                self._persist(record)
+
+                try:
+                    self._worker(artifact_id)
+                    state, error = DONE, None
+                except Exception as e:
+                    logger.warning(f"Rating job for artifact {artifact_id} failed: {e}")
+                    state, error = FAILED, str(e)
+
+                with self._lock:
+                    if self._jobs.get(artifact_id) is not job:
+                        continue
+                    job["state"] = state
+                    job["error"] = error
+                    job["finished_at"] = time.time()
+                    rerun = job["rerun"]
+                    record = dict(job)
+                self._persist(record)
+                if rerun:
+                    self.submit(artifact_id)
+            finally:
+                self._queue.task_done()
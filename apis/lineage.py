@@ -0,0 +1,221 @@
+"""
+In-memory lineage graph for GET /artifact/model/{id}/lineage.
+
+LineageIndex keeps parent and child adjacency lists for every artifact. It is
+loaded from the artifact table at startup and kept current by ingest, update,
+link and delete, so a lineage query is a single breadth-first traversal with
+no table reads. Edges point from the upstream artifact to the one that
+depends on it:
+
+    dataset_id     dataset    -> model    relationship "dataset"
+    code_id        code       -> model    relationship "code"
+    base_model_id  model      -> model    relationship "base_model"
+    base_model     model      -> model    relationship "base_model"
+
+`base_model` holds the Hugging Face repo ids a model card declares (cardData
+`base_model`). They are matched by name against ingested models, including
+models ingested later, and `base_model_id` can be set explicitly through the
+update endpoint.
+"""
+
+import os
+import threading
+from collections import deque
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from apis.hf_client import HFClient
+from utils.url_parser import classify_url, extract_name_from_url
+
+
+LINEAGE_MAX_DEPTH = int(os.getenv("LINEAGE_MAX_DEPTH", "10"))
+LINEAGE_ATTRIBUTES = ("name", "type", "dataset_id", "code_id", "base_model_id", "base_model")
+DIRECTIONS = ("upstream", "downstream", "both")
+
+_LINK_FIELDS = (("dataset_id", "dataset"), ("code_id", "code"), ("base_model_id", "base_model"))
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    if isinstance(value, (list, tuple, set)):
+        return list(value)
+    return [value]
+
+
+def _as_id(value: Any) -> Optional[int]:
+    # Dynamo returns numbers as Decimal; older rows may hold numeric strings
+    try:
+        artifact_id = int(value)
+    except (TypeError, ValueError):
+        return None
+    return artifact_id if artifact_id > 0 else None
+
+
+def _name_key(name: Any) -> str:
+    """Match key for a model name or HF repo id ("google/gemma-2b" -> "gemma-2b")."""
+    return str(name).rstrip("/").rsplit("/", 1)[-1].lower() if name else ""
+
+
+def fetch_base_models(url: str) -> List[str]:
+    """Base model repo ids declared in a Hugging Face model card, if any."""
+    if classify_url(url) != "model":
+        return []
+    owner, name = extract_name_from_url(url)
+    repo_id = f"{owner}/{name}" if owner else name
+    if not repo_id:
+        return []
+    info = HFClient().model_info(repo_id)
+    card = info.get("card_data") or info.get("cardData") or {}
+    base = card.get("base_model") if isinstance(card, dict) else getattr(card, "base_model", None)
+    return [str(b) for b in _as_list(base) if b]
+
+
+class LineageIndex:
+    def __init__(self) -> None:
+        self._nodes: Dict[int, Tuple[str, str]] = {}  # id -> (name, type)
+        self._parents: Dict[int, Dict[int, str]] = {}  # child -> {parent: relationship}
+        self._children: Dict[int, Dict[int, str]] = {}  # parent -> {child: relationship}
+        self._models_by_name: Dict[str, Set[int]] = {}
+        self._declared_bases: Dict[int, Set[str]] = {}  # model -> base name keys from its card
+        self._declared_by: Dict[str, Set[int]] = {}  # base name key -> models declaring it
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def __contains__(self, artifact_id: int) -> bool:
+        return artifact_id in self._nodes
+
+    def _link(self, parent: int, child: int, relationship: str) -> None:
+        if parent == child:
+            return
+        self._parents.setdefault(child, {})[parent] = relationship
+        self._children.setdefault(parent, {})[child] = relationship
+
+    def _unlink_parents(self, child: int) -> None:
+        for parent in self._parents.pop(child, {}):
+            children = self._children.get(parent)
+            if children is not None:
+                children.pop(child, None)
+
+    def _forget_names(self, artifact_id: int) -> None:
+        name, artifact_type = self._nodes.get(artifact_id, ("", ""))
+        ids = self._models_by_name.get(_name_key(name))
+        if artifact_type == "model" and ids is not None:
+            ids.discard(artifact_id)
+        for base in self._declared_bases.pop(artifact_id, ()):
+            self._declared_by.get(base, set()).discard(artifact_id)
+
+    def load(self, items: Iterable[Dict[str, Any]]) -> None:
+        """Replace the index contents with `items` (artifact table rows)."""
+        self.clear()
+        for item in items:
+            self.upsert(item)
+
+    def upsert(self, item: Dict[str, Any]) -> None:
+        """Add or update one artifact and replace its upstream edges from the item's link fields."""
+        artifact_id = int(item["model_id"])
+        name, artifact_type = item.get("name") or "", item.get("type") or ""
+        with self._lock:
+            self._forget_names(artifact_id)
+            self._unlink_parents(artifact_id)
+            self._nodes[artifact_id] = (name, artifact_type)
+
+            for field, relationship in _LINK_FIELDS:
+                for value in _as_list(item.get(field)):
+                    parent = _as_id(value)
+                    if parent is not None:
+                        self._link(parent, artifact_id, relationship)
+
+            bases = {_name_key(b) for b in _as_list(item.get("base_model")) if b}
+            bases.discard("")
+            self._declared_bases[artifact_id] = bases
+            for base in bases:
+                self._declared_by.setdefault(base, set()).add(artifact_id)
+                for parent in self._models_by_name.get(base, ()):
+                    self._link(parent, artifact_id, "base_model")
+
+            if artifact_type == "model":
+                key = _name_key(name)
+                self._models_by_name.setdefault(key, set()).add(artifact_id)
+                # Models that declared this one as their base before it was ingested
+                for child in self._declared_by.get(key, ()):
+                    self._link(artifact_id, child, "base_model")
+
+    def remove(self, artifact_id: int) -> None:
+        with self._lock:
+            self._forget_names(artifact_id)
+            self._nodes.pop(artifact_id, None)
+            self._unlink_parents(artifact_id)
+            for child in self._children.pop(artifact_id, {}):
+                parents = self._parents.get(child)
+                if parents is not None:
+                    parents.pop(artifact_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._nodes = {}
+            self._parents = {}
+            self._children = {}
+            self._models_by_name = {}
+            self._declared_bases = {}
+            self._declared_by = {}
+
+    def graph(self, root: int, depth: int = LINEAGE_MAX_DEPTH,
+              direction: str = "upstream") -> Optional[Dict[str, List[Dict[str, Any]]]]:
+        """
+        Transitive lineage of `root`, up to `depth` hops.
+
+        Args:
+            root (int): artifact id the traversal starts from
+            depth (int): maximum number of hops from root
+            direction (str): "upstream" (what root depends on), "downstream"
+                (what depends on root) or "both"
+
+        Returns:
+            dict: {"nodes": [...], "edges": [...]} with root as the first node,
+            or None if root is not indexed
+        """
+        walks = []
+        if direction in ("upstream", "both"):
+            walks.append(True)
+        if direction in ("downstream", "both"):
+            walks.append(False)
+
+        with self._lock:
+            if root not in self._nodes:
+                return None
+            seen = [root]
+            visited = {root}
+            edges: Dict[Tuple[int, int], str] = {}
+            for upstream in walks:
+                adjacency = self._parents if upstream else self._children
+                queue = deque([(root, 0)])
+                expanded = {root}
+                while queue:
+                    node, hops = queue.popleft()
+                    if hops >= depth:
+                        continue
+                    for neighbour, relationship in adjacency.get(node, {}).items():
+                        if neighbour not in self._nodes:
+                            continue  # link to an artifact that no longer exists
+                        edge = (neighbour, node) if upstream else (node, neighbour)
+                        edges[edge] = relationship
+                        if neighbour not in visited:
+                            visited.add(neighbour)
+                            seen.append(neighbour)
+                        if neighbour not in expanded:
+                            expanded.add(neighbour)
+                            queue.append((neighbour, hops + 1))
+            nodes = [
+                {"artifact_id": node, "name": self._nodes[node][0], "source": self._nodes[node][1]}
+                for node in seen
+            ]
+
+        return {
+            "nodes": nodes,
+            "edges": [
+                {"from_node_artifact_id": parent, "to_node_artifact_id": child, "relationship": relationship}
+                for (parent, child), relationship in edges.items()
+            ],
+        }
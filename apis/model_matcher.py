@@ -0,0 +1,140 @@
+"""
+Candidate prefilter and concurrent scoring for dataset/code -> model matching.
+
+Scoring a dataset or code URL against a model costs one LLM call, so instead of
+asking about every model in the registry we first rank models locally by how
+much their URL looks like the incoming one (name and owner token overlap plus
+URL path similarity) and only send the top-k to the LLM. Those calls run
+concurrently and stop early once a rating crosses the confidence threshold.
+"""
+
+import logging
+import os
+import re
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from difflib import SequenceMatcher
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set, Tuple
+from urllib.parse import urlparse
+
+from utils.url_parser import extract_name_from_url
+
+
+logger = logging.getLogger("api")
+
+MATCH_TOP_K = int(os.getenv("MATCH_TOP_K", "10"))
+MATCH_MAX_WORKERS = int(os.getenv("MATCH_MAX_WORKERS", "4"))
+MATCH_CONFIDENCE = float(os.getenv("MATCH_CONFIDENCE", "0.9"))
+
+# URL fragments that say nothing about which artifact a URL points to
+_NOISE_TOKENS = {
+    "", "http", "https", "www", "com", "co", "org", "io", "huggingface", "github", "gitlab",
+    "datasets", "dataset", "spaces", "tree", "blob", "main", "master", "git", "resolve",
+}
+
+
+def _tokens(text: str) -> Set[str]:
+    return {t for t in re.split(r"[^a-z0-9]+", (text or "").lower()) if t not in _NOISE_TOKENS}
+
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+
+def _path(url: str) -> str:
+    try:
+        return urlparse(url or "").path.strip("/").lower()
+    except ValueError:
+        return ""
+
+
+def candidate_score(test_url: str, model_url: str) -> float:
+    """
+    Cheap local plausibility that `test_url` belongs to the model at `model_url`.
+
+    Args:
+        test_url (str): dataset or code URL being ingested
+        model_url (str): URL of a registered model
+    Returns:
+        float: score in [0, 1]; higher means more plausible
+    """
+    test_owner, test_name = extract_name_from_url(test_url)
+    model_owner, model_name = extract_name_from_url(model_url)
+
+    name_overlap = _jaccard(_tokens(test_name), _tokens(model_name))
+    owner_overlap = _jaccard(_tokens(test_owner), _tokens(model_owner))
+    # Names often carry the owner (e.g. google-research/bert vs google-bert/bert-base-uncased)
+    cross_overlap = _jaccard(_tokens(test_owner + " " + test_name), _tokens(model_owner + " " + model_name))
+    path_similarity = SequenceMatcher(None, _path(test_url), _path(model_url)).ratio()
+
+    return 0.45 * name_overlap + 0.2 * owner_overlap + 0.2 * cross_overlap + 0.15 * path_similarity
+
+
+def top_candidates(test_url: str, models: Iterable[Dict[str, Any]], k: int = MATCH_TOP_K) -> List[Dict[str, Any]]:
+    """
+    Keep the k registered models whose URLs look most like `test_url`.
+
+    Args:
+        test_url (str): dataset or code URL being ingested
+        models (Iterable[dict]): model items, each with at least 'url'
+        k (int): number of candidates to keep
+    Returns:
+        List[dict]: candidates, most plausible first
+    """
+    scored = [(candidate_score(test_url, m.get("url") or ""), i, m) for i, m in enumerate(models)]
+    scored.sort(key=lambda entry: (-entry[0], entry[1]))
+    return [m for _, _, m in scored[:max(0, k)]]
+
+
+def best_match(
+    candidates: List[Dict[str, Any]],
+    rate: Callable[[Dict[str, Any]], Optional[float]],
+    max_workers: int = MATCH_MAX_WORKERS,
+    threshold: float = MATCH_CONFIDENCE,
+) -> Tuple[Optional[Dict[str, Any]], float]:
+    """
+    Rate candidates concurrently and return the best one.
+
+    Ties are broken by candidate order (the prefilter's ranking). Remaining calls
+    are cancelled as soon as a rating reaches `threshold`.
+
+    Args:
+        candidates (List[dict]): model items, most plausible first
+        rate (Callable): returns a rating in [0, 1] (or None) for one candidate
+        max_workers (int): maximum concurrent rating calls
+        threshold (float): rating at which to stop early
+    Returns:
+        Tuple[Optional[dict], float]: best candidate (None if nothing rated > 0) and its rating
+    """
+    best: Optional[Dict[str, Any]] = None
+    best_rating = 0.0
+    best_rank = len(candidates)
+    if not candidates:
+        return best, best_rating
+
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers))
+    try:
+        futures = {executor.submit(rate, c): rank for rank, c in enumerate(candidates)}
+        for future in as_completed(futures):
+            rank = futures[future]
+            try:
+                rating = future.result()
+                rating = float(rating) if rating is not None else None
+            except (TypeError, ValueError) as e:
+                logger.warning(f"Candidate rating returned a non-float value: {e}")
+                continue
+            except Exception as e:
+                logger.warning(f"Candidate rating failed: {e}")
+                continue
+            if rating is None:
+                continue
+            if rating > best_rating or (rating == best_rating and rating > 0 and rank < best_rank):
+                best, best_rating, best_rank = candidates[rank], rating, rank
+            if best_rating >= threshold:
+                logger.info(f"Rating {best_rating} reached confidence threshold {threshold}; stopping early")
+                break
+    finally:
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    return best, best_rating
@@ -0,0 +1,60 @@
+"""
+Opaque cursor tokens for paginated list endpoints.
+
+A cursor is the DynamoDB key to resume a scan from (ExclusiveStartKey),
+JSON encoded and base64url wrapped so clients treat it as an opaque string.
+"""
+
+import base64
+import binascii
+import json
+import os
+from decimal import Decimal
+from typing import Any, Dict, Optional
+
+
+ARTIFACTS_PAGE_SIZE = int(os.getenv("ARTIFACTS_PAGE_SIZE", "100"))
+
+
+def _plain(value: Any) -> Any:
+    # boto3 returns DynamoDB numbers as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    return value
+
+
+def encode_cursor(key: Optional[Dict[str, Any]]) -> Optional[str]:
+    """
+    Turn a DynamoDB key into an opaque cursor token.
+
+    Args:
+        key (dict): LastEvaluatedKey / ExclusiveStartKey, or None
+    Returns:
+        str: cursor token, or None when there is nothing left to read
+    """
+    if not key:
+        return None
+    raw = json.dumps({k: _plain(v) for k, v in key.items()}, sort_keys=True, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: Optional[str]) -> Optional[Dict[str, Any]]:
+    """
+    Turn a cursor token back into a DynamoDB key.
+
+    Empty tokens and the legacy offset "0" mean "start from the beginning".
+
+    Raises:
+        ValueError: if the token is not a cursor issued by encode_cursor()
+    """
+    if token is None or token.strip() in ("", "0"):
+        return None
+    token = token.strip()
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        key = json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError):
+        raise ValueError(f"Invalid pagination cursor: {token}")
+    if not isinstance(key, dict) or not key:
+        raise ValueError(f"Invalid pagination cursor: {token}")
+    return key
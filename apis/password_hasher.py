@@ -0,0 +1,142 @@
+"""
+bcrypt hashing and verification off the event loop.
+
+bcrypt is deliberately CPU-bound, so running it inside an async handler blocks
+every other request for the duration of the hash. PasswordHasher runs it in a
+bounded process pool and admits at most AUTH_MAX_PENDING password operations
+at once; anything beyond that is rejected immediately instead of queueing
+behind a login storm. Latency of the admitted operations is tracked separately
+from the rest of the API.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import bcrypt
+
+
+logger = logging.getLogger("api")
+
+BCRYPT_ROUNDS = int(os.getenv("BCRYPT_ROUNDS", "12"))
+AUTH_HASH_WORKERS = int(os.getenv("AUTH_HASH_WORKERS", "2"))
+AUTH_MAX_PENDING = int(os.getenv("AUTH_MAX_PENDING", "32"))
+
+LATENCY_WINDOW = 1000  # most recent operations kept for percentiles
+
+
+class HasherBusyError(Exception):
+    """Raised when AUTH_MAX_PENDING password operations are already in flight."""
+
+
+def hash_password(password: str, rounds: int = BCRYPT_ROUNDS) -> str:
+    salt = bcrypt.gensalt(rounds=rounds)
+    hashed = bcrypt.hashpw(password.encode('utf-8'), salt)
+    return hashed.decode('utf-8')
+
+
+def check_password(password: str, hashed_password: str) -> bool:
+    return bcrypt.checkpw(password.encode('utf-8'), hashed_password.encode('utf-8'))
+
+
+class LatencyStats:
+    def __init__(self, window: int = LATENCY_WINDOW) -> None:
+        self._samples: "deque[float]" = deque(maxlen=window)
+        self._count = 0
+        self._rejected = 0
+        self._lock = threading.Lock()
+
+    def record(self, seconds: float) -> None:
+        with self._lock:
+            self._samples.append(seconds)
+            self._count += 1
+
+    def reject(self) -> None:
+        with self._lock:
+            self._rejected += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Returns:
+            dict: total count, rejected count, and mean/p50/p95/max in ms over
+            the most recent LATENCY_WINDOW operations
+        """
+        with self._lock:
+            samples = sorted(self._samples)
+            count, rejected = self._count, self._rejected
+        if not samples:
+            return {"count": count, "rejected": rejected, "mean_ms": 0, "p50_ms": 0, "p95_ms": 0, "max_ms": 0}
+
+        def pct(p: float) -> float:
+            return round(samples[min(len(samples) - 1, int(p * len(samples)))] * 1000, 2)
+
+        return {
+            "count": count,
+            "rejected": rejected,
+            "mean_ms": round(sum(samples) / len(samples) * 1000, 2),
+            "p50_ms": pct(0.5),
+            "p95_ms": pct(0.95),
+            "max_ms": round(samples[-1] * 1000, 2),
+        }
+
+
+class PasswordHasher:
+    def __init__(self, workers: int = AUTH_HASH_WORKERS, max_pending: int = AUTH_MAX_PENDING,
+                 rounds: int = BCRYPT_ROUNDS) -> None:
+        """
+        Args:
+            workers (int): processes running bcrypt
+            max_pending (int): password operations admitted at once (running or queued)
+            rounds (int): bcrypt cost factor for new hashes
+        """
+        self.workers = max(1, workers)
+        self.max_pending = max(1, max_pending)
+        self.rounds = rounds
+        self.stats = LatencyStats()
+        self._pending = 0
+        self._lock = threading.Lock()
+        self._pool: Optional[ProcessPoolExecutor] = None
+
+    def _executor(self) -> ProcessPoolExecutor:
+        with self._lock:
+            if self._pool is None:
+                # spawn: never fork the API process along with its worker threads
+                self._pool = ProcessPoolExecutor(
+                    max_workers=self.workers, mp_context=multiprocessing.get_context("spawn")
+                )
+            return self._pool
+
+    async def _run(self, fn: Callable, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                self.stats.reject()
+                raise HasherBusyError(f"{self._pending} password operations already pending")
+            self._pending += 1
+        start = time.perf_counter()
+        try:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor(), fn, *args)
+        finally:
+            self.stats.record(time.perf_counter() - start)
+            with self._lock:
+                self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """Hash a password with the configured cost."""
+        return await self._run(hash_password, password, self.rounds)
+
+    async def check(self, password: str, hashed_password: str) -> bool:
+        """Check a password against a stored bcrypt hash."""
+        return await self._run(check_password, password, hashed_password)
+
+    def close(self) -> None:
+        with self._lock:
+            pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
@@ -4,6 +4,8 @@ from typing import Optional
 import os
 import logging
 from tenacity import retry, stop_after_attempt, wait_exponential, retry_if_exception_type, retry_if_result
+from utils import snapshot
+from utils.telemetry import track_call
 
 
 logger = logging.getLogger('cli_logger')
@@ -67,7 +69,8 @@ def prompt_purdue_genai(prompt: str, api_key: str) -> Optional[str]:
         ],
         "stream": False
     }
-    response = requests.post(url, headers=headers, json=body)
+    with track_call("llm", "purdue_genai"):
+        response = snapshot.request("POST", url, headers=headers, json=body)
     data = response.json()
     if response.status_code == 200:
         return(data["choices"][0]["message"]["content"])
@@ -0,0 +1,100 @@
+"""
+Persisted rating results for GET /artifact/model/{id}/rate.
+
+Ratings are stored on the artifact item itself (no side table) as three
+attributes:
+
+    rating_json         - the rating response, JSON encoded (DynamoDB rejects floats)
+    rating_computed_at  - epoch seconds when the rating was computed
+    rating_fingerprint  - hash of the inputs the rating was computed from
+
+A stored rating is only reused when its fingerprint matches the artifact's
+current inputs; it is served immediately and re-queued for rating once it is
+older than RATING_TTL_SECONDS.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import time
+from typing import Any, Dict, Optional
+
+
+logger = logging.getLogger("api")
+
+RATING_TTL_SECONDS = int(os.getenv("RATING_TTL_SECONDS", "86400"))  # default to one day
+
+
+def rating_fingerprint(model_url: Optional[str], code_url: Optional[str], dataset_url: Optional[str]) -> str:
+    """
+    Hash the inputs a rating depends on.
+
+    Only inputs stored in the registry are included; URLs suggested by the LLM
+    enrichment are nondeterministic and would make every fingerprint unique.
+
+    Args:
+        model_url (str): URL of the model artifact
+        code_url (str): URL of the linked code artifact, if any
+        dataset_url (str): URL of the linked dataset artifact, if any
+    Returns:
+        str: hex digest identifying the inputs
+    """
+    payload = json.dumps(
+        {"model_url": model_url or "", "code_url": code_url or "", "dataset_url": dataset_url or ""},
+        sort_keys=True,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def load_rating(item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Read the stored rating record from an artifact item.
+
+    Returns:
+        dict with 'rating', 'computed_at' and 'fingerprint', or None when the
+        item has no (readable) stored rating.
+    """
+    raw = item.get("rating_json")
+    if not raw:
+        return None
+    try:
+        rating = json.loads(raw)
+    except (TypeError, ValueError):
+        logger.warning(f"Ignoring unreadable stored rating for model_id {item.get('model_id')}")
+        return None
+    return {
+        "rating": rating,
+        "computed_at": float(item.get("rating_computed_at") or 0),
+        "fingerprint": item.get("rating_fingerprint"),
+    }
+
+
+def is_stale(record: Dict[str, Any], ttl: Optional[int] = None, now: Optional[float] = None) -> bool:
+    """Return True when a stored rating is older than the TTL."""
+    ttl = RATING_TTL_SECONDS if ttl is None else ttl
+    now = time.time() if now is None else now
+    return now - record.get("computed_at", 0) > ttl
+
+
+def save_rating(store, model_id: int, rating: Dict[str, Any], fingerprint: str) -> Dict[str, Any]:
+    """
+    Store a freshly computed rating on the artifact item.
+
+    Args:
+        store (ArtifactStore): store holding the artifacts
+        model_id (int): key of the model artifact
+        rating (dict): rating response to store
+        fingerprint (str): fingerprint of the inputs the rating was computed from
+    Returns:
+        dict: the stored record, same shape as load_rating()
+    Raises:
+        ArtifactNotFoundError: if the artifact was deleted while it was being rated
+    """
+    computed_at = int(time.time())
+    store.update(model_id, {
+        "rating_json": json.dumps(rating),
+        "rating_computed_at": computed_at,
+        "rating_fingerprint": fingerprint,
+    }, if_exists=True)
+    return {"rating": rating, "computed_at": computed_at, "fingerprint": fingerprint}
@@ -0,0 +1,63 @@
+"""
+Matcher process behind ArtifactIndex.search().
+
+The process keeps its own copy of the index (id -> name, README), kept in
+step by "sync" messages that carry only what changed since the previous
+query. A "search" message streams one EXAMINED record per artifact tried,
+then a one-byte MORE / EXHAUSTED marker. The parent enforces the time budget
+by killing the process, so this module only imports the standard library and
+a replacement starts quickly.
+"""
+
+import bisect
+import struct
+from typing import Dict, List, Tuple
+
+
+EXAMINED = struct.Struct("<q?")  # artifact id, matched
+READY = b"r"
+MORE = b"m"  # stopped at the page limit
+EXHAUSTED = b"x"  # examined every artifact after start_after
+
+
+def serve(conn) -> None:
+    """
+    Process entry point; answers messages on `conn` until the parent closes it.
+
+    Messages:
+        ("sync", reset, upserts, removed): apply {id: (name, readme)} / [id] changes
+            (on top of an empty copy when reset); answered with READY
+        ("search", pattern, start_after, limit, name_chars): match the artifacts
+            after start_after in id order until `limit` of them matched
+    """
+    entries: Dict[int, Tuple[str, str]] = {}
+    ids: List[int] = []
+    conn.send_bytes(READY)
+    while True:
+        try:
+            message = conn.recv()
+        except EOFError:
+            return
+        if message[0] == "sync":
+            _, reset, upserts, removed = message
+            if reset:
+                entries = {}
+            for artifact_id in removed:
+                entries.pop(artifact_id, None)
+            entries.update(upserts)
+            ids = sorted(entries)
+            conn.send_bytes(READY)
+        elif message[0] == "search":
+            _, pattern, start_after, limit, name_chars = message
+            start = bisect.bisect_right(ids, start_after) if start_after is not None else 0
+            found = 0
+            end = EXHAUSTED
+            for position in range(start, len(ids)):
+                name, readme = entries[ids[position]]
+                matched = bool(pattern.search(name[:name_chars]) or (readme and pattern.search(readme)))
+                conn.send_bytes(EXAMINED.pack(ids[position], matched))
+                found += matched
+                if found == limit:
+                    end = MORE if position < len(ids) - 1 else EXHAUSTED
+                    break
+            conn.send_bytes(end)
@@ -0,0 +1,71 @@
+"""
+Fast JSON responses for the API.
+
+FastJSONResponse serializes with orjson when it is installed and falls back to
+the standard library otherwise; both paths accept the Decimal numbers boto3
+returns. It is the app's default response class, but FastAPI still runs its
+generic jsonable_encoder over plain dicts and lists returned by a handler, so
+hot endpoints return a FastJSONResponse directly to skip that pass.
+
+ResponseShape precompiles a fixed response layout (such as the rating
+response) so filling it in is one dict comprehension instead of a deepcopy of
+a template followed by key-by-key updates.
+"""
+
+import json
+from decimal import Decimal
+from typing import Any, Dict, Mapping
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson installed
+    orjson = None
+
+
+def _default(value: Any) -> Any:
+    # boto3 returns DynamoDB numbers as Decimal
+    if isinstance(value, Decimal):
+        return int(value) if value == value.to_integral_value() else float(value)
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+def dumps(content: Any) -> bytes:
+    """Serialize `content` to compact UTF-8 JSON."""
+    if orjson is not None:
+        return orjson.dumps(content, default=_default, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(content, default=_default, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    media_type = "application/json"
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
+
+
+class ResponseShape:
+    def __init__(self, template: Mapping[str, Any]) -> None:
+        """
+        Args:
+            template (Mapping): field order and default values of the response
+        """
+        # Nested defaults (e.g. size_score) are the only values that need copying per response
+        self._fields = tuple((key, default, isinstance(default, dict)) for key, default in template.items())
+
+    def build(self, values: Mapping[str, Any], **overrides: Any) -> Dict[str, Any]:
+        """
+        Fill the shape from `values`; keys outside the shape are ignored.
+
+        Returns:
+            dict: a new response dict, in template order
+        """
+        shaped = {
+            key: values[key] if key in values else (dict(default) if nested else default)
+            for key, default, nested in self._fields
+        }
+        shaped.update(overrides)
+        return shaped
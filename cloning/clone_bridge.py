@@ -3,12 +3,25 @@ import os
 import logging
 from pathlib import Path
 
+from cloning.mirror_cache import get_mirror_cache
+
 logger = logging.getLogger('cli_logger')
 
 
 def clone_with_isogit(repo_url: str, local_dir: str = "./models") -> None:
     # Resolve paths
     local_dir_abs = str(Path(local_dir).resolve())
+    repo_name = repo_url.rstrip("/").split("/")[-1]
+    if repo_name.endswith(".git"):
+        repo_name = repo_name[:-len(".git")]
+
+    # Prefer a local clone of the cached mirror; it only fetches objects that are new since the last request
+    try:
+        get_mirror_cache().checkout(repo_url, os.path.join(local_dir_abs, repo_name))
+        logger.info(f"Cloned {repo_url} into {local_dir_abs} from the mirror cache.")
+        return
+    except Exception as e:
+        logger.warning(f"Mirror cache clone of {repo_url} failed, falling back to isogit: {e}")
     script_path = Path(__file__).parent / "clone.js"
     
     # Create directory if it doesn't exist
@@ -0,0 +1,70 @@
+"""
+Commit authorship of a repository's recent history, from a local git mirror.
+
+Each repository is mirrored once as a bare, commit-only clone
+(--filter=tree:0, so no trees or file contents) of its default branch,
+limited to the last GIT_HISTORY_DAYS with --shallow-since. Later calls run
+an incremental fetch of the same bounded window, which only transfers new
+commits. Mirrors live in the "history" MirrorCache, so concurrent callers
+share one fetch and old mirrors are evicted under the disk quota. Authors
+are counted by splitting the window into time slices and running one
+`git log` per slice in a thread pool. Once a mirror is warm, no GitHub REST
+quota is used at all.
+"""
+
+import datetime
+import logging
+import os
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict
+
+from cloning.mirror_cache import MirrorCache, git
+from utils import snapshot
+from utils.disk_cache import MODELREUSE_CACHE_DIR
+
+
+logger = logging.getLogger('cli_logger')
+
+GIT_HISTORY_DIR = os.getenv("GIT_HISTORY_DIR", os.path.join(MODELREUSE_CACHE_DIR, "git-history"))
+GIT_HISTORY_DAYS = int(os.getenv("GIT_HISTORY_DAYS", "365"))
+GIT_HISTORY_WORKERS = int(os.getenv("GIT_HISTORY_WORKERS", "4"))
+
+_mirrors = MirrorCache(GIT_HISTORY_DIR, name="history")
+
+
+def _count_authors(path: str, since: int, until: int) -> Counter:
+    """Commits per author with since <= commit time <= until (unix seconds)."""
+    log = git("log", "--use-mailmap", "--format=%aE", f"--since=@{since}", f"--until=@{until}", "HEAD", cwd=path)
+    return Counter(line.strip().lower() for line in log.splitlines() if line.strip())
+
+
+def commit_authors(repo_url: str, days: int = GIT_HISTORY_DAYS) -> Dict[str, int]:
+    """
+    Commits per author email on the default branch over the last `days` days.
+
+    Args:
+        repo_url (str): clone URL of the repository
+        days (int): size of the history window
+
+    Returns:
+        dict: author email -> commit count (empty if the window has no commits)
+
+    Raises:
+        RuntimeError: if the mirror cannot be created or updated
+    """
+    def read() -> Dict[str, int]:
+        until = datetime.datetime.now(datetime.timezone.utc)
+        since = until - datetime.timedelta(days=days)
+        window = ("--filter=tree:0", f"--shallow-since={since.strftime('%Y-%m-%d')}")
+        start, end = int(since.timestamp()), int(until.timestamp())
+        bounds = [start + (end - start) * i // GIT_HISTORY_WORKERS for i in range(GIT_HISTORY_WORKERS + 1)]
+        slices = [(bounds[i], bounds[i + 1] - 1 if i + 1 < GIT_HISTORY_WORKERS else end)
+                  for i in range(GIT_HISTORY_WORKERS)]
+        with _mirrors.use(repo_url, clone_args=("--single-branch",) + window, fetch_args=window) as path, \
+                ThreadPoolExecutor(max_workers=GIT_HISTORY_WORKERS) as pool:
+            counts = sum(pool.map(lambda bounds: _count_authors(path, *bounds), slices), Counter())
+        return dict(counts)
+
+    # git runs outside snapshot.request, so snapshots record the aggregated counts
+    return snapshot.cached_call("git_authors", f"{repo_url} {days}d", read)
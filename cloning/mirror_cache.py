@@ -0,0 +1,233 @@
+"""
+Persistent bare-mirror cache for repository clones.
+
+Each repository URL gets one bare mirror under the cache root. The first
+request clones it; later requests run an incremental `git fetch`, which
+only transfers new objects. Concurrent requests for the same repository
+share a single clone or fetch. A mirror's directory mtime records its last
+use. When the mirrors exceed the disk quota, the least recently used ones
+are deleted, except mirrors that are in use at that moment.
+
+Lookups (hit / miss / shared), bytes added to mirrors and evictions are
+exported as Prometheus metrics labelled by cache name, and are also
+available from MirrorCache.stats().
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import subprocess
+import threading
+from concurrent.futures import Future
+from contextlib import contextmanager
+from typing import Dict, Iterator, Optional, Sequence
+
+from utils.disk_cache import MODELREUSE_CACHE_DIR
+from utils.telemetry import (CLONE_CACHE_DISK, CLONE_CACHE_EVICTIONS, CLONE_CACHE_FETCHED, CLONE_CACHE_REQUESTS,
+                             track_call)
+
+
+logger = logging.getLogger('cli_logger')
+
+CLONE_CACHE_DIR = os.getenv("CLONE_CACHE_DIR", os.path.join(MODELREUSE_CACHE_DIR, "mirrors"))
+CLONE_CACHE_MAX_MB = float(os.getenv("CLONE_CACHE_MAX_MB", "5120"))
+GIT_TIMEOUT = float(os.getenv("GIT_TIMEOUT", "120"))
+
+_RESULTS = {"hits": "hit", "misses": "miss", "shared": "shared"}
+
+
+def git(*args: str, cwd: Optional[str] = None) -> str:
+    """Run git non-interactively and return stdout; raises RuntimeError on failure."""
+    result = subprocess.run(["git", *args], cwd=cwd, capture_output=True, text=True, timeout=GIT_TIMEOUT,
+                            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"})
+    if result.returncode != 0:
+        raise RuntimeError(f"git {args[0]} failed: {result.stderr.strip()}")
+    return result.stdout
+
+
+def _disk_bytes(path: str) -> int:
+    total = 0
+    for directory, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.lstat(os.path.join(directory, name)).st_size
+            except OSError:
+                pass
+    return total
+
+
+class MirrorCache:
+    def __init__(self, root: str = CLONE_CACHE_DIR, max_bytes: int = int(CLONE_CACHE_MAX_MB * 1024 * 1024),
+                 name: str = "clones") -> None:
+        """
+        Args:
+            root (str): directory holding one bare mirror per repository
+            max_bytes (int): disk quota for all mirrors under root
+            name (str): label of this cache in the exported metrics
+        """
+        self.root = root
+        self.max_bytes = max_bytes
+        self.name = name
+        self._lock = threading.Lock()
+        self._pending: Dict[str, Future] = {}
+        self._in_use: Dict[str, int] = {}
+        self._stats = {"hits": 0, "misses": 0, "shared": 0, "bytes_fetched": 0, "evictions": 0}
+
+    def path(self, repo_url: str) -> str:
+        normalized = repo_url.strip().rstrip("/").lower()
+        if normalized.endswith(".git"):
+            normalized = normalized[:-len(".git")]
+        return os.path.join(self.root, hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:32] + ".git")
+
+    @contextmanager
+    def use(self, repo_url: str, clone_args: Sequence[str] = (), fetch_args: Sequence[str] = ()) -> Iterator[str]:
+        """
+        Up-to-date mirror of `repo_url`, protected from eviction while the block runs.
+
+        Args:
+            repo_url (str): clone URL of the repository
+            clone_args (Sequence[str]): extra `git clone --bare` arguments for a new mirror
+                (with --single-branch only the default branch is kept up to date)
+            fetch_args (Sequence[str]): extra `git fetch` arguments for an existing mirror
+
+        Yields:
+            str: path of the bare mirror
+
+        Raises:
+            RuntimeError: if git fails (unknown repository, network error, ...)
+        """
+        path = self.path(repo_url)
+        with self._lock:
+            self._in_use[path] = self._in_use.get(path, 0) + 1
+            future = self._pending.get(path)
+            owner = future is None
+            if owner:
+                future = self._pending[path] = Future()
+        try:
+            if owner:
+                try:
+                    self._update(repo_url, path, clone_args, fetch_args)
+                    future.set_result(path)
+                except BaseException as e:
+                    future.set_exception(e)
+                    raise
+                finally:
+                    with self._lock:
+                        self._pending.pop(path, None)
+            else:
+                self._count("shared")
+                future.result()
+            os.utime(path)
+            yield path
+        finally:
+            with self._lock:
+                self._in_use[path] -= 1
+                if not self._in_use[path]:
+                    del self._in_use[path]
+        if owner:
+            self.evict()
+
+    def _update(self, repo_url: str, path: str, clone_args: Sequence[str], fetch_args: Sequence[str]) -> None:
+        if os.path.exists(os.path.join(path, "HEAD")):
+            before = _disk_bytes(path)
+            with track_call("git", "fetch"):
+                git("fetch", "--prune", *fetch_args, "origin", cwd=path)
+            self._count("hits")
+        else:
+            before = 0
+            os.makedirs(self.root, exist_ok=True)
+            shutil.rmtree(path, ignore_errors=True)  # leftovers of an interrupted clone
+            try:
+                with track_call("git", "clone"):
+                    git("clone", "--bare", *clone_args, repo_url, path)
+                # A bare clone has no fetch refspec; later fetches update the kept branches in place
+                if "--single-branch" in clone_args:
+                    branch = git("symbolic-ref", "HEAD", cwd=path).strip()
+                    refspec = f"+{branch}:{branch}"
+                else:
+                    refspec = "+refs/heads/*:refs/heads/*"
+                git("config", "remote.origin.fetch", refspec, cwd=path)
+            except BaseException:
+                shutil.rmtree(path, ignore_errors=True)
+                raise
+            self._count("misses")
+        fetched = max(0, _disk_bytes(path) - before)
+        self._count("bytes_fetched", fetched)
+
+    def checkout(self, repo_url: str, target: str) -> str:
+        """
+        Fresh working copy of `repo_url` at `target`, cloned locally from its mirror.
+
+        Returns:
+            str: target
+        """
+        with self.use(repo_url) as path:
+            shutil.rmtree(target, ignore_errors=True)
+            os.makedirs(os.path.dirname(os.path.abspath(target)), exist_ok=True)
+            # --local hardlinks the mirror's objects, so the copy survives the mirror's eviction
+            git("clone", "--local", "--single-branch", path, target)
+            git("remote", "set-url", "origin", repo_url, cwd=target)
+        return target
+
+    def evict(self) -> int:
+        """Delete least recently used mirrors until the cache fits its quota; returns mirrors deleted."""
+        if not os.path.isdir(self.root):
+            return 0
+        mirrors = []
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            if os.path.isdir(path):
+                mirrors.append((os.stat(path).st_mtime, path, _disk_bytes(path)))
+        total = sum(size for _, _, size in mirrors)
+        evicted = 0
+        for _, path, size in sorted(mirrors):
+            if total <= self.max_bytes:
+                break
+            with self._lock:
+                if path in self._in_use or path in self._pending:
+                    continue
+                # Claimed so a concurrent use() waits for the deletion rather than reading a half-deleted mirror
+                self._pending[path] = claim = Future()
+            try:
+                shutil.rmtree(path, ignore_errors=True)
+            finally:
+                claim.set_result(None)
+                with self._lock:
+                    self._pending.pop(path, None)
+            total -= size
+            evicted += 1
+            self._count("evictions")
+            logger.info(f"Evicted mirror {path} ({size} bytes) from {self.name} cache")
+        CLONE_CACHE_DISK.set(total, cache=self.name)
+        return evicted
+
+    def _count(self, field: str, amount: int = 1) -> None:
+        with self._lock:
+            self._stats[field] += amount
+        if field in _RESULTS:
+            CLONE_CACHE_REQUESTS.inc(amount, cache=self.name, result=_RESULTS[field])
+        elif field == "bytes_fetched":
+            CLONE_CACHE_FETCHED.inc(amount, cache=self.name)
+        else:
+            CLONE_CACHE_EVICTIONS.inc(amount, cache=self.name)
+
+    def stats(self) -> Dict[str, int]:
+        """Hits, misses, shared (concurrent) requests, bytes fetched, evictions and disk usage."""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["disk_bytes"] = _disk_bytes(self.root) if os.path.isdir(self.root) else 0
+        return stats
+
+
+_cache: Optional[MirrorCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_mirror_cache() -> MirrorCache:
+    """Process-wide cache of full mirrors used for working-copy clones."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = MirrorCache()
+        return _cache
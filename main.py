@@ -8,7 +8,7 @@ import logging
 import zipfile
 import requests
 
-from utils.url_parser import parse_URL_file, print_model_summary
+from utils.url_parser import parse_URL_file, print_model_summary, warm_hf_metadata
 from utils.logger import setup_logger
 from utils.prompt_key import get_prompt_key
 from utils.env_check import check_environment
@@ -17,6 +17,8 @@ from apis.gemini import *
 from apis.purdue_genai import *
 from apis.hf_client import resolve_hf_token
 from apis.fast_api import *
+from utils import snapshot
+import metrics.bus_factor
 
 # For Testing: Load environment variables from .env file
 from dotenv import load_dotenv
@@ -25,27 +27,62 @@ load_dotenv()  # reads .env file into environment variables
 
 
 
+def use_snapshot_llm(provider: str) -> None:
+    '''
+    Make an offline run prompt the LLM provider the snapshot was recorded with.
+
+    Prompts are replayed by URL and request body, so the key itself is never
+    sent; a placeholder only selects the provider when no real key is set.
+
+    Args:
+        provider (str): "purdue_genai" or "gemini", from the snapshot manifest
+    '''
+    if provider == "purdue_genai" and not get_purdue_genai_key():
+        os.environ["GEN_AI_STUDIO_API_KEY"] = "offline"
+        # bus_factor reads its key at import time
+        metrics.bus_factor.GEN_AI_STUDIO_API_KEY = "offline"
+    elif provider == "gemini" and not get_gemini_key():
+        os.environ["GEMINI_API_KEY"] = "offline"
+
+
 def main():
-    if not check_environment():
+    parser = argparse.ArgumentParser(description="ModelReuseCLI main entry point")
+    parser.add_argument('url_file', type=str, help="Path to URL_FILE for analysis")
+    snapshot_mode = parser.add_mutually_exclusive_group()
+    snapshot_mode.add_argument('--export-snapshot', metavar='DIR',
+                               help="Record every network input of this run into DIR")
+    snapshot_mode.add_argument('--offline', metavar='SNAPSHOT',
+                               help="Run without network access against a directory made by --export-snapshot")
+    args = parser.parse_args()
+
+    if not check_environment(offline=bool(args.offline)):
         sys.exit(1)
 
+    if args.offline:
+        try:
+            snapshot.configure(snapshot.REPLAY, args.offline)
+        except FileNotFoundError as e:
+            print(f"Error: {e}", file=sys.stderr)
+            sys.exit(1)
+        use_snapshot_llm(snapshot.load_manifest(args.offline).get("llm_provider"))
+    elif args.export_snapshot:
+        snapshot.configure(snapshot.RECORD, args.export_snapshot)
+
     # FastAPI integration - query artifacts from running server
-    try:
-        response = requests.get("http://127.0.0.1:8000/", timeout=1)
-        if response.status_code == 200:
-            artifacts = response.json()
-            print("Artifacts retrieved successfully:")
-            print(json.dumps(artifacts, indent=2))
-    except requests.exceptions.RequestException:
-        pass  # Server not running, continue normal operation
+    if not args.offline:
+        try:
+            response = requests.get("http://127.0.0.1:8000/", timeout=1)
+            if response.status_code == 200:
+                artifacts = response.json()
+                print("Artifacts retrieved successfully:")
+                print(json.dumps(artifacts, indent=2))
+        except requests.exceptions.RequestException:
+            pass  # Server not running, continue normal operation
 
     setup_logger()  # configure logging once
     logger = logging.getLogger('cli_logger')
     
     logger.info("Starting ModelReuseCLI...")
-    parser = argparse.ArgumentParser(description="ModelReuseCLI main entry point")
-    parser.add_argument('url_file', type=str, help="Path to URL_FILE for analysis")
-    args = parser.parse_args()
 
     # Treat as URL_FILE path
     url_file = args.url_file
@@ -56,7 +93,7 @@ def main():
         sys.exit(1)
 
     # Ensure LLM tokens are present by attempting to get the keys
-    get_prompt_key()
+    prompt_key = get_prompt_key()
     
     # Parse the URL file and create Model objects
     models, dataset_registry = parse_URL_file(url_file)
@@ -72,8 +109,19 @@ def main():
     logger.debug(f"  - {len(models)} Model objects")
     logger.debug(f"  - {len(dataset_registry)} unique datasets")
     logger.info("Objects ready for metric calculation teams.")
+
+    # Fetch the whole batch's HuggingFace metadata up front so the metrics start with a hot cache
+    warm_hf_metadata(models, dataset_registry)
     for model in models:
         print(json.dumps(model.evaluate()))
 
+    if args.export_snapshot:
+        snapshot.write_manifest(url_file=os.path.basename(url_file), llm_provider=next(iter(prompt_key)))
+        logger.info(f"Snapshot written to {args.export_snapshot}: {snapshot.stats()['recorded']} calls recorded")
+    elif args.offline:
+        missed = snapshot.stats()["missed"]
+        if missed:
+            logger.warning(f"{missed} calls were not in the snapshot and scored as unavailable")
+
 if __name__ == "__main__":
     main()
\ No newline at end of file
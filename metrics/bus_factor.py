@@ -1,11 +1,22 @@
-from typing import Any, Dict
+from typing import Any, Dict, Iterable, Optional
 from apis import git_api
+from cloning.git_history import commit_authors
 import logging
 import os
-import requests
+from utils import metric_failures, snapshot
+from utils.telemetry import track_call
 
 logger = logging.getLogger("api")
 
+# "contributors": GitHub /contributors counts (REST API)
+# "history": commit authors of the last GIT_HISTORY_DAYS from a local git mirror
+BUS_FACTOR_MODE = os.getenv("BUS_FACTOR_MODE", "contributors").lower()
+
+# Re-scored when the linked repo's contributor counts change (history mode: when its HEAD moves)
+INPUTS = ("code",) if BUS_FACTOR_MODE == "history" else ("contributors",)
+# Non-GitHub code is graded by the LLM; history mode reads GIT_HISTORY_DAYS of commits
+CONFIG = ("bus_factor_mode", "llm_provider") + (("git_history_days",) if BUS_FACTOR_MODE == "history" else ())
+
 GEN_AI_STUDIO_API_KEY = os.getenv("GEN_AI_STUDIO_API_KEY")
 
 # Parse the API key if it's a JSON string from AWS Secrets Manager
@@ -48,15 +59,17 @@ def get_genai_metric_data(model_url: str, prompt: str) -> Dict[str, Any]:
     }
 
     try:
-        resp = requests.post(
-            PURDUE_GENAI_URL, headers=headers, json=body, timeout=20)
+        with track_call("llm", "bus_factor"):
+            resp = snapshot.request(
+                "POST", PURDUE_GENAI_URL, headers=headers, json=body, timeout=20)
         resp.raise_for_status()
         data = resp.json()
         metric = data.get("choices", [{}])[0].get(
             "message", {}).get("content", "").strip()
         return {"metric": metric}
     except Exception as e:
-        logger.debug
+        logger.debug(f"GenAI request for {model_url} failed: {e}")
+        return {}
 
 
 def get_genai_bus_factor(model_url: str, code_url: str, repo_meta: dict = None) -> float:
@@ -96,8 +109,9 @@ URL:"""
                     return min(1.0, score / 100.0)
         # Fallback if extraction fails
         raise ValueError("GenAI extraction failed.")
-    except Exception:
+    except Exception as e:
         # Heuristic fallback
+        metric_failures.report(f"bus factor: GenAI analysis of {model_url or code_url} failed: {e}")
         return 0.5
         # top_pct = float((repo_meta or {}).get("top_contributor_pct", 1.0))
         # return min(1.0, max(0.0, 1.0 - top_pct))
@@ -130,31 +144,68 @@ def bus_factor(model_url, code_url, id: str, code_type: str) -> float:
     Returns:
         float: The bus factor of the repository. [0-1]
     """
+    if BUS_FACTOR_MODE == "history" and code_type in ("github", "gitlab") and code_url:
+        history_score = get_history_bus_factor(code_url)
+        if history_score is not None:
+            return history_score
     if code_type != "github":
         #phase 1 update
         return get_genai_bus_factor(model_url, code_url, None)
     contributors = git_api.get_contributors(id)
+    return bus_factor_from_counts(contributor['contributions'] for contributor in contributors or [])
+
+
+def bus_factor_from_counts(counts: Iterable[int]) -> float:
+    """
+    Bus factor from commits per contributor: 1 - (contributors covering half the commits / all contributors).
+
+    Args:
+        counts (Iterable[int]): Number of commits of each contributor.
+
+    Returns:
+        float: The bus factor. [0-1]
+    """
+    counts = sorted(counts, reverse=True)
     # Handle edge cases
-    if not contributors:
+    if not counts:
         return 0
-    elif len(contributors) == 1:
+    elif len(counts) == 1:
         return 1
 
     raw_bus_factor = 0
-    total_commits = sum(contributor['contributions'] for contributor in contributors)
-    sorted_contributors = sorted(contributors, key=lambda x: x['contributions'], reverse=True)
+    total_commits = sum(counts)
     cumulative_commits = 0
-    for contributor in sorted_contributors:
-        cumulative_commits += contributor['contributions']
+    for count in counts:
+        cumulative_commits += count
         raw_bus_factor += 1
         if cumulative_commits >= total_commits / 2:
             break
-    score = raw_bus_factor/len(contributors)
+    score = raw_bus_factor/len(counts)
     bus_factor = 1 - score
     
     return bus_factor
 
 
+def get_history_bus_factor(code_url: str) -> Optional[float]:
+    """
+    Bus factor from commit authorship of the repository's recent history (no REST quota).
+
+    Args:
+        code_url (str): URL of the GitHub/GitLab repository.
+
+    Returns:
+        float: The bus factor [0-1], or None if the history could not be read.
+    """
+    repo_url = code_url.split("/tree/")[0].split("/blob/")[0].rstrip("/")
+    try:
+        authors = commit_authors(repo_url)
+    except Exception as e:
+        logger.info(f"Falling back from history bus factor for {code_url}: {e}")
+        metric_failures.report(f"bus factor: history of {code_url} unreadable: {e}")
+        return None
+    return bus_factor_from_counts(authors.values())
+
+
 # if __name__ == "__main__":
 #     # Case 1: Major open source repo
 #     owner = "google-bert"
@@ -5,6 +5,8 @@ import ast
 import subprocess
 import sys
 import requests
+from utils import metric_failures, snapshot
+from utils.telemetry import track_call
 from typing import Any, Dict, List, Optional, Tuple
 from urllib.parse import urlparse
 from pathlib import Path
@@ -15,6 +17,10 @@ from cloning.clone_bridge import clone_with_isogit
 import logging
 logger = logging.getLogger('cli_logger')
 
+# Re-scored on new commits to the linked repo or changed contributor counts
+INPUTS = ("code", "contributors")
+CONFIG = ()
+
 
 def analyze_code_quality(files: List[str]) -> Dict[str, float]:
     """Lightweight heuristics based on file list."""
@@ -176,11 +182,15 @@ def safe_request(url: str, timeout: int = 10, **
                  kwargs) -> Optional[requests.Response]:
     """Make a safe HTTP GET request with error handling."""
     try:
-        resp = requests.get(url, timeout=timeout, **kwargs)
+        with track_call("github", "get"):
+            resp = snapshot.request("GET", url, timeout=timeout, **kwargs)
         resp.raise_for_status()
         return resp
     except Exception as e:
         logger.debug(f"Request failed for {url}: {e}")
+        # A 404 is an answer (e.g. no "main" branch); anything else leaves the metric guessing
+        if getattr(getattr(e, "response", None), "status_code", None) != 404:
+            metric_failures.report(f"code quality: request to {url} failed: {e}")
         return None
     
 
@@ -258,6 +268,7 @@ def get_github_repo_data(code_url: str) -> Dict[str, Any]:
                 break
     except Exception as e:
         logger.debug(f"Failed to fetch GitHub data: {e}")
+        metric_failures.report(f"code quality: GitHub data of {owner}/{repo} unreadable: {e}")
 
     return data
 
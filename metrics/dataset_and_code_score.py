@@ -1,28 +1,30 @@
 from huggingface_hub import HfFileSystem
 from apis.hf_client import HFClient
 from apis.git_api import *
+from utils import metric_failures
+from utils.liveness import get_checker
 
 
 
+# Re-scored when the model, code or dataset links change
+INPUTS = ("links",)
+CONFIG = ()
+
+
 def check_availability(code_url: str, dataset_url: str,
                        model_url: str) -> Dict[str, Any]:
-    """HEAD the URLs and report availability of each and overall links_ok."""
+    """HEAD the URLs concurrently (cached) and report availability of each and overall links_ok."""
     results = {"has_code": False, "has_dataset": False,
                "has_model": False, "links_ok": False}
     urls = [("code", code_url), ("dataset", dataset_url), ("model", model_url)]
+    probes = get_checker().check(url for _, url in urls if url)
     ok = 0
     for name, url in urls:
-        if url and url.strip():
-            try:
-                r = requests.head(url, timeout=10, allow_redirects=True)
-                good = r.status_code in (200, 301, 302)
-                results[f"has_{name}"] = good
-                ok += int(good)
-            except Exception as e:
-                logger.debug(f"Failed to check {name} URL {url}: {e}")
-                results[f"has_{name}"] = False
-        else:
-            results[f"has_{name}"] = False
+        probe = probes.get(url.strip()) if url else None
+        if probe and probe.status_code is None:
+            metric_failures.report(f"dataset and code: no response from {url}")
+        results[f"has_{name}"] = bool(probe and probe.alive)
+        ok += int(results[f"has_{name}"])
     results["links_ok"] = ok >= 2
     return results
 
@@ -1,38 +1,187 @@
+from utils import metric_failures
 from utils.prompt_key import get_prompt_key
 from apis.hf_client import HFClient
 from apis.gemini import prompt_gemini
 from apis.purdue_genai import prompt_purdue_genai
+from math import log10
+from typing import Any, Dict, List, Optional
 import re
 import logging
 
 
 logger = logging.getLogger('cli_logger')
 
+# Re-scored when the dataset card or the dataset repo (metadata, files) changes
+INPUTS = ("dataset_card", "dataset_info")
+# Datasets not hosted on Hugging Face are graded by the LLM
+CONFIG = ("llm_provider",)
+
+_HF_DATASET = re.compile(r"huggingface\.co/datasets/([^/?#]+(?:/[^/?#]+)?)", re.IGNORECASE)
+
+# Card sections graded for documentation; each group counts once if any heading matches
+DOC_SECTIONS = {
+    "description": ("description", "summary", "overview", "about"),
+    "structure": ("structure", "fields", "instances", "schema", "format"),
+    "creation": ("creation", "collection", "curation", "source", "annotation"),
+    "limitations": ("limitation", "bias", "considerations", "risks", "personal and sensitive"),
+    "usage": ("usage", "uses", "how to use", "loading", "example"),
+}
+SPLIT_PATTERNS = {"train": "train", "validation": "valid|validation|dev", "test": "test"}
+ROWS_FOR_FULL_SIZE = 1_000_000
+_SIZE_CATEGORY = re.compile(r"(\d+(?:\.\d+)?)([KMBT]?)<n", re.IGNORECASE)
+_UNITS = {"": 1, "K": 10 ** 3, "M": 10 ** 6, "B": 10 ** 9, "T": 10 ** 12}
+
+
+def _card_data(info: Dict[str, Any]) -> Dict[str, Any]:
+    card = info.get("card_data") or info.get("cardData") or {}
+    if hasattr(card, "to_dict"):
+        card = card.to_dict()
+    return card if isinstance(card, dict) else {}
+
+
+def _as_list(value: Any) -> List[Any]:
+    if value is None:
+        return []
+    return value if isinstance(value, list) else [value]
+
+
+def _split_rows(card: Dict[str, Any]) -> Dict[str, int]:
+    """Rows per split declared in the card's dataset_info (summed over configs)."""
+    rows: Dict[str, int] = {}
+    for config in _as_list(card.get("dataset_info")):
+        if not isinstance(config, dict):
+            continue
+        for split in _as_list(config.get("splits")):
+            if isinstance(split, dict) and split.get("name"):
+                rows[split["name"]] = rows.get(split["name"], 0) + int(split.get("num_examples") or 0)
+    return rows
+
+
+def _split_kind(name: str) -> Optional[str]:
+    """Standard split a split name or file path refers to ("train", "validation", "test")."""
+    for kind, pattern in SPLIT_PATTERNS.items():
+        if re.search(rf"(?:^|[/_.-])(?:{pattern})(?:[/_.-]|$)", name or "", re.IGNORECASE):
+            return kind
+    return None
+
+
+def _declared_splits(card: Dict[str, Any], info: Dict[str, Any], card_text: str) -> set:
+    """Standard splits found in metadata, data_files, repo file names or a card "Splits" section."""
+    names = list(_split_rows(card))
+    for config in _as_list(card.get("configs")):
+        if isinstance(config, dict):
+            names.extend(f.get("split") for f in _as_list(config.get("data_files")) if isinstance(f, dict))
+    for sibling in info.get("siblings") or []:
+        names.append(getattr(sibling, "rfilename", None) or (sibling.get("rfilename") if isinstance(sibling, dict) else None))
+    splits = {_split_kind(name) for name in names if name}
+    if re.search(r"^#+.*splits", card_text, re.IGNORECASE | re.MULTILINE):
+        splits.update(kind for kind, pattern in SPLIT_PATTERNS.items()
+                      if re.search(rf"\b(?:{pattern})\b", card_text, re.IGNORECASE))
+    splits.discard(None)
+    return splits
+
+
+def _row_count(card: Dict[str, Any], tags: List[str]) -> int:
+    rows = sum(_split_rows(card).values())
+    if rows:
+        return rows
+    # Fall back to the lower bound of a size category such as "10K<n<100K"
+    categories = _as_list(card.get("size_categories")) + [t.split(":", 1)[1] for t in tags
+                                                          if t.startswith("size_categories:")]
+    for category in categories:
+        match = _SIZE_CATEGORY.search(str(category))
+        if match:
+            rows = max(rows, int(float(match.group(1)) * _UNITS[match.group(2).upper()]))
+    return rows
+
+
+def score_dataset(info: Dict[str, Any], card_text: Optional[str]) -> float:
+    """
+    Deterministic dataset quality from HF dataset metadata and the dataset card.
+
+    Rubric (same weights as the LLM prompt):
+    - documentation: 0.4, card present and share of DOC_SECTIONS headings found
+    - size and diversity: 0.2, rows on a log scale up to ROWS_FOR_FULL_SIZE,
+      plus declared languages / task categories
+    - splits: 0.2, train plus a validation or test split
+    - license and citation: 0.1 each
+
+    Args:
+        info (dict): HFClient.dataset_info() result
+        card_text (str): HFClient.dataset_card_text() result
+    Returns:
+        score (float): The dataset quality score from 0 to 1
+    """
+    card = _card_data(info)
+    tags = [str(t) for t in info.get("tags") or []]
+    text = card_text or ""
+
+    headings = " ".join(re.findall(r"^#+\s*(.+)$", text, re.MULTILINE)).lower()
+    sections = sum(1 for keys in DOC_SECTIONS.values() if any(k in headings for k in keys))
+    documentation = 0.0
+    if len(text.strip()) >= 200:
+        documentation = 0.1 + 0.3 * sections / len(DOC_SECTIONS)
+
+    rows = _row_count(card, tags)
+    size = 0.15 * min(1.0, log10(rows) / log10(ROWS_FOR_FULL_SIZE)) if rows > 1 else 0.0
+    described = card.get("language") or card.get("task_categories") or any(
+        t.startswith(("language:", "task_categories:")) for t in tags)
+    size += 0.05 if described else 0.0
+
+    splits = _declared_splits(card, info, text)
+    split_score = (0.1 if "train" in splits else 0.0) + (0.1 if splits & {"validation", "test"} else 0.0)
+
+    has_license = bool(card.get("license") or any(t.startswith("license:") for t in tags))
+    has_citation = bool(
+        info.get("citation") or info.get("paperswithcode_id")
+        or any(t.startswith("arxiv:") for t in tags)
+        or re.search(r"^#+.*citation|@(?:inproceedings|article|misc|book)\{", text, re.IGNORECASE | re.MULTILINE)
+    )
+
+    score = documentation + size + split_score + 0.1 * has_license + 0.1 * has_citation
+    logger.debug(f"Dataset quality breakdown for {info.get('id')}: documentation={documentation:.2f} "
+                 f"size={size:.2f} splits={split_score:.2f} license={has_license} citation={has_citation}")
+    return round(min(1.0, score), 4)
+
 
 def compute_dataset_quality(dataset_url: str) -> float:
     '''
     Compute the quality score of 1 dataset by checking the size, descriptions, and other relevant info.
-    Ask Gemini/Purdue GenAI Studio to score the datasets based on the information given. Score from 0 to 1.
+    Hugging Face datasets are graded locally from their metadata and dataset card (score_dataset);
+    other datasets are scored by Gemini/Purdue GenAI Studio. Score from 0 to 1.
 
     Args:
-        dataset_id (str): The dataset identifier on Hugging Face
+        dataset_url (str): The dataset URL
     Returns:
         score (float): The dataset quality score from 0 to 1
     '''
-    # hf_client = HFClient()
-    
-    # try:
-    #     dataset_card = hf_client.dataset_card_text(dataset_id)
-    # except Exception:
-    #     logger.warning(f"Unable to fetch dataset card for {dataset_id}. It may not exist or it is not on Hugging Face.")
-    #     return 0.0
-
-    # # If dataset card is , return 0.0
-    # if not dataset_card:
-    #     return 0.0
+    match = _HF_DATASET.search(dataset_url or "")
+    if not match:
+        return _llm_dataset_quality(dataset_url)
 
+    dataset_id = match.group(1)
+    hf_client = HFClient()
+    info = hf_client.dataset_info(dataset_id)
+    card_text = hf_client.dataset_card_text(dataset_id)
+    if not info and not card_text:
+        logger.warning(f"Unable to fetch dataset info or card for {dataset_id}.")
+        metric_failures.report(f"dataset quality: no info or card for {dataset_id}")
+        return 0.0
+    return score_dataset(info, card_text)
+
+
+def _llm_dataset_quality(dataset_url: str) -> float:
+    '''
+    Ask Gemini/Purdue GenAI Studio to grade a dataset that is not hosted on Hugging Face.
+
+    Args:
+        dataset_url (str): The dataset URL
+    Returns:
+        score (float): The dataset quality score from 0 to 1
+    '''
     api_key = get_prompt_key()
     if not api_key:
+        metric_failures.report(f"dataset quality: no LLM key to grade {dataset_url}")
         return 0.0
 
     dataset_quality_prompt = f"""Analyze the following dataset information by opening the link below and reading the dataset card
@@ -58,6 +207,7 @@ DO NOT deviate from the format."""
                 dq_check = prompt_gemini(dataset_quality_prompt, api_key['gemini'])
         except:
             logger.error("compute dataset quality: Could not get LLM response")
+            metric_failures.report(f"dataset quality: no LLM response for {dataset_url}")
             break
         match = re.match(r"([0-1](?:\.\d+)?):(.*)", dq_check, re.DOTALL)
         if match:
@@ -68,6 +218,7 @@ DO NOT deviate from the format."""
         num_retries += 1
     else:
         logger.error("Could not parse the dataset quality score from the response.")
+        metric_failures.report(f"dataset quality: unparseable LLM response for {dataset_url}")
         # raise ValueError("Could not parse the dataset quality score from the response.")
     return score
 
@@ -1,5 +1,6 @@
 from apis.gemini import *
 from apis.hf_client import HFClient
+from utils import metric_failures
 from utils.prompt_key import get_prompt_key
 from apis.purdue_genai import prompt_purdue_genai
 import re
@@ -8,6 +9,11 @@ import logging
 
 logger = logging.getLogger('cli_logger')
 
+# Re-scored when the model card or its declared license changes
+INPUTS = ("card", "license")
+# Graded by the LLM
+CONFIG = ("llm_provider",)
+
 
 def license_score(model_id: str) -> float:
     """
@@ -61,6 +67,7 @@ def license_score(model_id: str) -> float:
         num_retries += 1
     else:
         logger.error("Could not parse the license score from the response.")
+        metric_failures.report(f"license: unparseable LLM response for {model_id}")
         # raise ValueError("Could not parse the license score from the response.")
     return score
 
@@ -1,6 +1,7 @@
 from apis.hf_client import HFClient
 from apis.gemini import prompt_gemini, get_gemini_key
 from apis.purdue_genai import get_purdue_genai_key, prompt_purdue_genai
+from utils import metric_failures
 from utils.prompt_key import get_prompt_key
 import re
 import logging
@@ -8,6 +9,11 @@ import logging
 
 logger = logging.getLogger('cli_logger')
 
+# Re-scored when the model card changes
+INPUTS = ("card",)
+# Graded by the LLM
+CONFIG = ("llm_provider",)
+
 
 def performance_claims(model_id: str) -> float:
     client = HFClient()
@@ -35,5 +41,6 @@ def performance_claims(model_id: str) -> float:
         return score
     except Exception as e:
         logger.error(f"ERROR: Could not parse performance claims score from LLM response. Exception: {e}")
+        metric_failures.report(f"performance claims: unparseable LLM response for {model_id}")
         return 0
 
@@ -1,11 +1,18 @@
 from __future__ import annotations
 import os
 from apis.hf_client import HFClient
+from utils import metric_failures
 from utils.prompt_key import get_prompt_key
 from apis.gemini import prompt_gemini, get_gemini_key
 from apis.purdue_genai import prompt_purdue_genai, get_purdue_genai_key
 
 
+# Re-scored when the model card or the repo's file list changes
+INPUTS = ("card", "file_tree")
+# Blended with the LLM's grade
+CONFIG = ("llm_provider",)
+
+
 def _clamp01(x: float) -> float:
     return 0.0 if x < 0 else 1.0 if x > 1 else x
 
@@ -71,6 +78,8 @@ def ramp_up_time(model_id: str) -> float:
                 continue
         if llm_score is not None:
             score = _clamp01(0.7 * heur_score + 0.3 * llm_score)
+        else:
+            metric_failures.report(f"ramp up time: unparseable LLM response for {model_id}")
 
     return score
 
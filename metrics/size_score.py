@@ -1,7 +1,9 @@
 from huggingface_hub import HfApi
 from apis.hf_client import HFClient
+from utils import metric_failures, snapshot
+from utils.safetensors_header import analyze_safetensors
 from math import log10
-from typing import Dict
+from typing import Any, Dict, Optional
 import logging
 
 #Changed raspberry pi limit to 1B
@@ -10,6 +12,10 @@ LOWER_SIZE_LIMIT = 0.01
 
 logger = logging.getLogger("api")
 
+# Re-scored when the model repo's file list changes
+INPUTS = ("file_tree",)
+CONFIG = ()
+
 # total_size = 0
 #         try:
 #             files = api.list_repo_files(model_id, repo_type="model")
@@ -29,6 +35,14 @@ logger = logging.getLogger("api")
 #         data["total_size_bytes"] = total_size
 
 def get_size(model_id: str) -> int:
+    try:
+        return snapshot.cached_call("hf_repo_size", model_id, lambda: _get_size(model_id))
+    except snapshot.SnapshotMissError:
+        metric_failures.report(f"size: repo size of {model_id} not in the snapshot")
+        return 0
+
+
+def _get_size(model_id: str) -> int:
     total_size = 0
     api = HfApi()
     try:
@@ -42,19 +56,60 @@ def get_size(model_id: str) -> int:
                     size = fi[0].size
                     if size:
                         total_size += int(size)
-            except Exception:
+            except Exception as e:
+                metric_failures.report(f"size: size of {model_id}/{fp} unavailable: {e}")
                 continue
-    except Exception:
-        pass
+    except Exception as e:
+        metric_failures.report(f"size: files of {model_id} unavailable: {e}")
     
     return total_size
     
 
 
 
+def get_parameter_count(model_id: str, model_info: Dict[str, Any]) -> Optional[int]:
+    """Exact parameter count from the model's safetensors headers, if it has any.
+
+    Args:
+        model_id (str): The id of the model.
+        model_info (dict): HFClient.model_info() result, for the commit sha and file list.
+    Returns:
+        int: Number of parameters, or None if unknown.
+    """
+    siblings = model_info.get("siblings") or []
+    filenames = [getattr(s, "rfilename", None) or (s.get("rfilename") if isinstance(s, dict) else None)
+                 for s in siblings]
+    analysis = analyze_safetensors(model_id, model_info.get("sha"), [f for f in filenames if f])
+    if analysis and analysis["parameters"] > 0:
+        logger.info(f"{model_id}@{analysis['sha']} has {analysis['parameters']} parameters {analysis['dtypes']}")
+        return analysis["parameters"]
+    return None
+
+
+def score_from_parameters(parameters: float) -> Dict[str, float]:
+    """Platform scores for a model with `parameters` billion parameters.
+
+    Scores fall off log-linearly from 1.0 at LOWER_SIZE_LIMIT to 0.01 at each
+    platform's limit in PLATFORM_SIZE_LIMITS.
+    """
+    result = {}
+    for plat, limit in PLATFORM_SIZE_LIMITS.items():
+        if parameters >= limit:
+            result[plat] = 0.01
+        elif parameters <= LOWER_SIZE_LIMIT:
+            result[plat] = 1.0
+        else:
+            score = 1.0 - log10(parameters / LOWER_SIZE_LIMIT) / log10(limit / LOWER_SIZE_LIMIT)
+            result[plat] = round(max(0.01, min(1.0, score)), 2)
+    return result
+
+
 def size_score(model_id: str) -> Dict[str, float]:
     """Calculate a size-based score for a given model.
 
+    Uses the exact parameter count from the safetensors headers when the model
+    has them, and falls back to the summed file size otherwise.
+
     Args:
         model_id (str): The id of the model to evaluate.
     Returns:
@@ -66,6 +121,11 @@ def size_score(model_id: str) -> Dict[str, float]:
     client = HFClient()
     model_info = client.model_info(model_id)
 
+    parameters = get_parameter_count(model_id, model_info)
+    if parameters is not None:
+        return score_from_parameters(parameters / 1e9)
+
+    logger.info(f"No safetensors headers for model {model_id}, using total size calculation.")
     total_size_bytes = get_size(model_id)
 
     if total_size_bytes <= 0:
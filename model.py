@@ -1,7 +1,10 @@
+import importlib
+import logging
 import threading
 import time
 import json
-from typing import Dict, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Union
 from apis.gemini import get_gemini_key
 # from clone_bridge import clone_with_isogit
 from metrics.performance_claims import performance_claims
@@ -12,6 +15,25 @@ from metrics.dataset_quality import compute_dataset_quality
 from metrics.bus_factor import bus_factor
 from metrics.code_quality import code_quality
 from metrics.license import license_score
+from utils import metric_failures
+from utils.telemetry import observe_latencies
+from utils.eval_cache import (cache_enabled, evaluation_key, input_fingerprints, load_evaluation, load_record,
+                              metric_version, stale_metrics, store_evaluation, store_record)
+
+
+# Module of each metric; each declares the inputs it reads in INPUTS and the settings it depends on in CONFIG
+METRIC_MODULES = {
+    "ramp_up_time": "metrics.ramp_up_time",
+    "bus_factor": "metrics.bus_factor",
+    "performance_claims": "metrics.performance_claims",
+    "license": "metrics.license",
+    "size_score": "metrics.size_score",
+    "dataset_and_code_score": "metrics.dataset_and_code_score",
+    "dataset_quality": "metrics.dataset_quality",
+    "code_quality": "metrics.code_quality",
+}
+
+logger = logging.getLogger('cli_logger')
 
 
 class Code:
@@ -100,22 +122,94 @@ class Model:
         }
         self.hfAPIData = {}
         self.gitAPIData = {}
+        # metric -> reasons it fell back to a default score in the last calcMetricsParallel()
+        self.failures: Dict[str, List[str]] = {}
+        # metrics run by the last calcMetricsParallel(); the others were reused from a record
+        self.computed: List[str] = []
 
     # Evaluate model
-    def evaluate(self) -> Dict[str, Union[int, float, str, Dict[str, float]]]:
+    def evaluate(self, use_cache: bool = True) -> Dict[str, Union[int, float, str, Dict[str, float]]]:
+        """
+        Compute every metric and the net score.
+
+        Args:
+            use_cache (bool): reuse the stored evaluation and per-metric results;
+                False recomputes every metric (the new result is still stored)
+        Returns:
+            dict: name, category, metrics and their latencies
+        """
+        # Unchanged model/code/dataset revisions and metric code: reuse the stored result
+        caching = cache_enabled()
+        cache_key = evaluation_key(self) if caching else None
+        if cache_key and use_cache:
+            cached = load_evaluation(cache_key)
+            if cached is not None:
+                self.metrics.update({k: cached[k] for k in self.metrics if k in cached})
+                self.latencies.update({k: cached[k] for k in self.latencies if k in cached})
+                return cached
+
         t = int(time.perf_counter_ns() / 1e6)
-        self.calcMetricsParallel()
+        if caching:
+            self.calcMetricsIncremental(reuse=use_cache)
+        else:
+            self.calcMetricsParallel()
         self.calcNetScore()
         self.latencies["net_score_latency"] = int(time.perf_counter_ns() / 1e6 - t)
+        # Reused metrics keep the latency of the run that computed them; don't observe it again
+        observe_latencies({key: self.latencies[key]
+                           for key in [f"{metric}_latency" for metric in self.computed] + ["net_score_latency"]})
         res =  {
             "name": self.name,
             "category": "MODEL",
         }
         res.update(self.metrics)
         res.update(self.latencies)
+        if cache_key and not self.failures:
+            store_evaluation(cache_key, res)
         return res
 
-    def calcMetricsParallel(self) -> None:
+    def calcMetricsIncremental(self, reuse: bool = True) -> None:
+        """
+        Recompute only the metrics that failed last time or whose declared inputs
+        (or version) changed since the last evaluation of this model with the same
+        links; reuse the others along with their original latencies.
+
+        Args:
+            reuse (bool): False ignores the stored record, recomputing every metric
+        """
+        modules = {metric: importlib.import_module(path) for metric, path in METRIC_MODULES.items()}
+        inputs = {metric: tuple(module.INPUTS) for metric, module in modules.items()}
+        versions = {metric: metric_version(module) for metric, module in modules.items()}
+        names = {name for declared in inputs.values() for name in declared}
+        record = load_record(self) if reuse else None
+
+        with ThreadPoolExecutor(max_workers=1) as pool:
+            # With nothing to compare against, read the inputs while the metrics run
+            pending = pool.submit(input_fingerprints, self, names)
+            stale = list(inputs)
+            if record:
+                stale = stale_metrics(record, versions, inputs, pending.result())
+                for metric in inputs:
+                    if metric not in stale:
+                        self.metrics[metric] = record[metric]["value"]
+                        self.latencies[f"{metric}_latency"] = record[metric]["latency"]
+            self.calcMetricsParallel(stale)
+            fingerprints = pending.result()
+
+        now = time.time()
+        store_record(self, {
+            metric: {
+                "value": self.metrics[metric],
+                "latency": self.latencies[f"{metric}_latency"],
+                "version": versions[metric],
+                "inputs": {name: fingerprints.get(name) for name in inputs[metric]},
+                "ok": metric not in self.failures,
+                "computed_at": now if metric in stale else record[metric]["computed_at"],
+            }
+            for metric in inputs
+        })
+
+    def calcMetricsParallel(self, metrics: Optional[Iterable[str]] = None) -> None:
         threads = []
         funcs = {
             "ramp_up_time": self.calcRampUp,
@@ -127,8 +221,22 @@ class Model:
             "dataset_quality": self.calcDatasetQuality,
             "code_quality": self.calcCodeQuality,
         }
-        for key in funcs:
-            t = threading.Thread(target=funcs[key])
+        selected = funcs if metrics is None else [key for key in funcs if key in set(metrics)]
+        self.failures = {}
+        self.computed = list(selected)
+
+        def run(key: str) -> None:
+            with metric_failures.track() as failures:
+                try:
+                    funcs[key]()
+                except Exception as e:
+                    logger.error(f"Metric {key} failed for {self.id}: {e}")
+                    failures.append(f"{type(e).__name__}: {e}")
+            if failures:
+                self.failures[key] = failures
+
+        for key in selected:
+            t = threading.Thread(target=run, args=(key,))
             threads.append(t)
         for t in threads:
             t.start()
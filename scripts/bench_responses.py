@@ -0,0 +1,88 @@
+"""
+Benchmark response serialization for large artifact listings.
+
+Compares what FastAPI does with a plain list returned by a handler
+(jsonable_encoder + JSONResponse) against FastJSONResponse, and the old
+deepcopy-based rating formatting against ResponseShape.
+
+Usage:
+    python scripts/bench_responses.py [--items 10000] [--repeat 20]
+"""
+
+import argparse
+import copy
+import os
+import sys
+import time
+from decimal import Decimal
+
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from apis.responses import FastJSONResponse, ResponseShape, orjson  # noqa: E402
+
+
+RATING_TEMPLATE = {
+    "name": "string", "category": "string", "net_score": 0, "net_score_latency": 0,
+    "ramp_up_time": 0, "ramp_up_time_latency": 0, "bus_factor": 0, "bus_factor_latency": 0,
+    "license": 0, "license_latency": 0, "tree_score": 0, "tree_score_latency": 0,
+    "size_score": {"raspberry_pi": 0, "jetson_nano": 0, "desktop_pc": 0, "aws_server": 0},
+    "size_score_latency": 0,
+}
+
+
+def timed(fn, repeat):
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--items", type=int, default=10000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    # Shaped like DynamoDB scan results: numbers come back as Decimal
+    listing = [
+        {"name": f"artifact-{i}", "id": Decimal(1731000000000 + i), "type": ("model", "dataset", "code")[i % 3]}
+        for i in range(args.items)
+    ]
+
+    generic = timed(lambda: JSONResponse(content=jsonable_encoder(listing)), args.repeat)
+    fast = timed(lambda: FastJSONResponse(content=listing), args.repeat)
+    print(f"encoder: {'orjson' if orjson else 'json (orjson not installed)'}")
+    print(f"/artifacts listing of {args.items} items (best of {args.repeat}):")
+    print(f"  jsonable_encoder + JSONResponse  {generic * 1000:8.2f} ms")
+    print(f"  FastJSONResponse                 {fast * 1000:8.2f} ms  ({generic / fast:.1f}x)")
+
+    metrics = {key: 0.5 for key in RATING_TEMPLATE if key not in ("name", "category", "size_score")}
+    metrics["size_score"] = {"raspberry_pi": 0.1, "jetson_nano": 0.2, "desktop_pc": 0.9, "aws_server": 1.0}
+    shape = ResponseShape(RATING_TEMPLATE)
+    rounds = 10000
+
+    def deepcopy_format():
+        for _ in range(rounds):
+            rating = copy.deepcopy(RATING_TEMPLATE)
+            for key, value in metrics.items():
+                if key in rating:
+                    rating[key] = value
+
+    def shaped_format():
+        for _ in range(rounds):
+            shape.build(metrics)
+
+    old = timed(deepcopy_format, 3) / rounds
+    new = timed(shaped_format, 3) / rounds
+    print("rating formatting per response:")
+    print(f"  deepcopy + key-by-key            {old * 1e6:8.2f} us")
+    print(f"  ResponseShape.build              {new * 1e6:8.2f} us  ({old / new:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
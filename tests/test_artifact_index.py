@@ -0,0 +1,126 @@
+import asyncio
+import time
+import unittest
+from unittest.mock import patch
+
+import httpx
+
+from apis import artifact_index, fast_api
+
+
+class TestArtifactIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = artifact_index.ArtifactIndex(readme_chars=50)
+        self.addCleanup(self.index.close)
+        self.index.load([
+            {"model_id": 30, "name": "bert-base", "type": "model"},
+            {"model_id": 10, "name": "squad", "type": "dataset", "readme": "Question answering over Wikipedia"},
+            {"model_id": 20, "name": "gpt2", "type": "model"},
+        ])
+
+    def test_matches_name_and_readme_in_id_order(self):
+        pattern = artifact_index.compile_pattern(r"(?i)bert|wikipedia")
+        results, next_after = self.index.search(pattern, limit=10)
+        self.assertEqual([r["id"] for r in results], [10, 30])
+        self.assertIsNone(next_after)
+
+    def test_pagination(self):
+        pattern = artifact_index.compile_pattern(".")
+        first, next_after = self.index.search(pattern, limit=2)
+        self.assertEqual([r["id"] for r in first], [10, 20])
+        self.assertEqual(next_after, 20)
+        second, next_after = self.index.search(pattern, limit=2, start_after=next_after)
+        self.assertEqual([r["id"] for r in second], [30])
+        self.assertIsNone(next_after)
+
+    def test_updates_and_removal(self):
+        self.index.upsert({"model_id": 20, "name": "gpt2-renamed", "type": "model"})
+        self.index.set_readme(30, "x" * 100)
+        self.index.remove(10)
+        results, _ = self.index.search(artifact_index.compile_pattern("renamed|x{50}"), limit=10)
+        self.assertEqual([r["id"] for r in results], [20, 30])
+        # README text is truncated to readme_chars
+        results, _ = self.index.search(artifact_index.compile_pattern("x{51}"), limit=10)
+        self.assertEqual(results, [])
+        self.assertEqual(len(self.index), 2)
+
+    def test_time_budget_returns_resume_point(self):
+        """An exhausted budget stops the scan and reports where to continue"""
+        ticks = iter(range(100))
+        pattern = artifact_index.compile_pattern("no-match")
+        results, next_after = self.index.search(pattern, limit=10, budget=1.5, clock=lambda: next(ticks))
+        self.assertEqual(results, [])
+        self.assertEqual(next_after, 20)
+
+    def test_catastrophic_backtracking_is_cut_off(self):
+        """A pattern that backtracks exponentially returns within the budget and skips the culprit"""
+        self.index.upsert({"model_id": 5, "name": "a" * 30 + "!", "type": "model"})
+        self.index.upsert({"model_id": 40, "name": "aaa", "type": "model"})
+        pattern = artifact_index.compile_pattern(r"(a+)+$")
+        started = time.perf_counter()
+        results, next_after = self.index.search(pattern, limit=10, budget=0.5)
+        self.assertLess(time.perf_counter() - started, 3)
+        self.assertEqual((results, next_after), ([], 5))
+        # The next page resumes after the culprit and still finds later matches ("...Wikipedia", "aaa")
+        results, next_after = self.index.search(pattern, limit=10, start_after=next_after, budget=0.5)
+        self.assertEqual([r["id"] for r in results], [10, 40])
+        self.assertIsNone(next_after)
+
+    def test_matcher_process_is_spawned_once_and_replaced_after_a_timeout(self):
+        self.assertEqual(artifact_index._mp.get_start_method(), "spawn")
+        self.index.search(artifact_index.compile_pattern("bert"), limit=10)
+        process = self.index._matcher[0]
+        self.index.upsert({"model_id": 40, "name": "bert-large", "type": "model"})
+        results, _ = self.index.search(artifact_index.compile_pattern("bert"), limit=10)
+        self.assertIs(self.index._matcher[0], process)
+        self.assertEqual([r["id"] for r in results], [30, 40])  # the change reached the running matcher
+
+        self.index.upsert({"model_id": 5, "name": "a" * 30 + "!", "type": "model"})
+        self.index.search(artifact_index.compile_pattern(r"(a+)+$"), limit=10, budget=0.2)
+        self.assertIsNone(self.index._matcher)
+        self.assertFalse(process.is_alive())
+        results, _ = self.index.search(artifact_index.compile_pattern("bert"), limit=10)
+        self.assertEqual([r["id"] for r in results], [30, 40])  # a new matcher gets the whole index
+
+    def test_only_leading_name_characters_are_searched(self):
+        index = artifact_index.ArtifactIndex(name_chars=8)
+        self.addCleanup(index.close)
+        index.upsert({"model_id": 1, "name": "short-name-with-suffix", "type": "model"})
+        self.assertEqual(index.search(artifact_index.compile_pattern("suffix"), limit=10)[0], [])
+        results, _ = index.search(artifact_index.compile_pattern("^short"), limit=10)
+        self.assertEqual(results[0]["name"], "short-name-with-suffix")
+
+    def test_invalid_pattern(self):
+        with self.assertRaises(ValueError):
+            artifact_index.compile_pattern("(unclosed")
+        with self.assertRaises(ValueError):
+            artifact_index.compile_pattern("")
+
+
+
+class TestRegexEndpoint(unittest.TestCase):
+
+    def test_post_is_routed_to_the_regex_search(self):
+        index = artifact_index.ArtifactIndex()
+        self.addCleanup(index.close)
+        index.load([
+            {"model_id": 30, "name": "bert-base", "type": "model"},
+            {"model_id": 20, "name": "gpt2", "type": "model"},
+        ])
+
+        async def post(regex):
+            transport = httpx.ASGITransport(app=fast_api.app)
+            async with httpx.AsyncClient(transport=transport, base_url="http://test") as client:
+                return await client.post("/artifact/byRegEx", json={"regex": regex})
+
+        with patch.object(fast_api, "artifact_index", index):
+            found = asyncio.run(post("bert"))
+            missing = asyncio.run(post("llama"))
+        self.assertEqual(found.status_code, 200)
+        self.assertEqual([r["id"] for r in found.json()], [30])
+        self.assertEqual(missing.status_code, 404)
+
+
+if __name__ == "__main__":
+    unittest.main()
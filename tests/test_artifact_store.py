@@ -0,0 +1,133 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+
+from botocore.exceptions import ClientError
+
+from apis import artifact_store
+
+
+class StoreContract:
+    """Behaviour every backend must share."""
+
+    def make_store(self):
+        raise NotImplementedError
+
+    def setUp(self):
+        self.store = self.make_store()
+        for i, (name, kind) in enumerate([("bert", "model"), ("squad", "dataset"), ("bert", "code"), ("gpt2", "model")], 1):
+            self.store.put({"model_id": i, "name": name, "type": kind, "url": f"https://example.com/{name}"})
+
+    def test_get_and_batch_get(self):
+        self.assertEqual(self.store.get(2)["name"], "squad")
+        self.assertIsNone(self.store.get(99))
+        found = self.store.batch_get([1, 4, 99])
+        self.assertEqual(sorted(found), [1, 4])
+
+    def test_conditional_put(self):
+        with self.assertRaises(artifact_store.ArtifactExistsError):
+            self.store.put({"model_id": 1, "name": "dup", "type": "model"}, if_absent=True)
+        self.assertEqual(self.store.get(1)["name"], "bert")
+
+    def test_put_many_if_absent_reports_taken_ids(self):
+        taken = self.store.put_many([{"model_id": 2, "name": "dup", "type": "model"},
+                                     {"model_id": 5, "name": "new", "type": "model"}], if_absent=True)
+        self.assertEqual(taken, [2])
+        self.assertEqual(self.store.get(2)["name"], "squad")
+        self.assertEqual(self.store.get(5)["name"], "new")
+
+    def test_update(self):
+        updated = self.store.update(1, {"dataset_id": 2})
+        self.assertEqual(updated["dataset_id"], 2)
+        self.assertEqual(self.store.get(1)["name"], "bert")
+        with self.assertRaises(artifact_store.ArtifactNotFoundError):
+            self.store.update(99, {"readme": "x"}, if_exists=True)
+
+    def test_scan_pages_with_filters(self):
+        filters = [{"type": ["model", "code"]}]
+        first, key = self.store.scan(limit=2, filters=filters, attributes=("name",))
+        self.assertEqual([int(i["model_id"]) for i in first], [1, 3])
+        self.assertNotIn("url", first[0])
+        rest, key = self.store.scan(limit=2, start_key=key, filters=filters)
+        self.assertEqual([int(i["model_id"]) for i in rest], [4])
+        self.assertIsNone(key)
+
+    def test_query_by_name(self):
+        self.assertEqual(sorted(int(i["model_id"]) for i in self.store.query_by_name("bert")), [1, 3])
+        self.assertEqual([int(i["model_id"]) for i in self.store.query_by_name("bert", "code")], [3])
+
+    def test_delete_and_delete_all(self):
+        self.store.delete(1)
+        self.assertIsNone(self.store.get(1))
+        stats = self.store.delete_all()
+        self.assertEqual(stats["deleted"], 3)
+        self.assertEqual(self.store.scan()[0], [])
+
+
+class TestMemoryArtifactStore(StoreContract, unittest.TestCase):
+
+    def make_store(self):
+        return artifact_store.MemoryArtifactStore()
+
+    def test_items_are_copies(self):
+        item = self.store.get(1)
+        item["name"] = "changed"
+        self.assertEqual(self.store.get(1)["name"], "bert")
+
+
+class TestSqliteArtifactStore(StoreContract, unittest.TestCase):
+
+    def make_store(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        return artifact_store.SqliteArtifactStore(os.path.join(self.tmp.name, "artifacts.db"))
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def test_query_by_name_uses_index(self):
+        with self.store._lock:
+            plan = self.store._conn.execute(
+                "EXPLAIN QUERY PLAN SELECT data FROM artifacts WHERE name = ?", ("bert",)
+            ).fetchall()
+        self.assertIn("idx_artifacts_name", " ".join(str(row) for row in plan))
+
+
+class TestDynamoArtifactStore(unittest.TestCase):
+
+    def test_conditional_put_conflict(self):
+        table = MagicMock()
+        table.put_item.side_effect = ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem")
+        with self.assertRaises(artifact_store.ArtifactExistsError):
+            artifact_store.DynamoArtifactStore(table).put({"model_id": 1}, if_absent=True)
+
+    def test_filters_become_filter_expression(self):
+        table = MagicMock()
+        table.scan.return_value = {"Items": []}
+        store = artifact_store.DynamoArtifactStore(table)
+        store.scan(filters=[{"name": "bert", "type": ["model"]}, {"model_id": 5}], attributes=("name",))
+        kwargs = table.scan.call_args.kwargs
+        self.assertIn("FilterExpression", kwargs)
+        self.assertEqual(kwargs["ProjectionExpression"], "model_id, #p0")
+        self.assertIsNone(artifact_store.DynamoArtifactStore._condition([{}]))
+
+    def test_batch_get_chunks_and_retries(self):
+        table = MagicMock()
+        table.name = "models"
+        resource = MagicMock()
+        resource.batch_get_item.side_effect = lambda RequestItems: {
+            "Responses": {"models": [k for k in RequestItems["models"]["Keys"]]},
+            "UnprocessedKeys": {},
+        }
+        found = artifact_store.DynamoArtifactStore(table, resource).batch_get(range(150))
+        self.assertEqual(len(found), 150)
+        self.assertEqual(resource.batch_get_item.call_count, 2)
+
+    def test_unknown_backend(self):
+        with self.assertRaises(ValueError):
+            artifact_store.create_store("cassandra")
+
+
+if __name__ == "__main__":
+    unittest.main()
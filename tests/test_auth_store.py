@@ -0,0 +1,114 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from apis.auth_store import AuthStore
+
+
+class TestAuthStore(unittest.TestCase):
+
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.store = AuthStore(os.path.join(self.tmp.name, "auth.db"), pool_size=2, cache_size=2,
+                               flush_interval=0.01)
+        self.store.create_tables()
+        self.user_id = self.store.add_user("alice", "hashed", "token-a")
+
+    def tearDown(self):
+        self.store.close()
+        self.tmp.cleanup()
+
+    def _stored_interactions(self):
+        with self.store.connection() as conn:
+            return conn.execute("SELECT num_interactions FROM users WHERE id = ?", (self.user_id,)).fetchone()[0]
+
+    def test_schema_uses_wal_and_indexes(self):
+        with self.store.connection() as conn:
+            self.assertEqual(conn.execute("PRAGMA journal_mode").fetchone()[0], "wal")
+            indexes = {row[1] for row in conn.execute("PRAGMA index_list(users)")}
+        self.assertIn("idx_users_username", indexes)
+        self.assertIn("idx_users_secret_key", indexes)
+
+    def test_lookup_token(self):
+        user = self.store.lookup_token("token-a")
+        self.assertEqual(user["id"], self.user_id)
+        self.assertEqual(user["num_interactions"], 0)
+        self.assertIsInstance(user["api_time"], int)
+        self.assertIsNone(self.store.lookup_token("missing"))
+
+    def test_interactions_are_batched(self):
+        """Counts are visible immediately but only written on flush"""
+        self.store.lookup_token("token-a")
+        for _ in range(3):
+            self.store.record_interaction(self.user_id)
+        self.assertEqual(self.store.lookup_token("token-a")["num_interactions"], 3)
+        self.assertEqual(self._stored_interactions(), 0)
+
+        self.assertEqual(self.store.flush(), 1)
+        self.assertEqual(self._stored_interactions(), 3)
+
+    def test_close_flushes_pending_counts(self):
+        self.store.record_interaction(self.user_id)
+        self.store.close()
+        reopened = AuthStore(self.store.path)
+        try:
+            self.assertEqual(reopened.lookup_token("token-a")["num_interactions"], 1)
+        finally:
+            reopened.close()
+
+    def test_rotated_token_is_evicted(self):
+        """A cached token stops validating once the user gets a new one"""
+        self.assertIsNotNone(self.store.lookup_token("token-a"))
+        self.store.set_secret_key(self.user_id, "token-b")
+        self.assertIsNone(self.store.lookup_token("token-a"))
+        self.assertEqual(self.store.lookup_token("token-b")["id"], self.user_id)
+
+    def test_token_rotated_by_another_process_expires_from_the_cache(self):
+        """A cached token is re-checked against the database once its TTL has passed"""
+        other = AuthStore(self.store.path)
+        self.addCleanup(other.close)
+        with patch("apis.auth_store.time.monotonic", return_value=1000.0):
+            self.assertIsNotNone(self.store.lookup_token("token-a"))
+        other.set_secret_key(self.user_id, "token-b")
+        other.record_interaction(self.user_id)
+        other.flush()
+
+        with patch("apis.auth_store.time.monotonic", return_value=1000.0 + self.store._cache_ttl - 1):
+            self.assertIsNotNone(self.store.lookup_token("token-a"))
+        with patch("apis.auth_store.time.monotonic", return_value=1000.0 + self.store._cache_ttl):
+            self.assertIsNone(self.store.lookup_token("token-a"))
+            self.assertEqual(self.store.lookup_token("token-b")["num_interactions"], 1)
+
+    def test_flusher_thread(self):
+        self.store.start_flusher()
+        self.store.record_interaction(self.user_id)
+        self.store.stop_flusher()
+        self.store.flush()
+        self.assertEqual(self._stored_interactions(), 1)
+
+    def test_pool_is_bounded_under_concurrency(self):
+        errors = []
+
+        def verify():
+            try:
+                for _ in range(50):
+                    user = self.store.lookup_token("token-a")
+                    self.store.record_interaction(user["id"])
+            except Exception as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=verify) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.store.flush()
+        self.assertEqual(errors, [])
+        self.assertLessEqual(self.store._opened, 2)
+        self.assertEqual(self._stored_interactions(), 400)
+
+
+if __name__ == "__main__":
+    unittest.main()
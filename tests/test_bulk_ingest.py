@@ -0,0 +1,144 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from boto3.dynamodb.types import TypeDeserializer
+from botocore.exceptions import ClientError
+
+from apis import fast_api
+from apis.artifact_store import DynamoArtifactStore
+from apis.id_allocator import SnowflakeIdGenerator
+
+
+class TestBulkIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.table = MagicMock()
+        self.table.scan.return_value = {"Items": [
+            {"model_id": 1, "type": "model", "url": "https://huggingface.co/google-bert/bert-base-uncased"},
+        ]}
+        self.written = []
+        self.existing = set()
+        self.table.meta.client.transact_write_items.side_effect = self._transact
+
+    def _transact(self, TransactItems):
+        """Conditional puts: cancel the whole transaction if any model_id exists"""
+        deserializer = TypeDeserializer()
+        items = [{k: deserializer.deserialize(v) for k, v in t["Put"]["Item"].items()} for t in TransactItems]
+        reasons = [{"Code": "ConditionalCheckFailed" if item["model_id"] in self.existing else "None"}
+                   for item in items]
+        if any(r["Code"] != "None" for r in reasons):
+            raise ClientError({"Error": {"Code": "TransactionCanceledException"}, "CancellationReasons": reasons},
+                              "TransactWriteItems")
+        self.written.extend(items)
+        self.existing.update(item["model_id"] for item in items)
+
+    def _ingest(self, artifacts, rate, allocator=None):
+        body = [fast_api.BulkIngestItem(**a) for a in artifacts]
+        with patch.object(fast_api, "artifact_store", DynamoArtifactStore(self.table)), \
+                patch.object(fast_api, "id_allocator", allocator or SnowflakeIdGenerator(worker_id=1)), \
+                patch.object(fast_api, "rating_jobs") as jobs, \
+                patch.object(fast_api, "readme_pool"), \
+                patch.object(fast_api, "artifact_index"), \
+                patch.object(fast_api, "_genai_single_float", side_effect=rate):
+            response = asyncio.run(fast_api.bulk_ingest(body))
+        return json.loads(response.body), jobs
+
+    def test_batch_write_and_single_matching_pass(self):
+        """Items are written with conditional puts; matching scans the table once per link kind"""
+        rate = lambda dataset_bool, code_bool, url, model_url: 1.0 if "squad" in model_url and "squad" in url else 0.0
+        body, jobs = self._ingest([
+            {"type": "model", "url": "https://huggingface.co/org/squad-model"},
+            {"type": "dataset", "url": "https://huggingface.co/datasets/rajpurkar/squad"},
+            {"type": "dataset", "url": "https://huggingface.co/datasets/other/unrelated"},
+        ], rate)
+
+        self.assertEqual(len(self.written), 3)
+        self.assertEqual(self.table.scan.call_count, 1)
+        ids = [a["metadata"]["id"] for a in body["artifacts"]]
+        self.assertEqual(len(set(ids)), 3)
+        # The dataset matched the model ingested in the same batch
+        self.assertEqual(body["links"], [{"model_id": ids[0], "dataset_id": ids[1]}])
+        self.assertEqual(self.table.update_item.call_args.kwargs["Key"], {"model_id": ids[0]})
+        jobs.submit.assert_called_once_with(ids[0])
+
+    def test_writes_and_matching_run_off_the_event_loop(self):
+        """The blocking batch write and LLM match happen in a worker thread, not on the loop thread"""
+        loop_thread = threading.get_ident()
+        threads = []
+        self.table.meta.client.transact_write_items.side_effect = \
+            lambda TransactItems: threads.append(threading.get_ident()) or self._transact(TransactItems)
+        rate = lambda *args, **kwargs: threads.append(threading.get_ident()) or 0.0
+        self._ingest([
+            {"type": "model", "url": "https://huggingface.co/org/squad-model"},
+            {"type": "dataset", "url": "https://huggingface.co/datasets/rajpurkar/squad"},
+        ], rate)
+
+        self.assertGreaterEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_rejects_invalid_type(self):
+        with self.assertRaises(fast_api.HTTPException) as ctx:
+            self._ingest([{"type": "space", "url": "https://example.com/x"}], lambda **_: 0.0)
+        self.assertEqual(ctx.exception.status_code, 400)
+        self.assertEqual(self.written, [])
+
+    def test_colliding_id_is_reallocated_not_overwritten(self):
+        """An allocated ID that already exists gets a fresh ID instead of replacing the stored artifact"""
+        clashing = 1001
+        self.existing.add(clashing)
+        allocated = iter([clashing - 1, clashing, clashing + 1])
+        generator = MagicMock()
+        generator.next_ids.side_effect = lambda count: [next(allocated) for _ in range(count)]
+        body, _ = self._ingest([
+            {"type": "dataset", "url": "https://huggingface.co/datasets/org/a"},
+            {"type": "dataset", "url": "https://huggingface.co/datasets/org/b"},
+        ], lambda **_: 0.0, allocator=generator)
+        ids = [a["metadata"]["id"] for a in body["artifacts"]]
+        self.assertEqual(ids, [clashing - 1, clashing + 1])
+        self.assertEqual(sorted(item["model_id"] for item in self.written), ids)
+
+
+class TestSingleIngest(unittest.TestCase):
+
+    def test_store_and_match_run_off_the_event_loop(self):
+        """POST /artifact/{type} writes the item and runs the LLM match in a worker thread"""
+        loop_thread = threading.get_ident()
+        threads = []
+        store = MagicMock()
+        store.put.side_effect = lambda item, if_absent=False: threads.append(threading.get_ident())
+        match = lambda **kwargs: threads.append(threading.get_ident())
+        with patch.object(fast_api, "artifact_store", store), \
+                patch.object(fast_api, "id_allocator", SnowflakeIdGenerator(worker_id=1)), \
+                patch.object(fast_api, "rating_jobs"), \
+                patch.object(fast_api, "readme_pool"), \
+                patch.object(fast_api, "artifact_index"), \
+                patch.object(fast_api, "match_dataset_code_to_model", side_effect=match):
+            response = asyncio.run(fast_api.ingest_model(
+                "dataset", fast_api.ModelIngestRequest(url="https://huggingface.co/datasets/org/a")))
+
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(len(threads), 2)
+        self.assertNotIn(loop_thread, threads)
+
+    def test_reset_runs_off_the_event_loop(self):
+        """DELETE /reset runs the table wipe in a worker thread"""
+        loop_thread = threading.get_ident()
+        threads = []
+        store = MagicMock()
+        store.delete_all.side_effect = lambda: threads.append(threading.get_ident()) or {"deleted": 0}
+        with patch.object(fast_api, "artifact_store", store), \
+                patch.object(fast_api, "rating_jobs"), \
+                patch.object(fast_api, "artifact_index"), \
+                patch.object(fast_api, "lineage_index"):
+            body = asyncio.run(fast_api.delete_artifacts())
+
+        self.assertEqual(body["deleted"], 0)
+        self.assertEqual(len(threads), 1)
+        self.assertNotIn(loop_thread, threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apis import bulk_reset
+
+
+class FakeClient:
+    """Low-level DynamoDB client double: 3 segments' worth of keys, flaky batch writes."""
+
+    def __init__(self, items_per_segment=60, page_size=40, lease_keys=()):
+        self.items_per_segment = items_per_segment
+        self.lease_keys = lease_keys
+        self.page_size = page_size
+        self.deleted = set()
+        self.lock = threading.Lock()
+        self.first_write = True
+        self.filter = None
+
+    def scan(self, TableName, Segment, TotalSegments, ProjectionExpression, ExpressionAttributeNames,
+             ExclusiveStartKey=None, FilterExpression=None, ExpressionAttributeValues=None):
+        ids = [Segment * 1000 + i for i in range(self.items_per_segment)]
+        ids += [key for key in self.lease_keys if Segment == 0]
+        if FilterExpression:
+            self.filter = (FilterExpression, ExpressionAttributeNames["#k0"])
+            ids = [i for i in ids if i > int(ExpressionAttributeValues[":floor"]["N"])]
+        keys = [{"model_id": {"N": str(i)}} for i in ids]
+        start = int(ExclusiveStartKey["pos"]) if ExclusiveStartKey else 0
+        page = {"Items": keys[start:start + self.page_size]}
+        if start + self.page_size < len(keys):
+            page["LastEvaluatedKey"] = {"pos": start + self.page_size}
+        return page
+
+    def batch_write_item(self, RequestItems):
+        (table_name, requests), = RequestItems.items()
+        with self.lock:
+            # First call leaves half its items unprocessed to exercise the retry path
+            if self.first_write:
+                self.first_write = False
+                done, left = requests[:len(requests) // 2], requests[len(requests) // 2:]
+            else:
+                done, left = requests, []
+            for req in done:
+                self.deleted.add(req["DeleteRequest"]["Key"]["model_id"]["N"])
+        return {"UnprocessedItems": {table_name: left} if left else {}}
+
+
+class TestBulkReset(unittest.TestCase):
+
+    @patch("apis.bulk_reset.time.sleep", return_value=None)
+    def test_deletes_every_segment(self, mock_sleep):
+        """All keys from all segments are deleted and counted, including retried ones"""
+        client = FakeClient()
+        table = MagicMock()
+        table.meta.client = client
+        table.name = "models"
+
+        stats = bulk_reset.bulk_reset(table, segments=3, writers=4)
+
+        self.assertEqual(stats["scanned"], 180)
+        self.assertEqual(stats["deleted"], 180)
+        self.assertEqual(len(client.deleted), 180)
+        self.assertIn("items_per_second", stats)
+        mock_sleep.assert_called()
+
+    @patch("apis.bulk_reset.time.sleep", return_value=None)
+    def test_store_reset_keeps_worker_leases(self, mock_sleep):
+        """DynamoArtifactStore.delete_all leaves the lease rows under negative keys alone"""
+        from apis.artifact_store import DynamoArtifactStore
+        client = FakeClient(items_per_segment=10, lease_keys=(-1, -2))
+        table = MagicMock()
+        table.meta.client = client
+        table.name = "models"
+        stats = DynamoArtifactStore(table).delete_all()
+
+        self.assertEqual(client.filter, ("#k0 > :floor", "model_id"))
+        self.assertFalse({"-1", "-2"} & client.deleted)
+        self.assertEqual(stats["deleted"], len(client.deleted))
+
+    @patch("apis.bulk_reset.time.sleep", return_value=None)
+    def test_gives_up_on_persistent_unprocessed_items(self, mock_sleep):
+        """Items DynamoDB never processes surface as an error"""
+        client = MagicMock()
+        client.batch_write_item.return_value = {
+            "UnprocessedItems": {"models": [{"DeleteRequest": {"Key": {"model_id": {"N": "1"}}}}]}
+        }
+        with self.assertRaises(RuntimeError):
+            bulk_reset._delete_batch(client, "models", [{"model_id": {"N": "1"}}])
+        self.assertEqual(client.batch_write_item.call_count, bulk_reset.MAX_UNPROCESSED_RETRIES + 1)
@@ -0,0 +1,81 @@
+import unittest
+from unittest.mock import patch
+
+from huggingface_hub import DatasetCardData
+
+from metrics import dataset_quality
+from metrics.dataset_quality import compute_dataset_quality, score_dataset
+
+
+CARD = """# Dataset Card for SQuAD
+
+## Dataset Summary
+Stanford Question Answering Dataset (SQuAD) is a reading comprehension dataset, consisting of
+questions posed by crowdworkers on a set of Wikipedia articles, where the answer to every
+question is a segment of text from the corresponding reading passage.
+
+## Dataset Structure
+### Data Fields
+### Data Splits
+
+## Dataset Creation
+### Source Data
+
+## Considerations for Using the Data
+
+## Citation Information
+@article{rajpurkar2016squad,
+"""
+
+INFO = {
+    "id": "rajpurkar/squad",
+    "tags": ["license:cc-by-sa-4.0", "language:en", "size_categories:10K<n<100K"],
+    "card_data": {"dataset_info": {"splits": [{"name": "train", "num_examples": 87599},
+                                              {"name": "validation", "num_examples": 10570}]}},
+    "siblings": [{"rfilename": "plain_text/train-00000-of-00001.parquet"}],
+}
+
+
+class TestDatasetQuality(unittest.TestCase):
+
+    def test_well_documented_dataset_scores_high(self):
+        score = score_dataset(INFO, CARD)
+        self.assertGreater(score, 0.85)
+        self.assertEqual(score, score_dataset(INFO, CARD))
+
+    def test_each_rubric_item_adds_to_the_score(self):
+        self.assertEqual(score_dataset({}, None), 0.0)
+        bare = score_dataset({"tags": ["size_categories:1M<n<10M"]}, "")
+        self.assertAlmostEqual(bare, 0.15)
+        with_splits = score_dataset({"tags": ["size_categories:1M<n<10M"],
+                                     "siblings": [{"rfilename": "data/train.jsonl"}, {"rfilename": "data/dev.jsonl"}]}, "")
+        self.assertAlmostEqual(with_splits, bare + 0.2)
+        self.assertAlmostEqual(score_dataset({"tags": ["license:mit", "arxiv:1606.05250"]}, ""), 0.2)
+
+    def test_card_data_object_and_dict_score_the_same(self):
+        card = DatasetCardData(license="mit", size_categories=["100K<n<1M"],
+                               configs=[{"config_name": "default",
+                                         "data_files": [{"split": "train", "path": "train.csv"},
+                                                        {"split": "test", "path": "test.csv"}]}])
+        as_object = score_dataset({"card_data": card}, CARD)
+        self.assertEqual(as_object, score_dataset({"card_data": card.to_dict()}, CARD))
+        self.assertGreater(as_object, 0.8)
+
+    @patch("metrics.dataset_quality.prompt_purdue_genai")
+    @patch("metrics.dataset_quality.get_prompt_key", return_value={"purdue_genai": "fake-key"})
+    def test_llm_only_for_datasets_outside_hugging_face(self, mock_key, mock_prompt):
+        mock_prompt.return_value = "0.6: documentation 0.3/0.4"
+        with patch.object(dataset_quality, "HFClient") as client:
+            client.return_value.dataset_info.return_value = INFO
+            client.return_value.dataset_card_text.return_value = CARD
+            hf_score = compute_dataset_quality("https://huggingface.co/datasets/rajpurkar/squad")
+            client.return_value.dataset_info.assert_called_once_with("rajpurkar/squad")
+            mock_prompt.assert_not_called()
+            self.assertEqual(hf_score, score_dataset(INFO, CARD))
+
+            self.assertEqual(compute_dataset_quality("https://www.kaggle.com/datasets/org/data"), 0.6)
+            mock_prompt.assert_called_once()
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,235 @@
+import importlib
+import tempfile
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apis import git_api
+import model as model_module
+from model import Code, Dataset, Model
+from utils import eval_cache
+from utils.disk_cache import DiskCache
+
+
+class TestEvalCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.shas = {"model": "m1", "code": "c" * 40, "dataset": "d1"}
+        self.inputs = {name: f"{name}-v1" for name in eval_cache.INPUT_READERS}
+        for module, target, value in (
+            (eval_cache, "_cache", DiskCache("evaluations", root=tmp.name)),
+            (eval_cache, "_records", DiskCache("evaluation_records", root=tmp.name)),
+            (eval_cache, "_model_sha", lambda model_id: self.shas["model"]),
+            (eval_cache, "_code_sha", lambda url: self.shas["code"]),
+            (eval_cache, "_dataset_sha", lambda url: self.shas["dataset"]),
+            (model_module, "input_fingerprints", lambda model, names: {n: self.inputs[n] for n in names}),
+        ):
+            patcher = patch.object(module, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.runs = 0
+        self.computed = []
+        self.failing = {}
+
+    def _model(self):
+        model = Model(url="https://huggingface.co/google-bert/bert-base-uncased", id="google-bert/bert-base-uncased")
+        model.name = "bert-base-uncased"
+        model.linkCode(Code("https://github.com/google-research/bert"))
+        model.linkDataset(Dataset("https://huggingface.co/datasets/bookcorpus/bookcorpus"))
+
+        def compute(metrics=None):
+            self.runs += 1
+            self.computed = sorted(metrics if metrics is not None else model_module.METRIC_MODULES)
+            model.computed = list(self.computed)
+            for metric in self.computed:
+                if metric == "size_score":
+                    model.metrics[metric] = {platform: 0.5 for platform in model.metrics[metric]}
+                else:
+                    model.metrics[metric] = 1.0 if metric == "license" else 0.5
+                model.latencies[f"{metric}_latency"] = 1234
+            model.failures = {metric: [reason] for metric, reason in self.failing.items() if metric in self.computed}
+
+        model.calcMetricsParallel = compute
+        return model
+
+    def test_unchanged_revisions_are_served_from_cache(self):
+        first = self._model().evaluate()
+        model = self._model()
+        second = model.evaluate()
+        self.assertEqual(self.runs, 1)
+        self.assertEqual(second, first)
+        self.assertEqual(model.metrics["license"], 1.0)
+        self.assertEqual(model.latencies["license_latency"], 1234)
+
+    def test_changed_sha_or_metric_code_recomputes(self):
+        self._model().evaluate()
+        self.shas["code"] = "e" * 40
+        self._model().evaluate()
+        self.assertEqual(self.runs, 2)
+        with patch.object(eval_cache, "metrics_version", return_value="other"):
+            self._model().evaluate()
+        self.assertEqual(self.runs, 3)
+
+    def test_unresolved_sha_bypasses_full_cache(self):
+        self.shas["dataset"] = None
+        self._model().evaluate()
+        self._model().evaluate()
+        self.assertEqual(self.runs, 2)
+        # ...but the per-metric record still reuses every metric whose inputs are unchanged
+        self.assertEqual(self.computed, [])
+
+    def test_only_metrics_with_changed_inputs_are_recomputed(self):
+        self._model().evaluate()
+        self.assertEqual(len(self.computed), 8)
+        self.shas["model"] = "m2"  # README edit: new model sha, new card text
+        self.inputs["card"] = "card-v2"
+        model = self._model()
+        result = model.evaluate()
+        self.assertEqual(self.computed, ["license", "performance_claims", "ramp_up_time"])
+        self.assertEqual(result["bus_factor_latency"], 1234)
+        self.assertEqual(result["license"], 1.0)
+
+    def test_refresh_recomputes_every_metric_and_updates_the_cache(self):
+        self._model().evaluate()
+        self._model().evaluate(use_cache=False)
+        self.assertEqual(self.runs, 2)
+        self.assertEqual(len(self.computed), 8)
+        # The refreshed result replaces the stored one
+        self._model().evaluate()
+        self.assertEqual(self.runs, 2)
+
+    def test_only_recomputed_latencies_are_observed(self):
+        self._model().evaluate()
+        self.shas["model"] = "m2"
+        self.inputs["card"] = "card-v2"
+        with patch.object(model_module, "observe_latencies") as observe:
+            self._model().evaluate()
+        self.assertEqual(sorted(observe.call_args.args[0]), [
+            "license_latency", "net_score_latency", "performance_claims_latency", "ramp_up_time_latency"])
+
+    def test_unreadable_input_and_changed_metric_source_recompute(self):
+        self._model().evaluate()
+        self.shas["model"] = "m2"
+        self.inputs["dataset_card"] = None
+        self._model().evaluate()
+        self.assertEqual(self.computed, ["dataset_quality"])
+        self.shas["model"] = "m3"
+        self.inputs["dataset_card"] = "dataset_card-v1"
+        with patch.object(model_module, "metric_version",
+                          side_effect=lambda module: "new" if module.__name__ == "metrics.size_score" else "old"):
+            self._model().evaluate()
+            self.assertEqual(len(self.computed), 8)  # every version differs from the stored hashes
+            self.shas["model"] = "m4"
+            self._model().evaluate()
+            self.assertEqual(self.computed, [])
+
+    def test_evaluation_with_a_failed_metric_is_not_stored(self):
+        self.failing = {"license": "unparseable LLM response"}
+        self._model().evaluate()
+        self.failing = {}
+        self._model().evaluate()
+        self.assertEqual(self.runs, 2)
+        self._model().evaluate()
+        self.assertEqual(self.runs, 2)
+
+    def test_failed_metric_is_always_recomputed(self):
+        self.failing = {"license": "unparseable LLM response"}
+        self._model().evaluate()
+        self.shas["model"] = "m2"  # full-result miss; every input unchanged
+        self.failing = {}
+        self._model().evaluate()
+        self.assertEqual(self.computed, ["license"])
+        self.shas["model"] = "m3"
+        self._model().evaluate()
+        self.assertEqual(self.computed, [])
+
+    def test_metric_version_includes_declared_settings(self):
+        from metrics import bus_factor, performance_claims, size_score
+        self.addCleanup(eval_cache.settings.cache_clear)
+
+        def versions(**values):
+            eval_cache.settings.cache_clear()
+            with patch.dict(eval_cache.SETTINGS, {name: (lambda v=v: v) for name, v in values.items()}):
+                return {module.__name__: eval_cache.metric_version(module)
+                        for module in (bus_factor, performance_claims, size_score)}
+
+        base = versions(llm_provider="gemini", git_history_days=365)
+        other_provider = versions(llm_provider="purdue_genai", git_history_days=365)
+        self.assertNotEqual(base["metrics.performance_claims"], other_provider["metrics.performance_claims"])
+        self.assertEqual(base["metrics.size_score"], other_provider["metrics.size_score"])
+        with patch.object(bus_factor, "CONFIG", bus_factor.CONFIG + ("git_history_days",)):
+            self.assertNotEqual(versions(llm_provider="gemini", git_history_days=365)["metrics.bus_factor"],
+                                versions(llm_provider="gemini", git_history_days=30)["metrics.bus_factor"])
+
+    def test_expired_entries_are_recomputed(self):
+        self._model().evaluate()
+        with patch("utils.eval_cache.time.time", return_value=eval_cache.time.time() + eval_cache.EVAL_CACHE_TTL):
+            self._model().evaluate()
+        self.assertEqual(self.runs, 2)
+        self.assertEqual(len(self.computed), 8)
+
+    def test_metric_failures_are_collected_per_metric(self):
+        model = self._model()
+        del model.calcMetricsParallel
+
+        def fallback():
+            model_module.metric_failures.report("no LLM response")
+            model.metrics["license"] = 0
+
+        def crash():
+            raise RuntimeError("hub down")
+
+        with patch.object(model, "calcLicense", fallback), patch.object(model, "calcSize", crash), \
+                patch.object(model, "calcRampUp", lambda: None):
+            model.calcMetricsParallel(["license", "size_score", "ramp_up_time"])
+        self.assertEqual(model.failures, {"license": ["no LLM response"], "size_score": ["RuntimeError: hub down"]})
+        model_module.metric_failures.report("outside any metric")  # ignored
+
+    def test_settings_and_helpers_are_part_of_metrics_version(self):
+        self.assertIn("apis/hf_client.py", eval_cache.METRIC_SOURCES)
+        self.addCleanup(eval_cache.metrics_version.cache_clear)
+        self.addCleanup(eval_cache.settings.cache_clear)
+        versions = []
+        for provider in ("gemini", "purdue_genai"):
+            eval_cache.metrics_version.cache_clear()
+            eval_cache.settings.cache_clear()
+            with patch.dict(eval_cache.SETTINGS, {"llm_provider": lambda: provider}):
+                versions.append(eval_cache.metrics_version())
+        self.assertNotEqual(versions[0], versions[1])
+
+    def test_declared_inputs_are_known(self):
+        for path in model_module.METRIC_MODULES.values():
+            module = importlib.import_module(path)
+            self.assertTrue(set(module.INPUTS) <= set(eval_cache.INPUT_READERS), path)
+            self.assertTrue(set(module.CONFIG) <= set(eval_cache.SETTINGS), path)
+
+    def test_input_fingerprints_hash_content_and_flag_failures(self):
+        model = self._model()
+        with patch.object(eval_cache, "HFClient") as client:
+            client.return_value.model_card_text.side_effect = RuntimeError("hub down")
+            first = eval_cache.input_fingerprints(model, ["links", "card"])
+            model.linkDataset(Dataset("https://huggingface.co/datasets/other/data"))
+            second = eval_cache.input_fingerprints(model, ["links"])
+        self.assertIsNone(first["card"])
+        self.assertEqual(len(first["links"]), 16)
+        self.assertNotEqual(first["links"], second["links"])
+
+    def test_metrics_version_is_stable(self):
+        self.assertEqual(eval_cache.metrics_version(), eval_cache.metrics_version())
+        self.assertEqual(len(eval_cache.metrics_version()), 16)
+
+
+class TestHeadSha(unittest.TestCase):
+
+    @patch("apis.git_api.requests.get")
+    def test_get_head_sha(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, text="a" * 40 + "\n")
+        self.assertEqual(git_api.get_head_sha("google-research/bert"), "a" * 40)
+        self.assertEqual(mock_get.call_args.kwargs["headers"]["Accept"], "application/vnd.github.sha")
+        mock_get.return_value = MagicMock(status_code=404, text="Not Found")
+        self.assertIsNone(git_api.get_head_sha("google-research/missing"))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,8 +1,10 @@
 import unittest
 from unittest.mock import patch, MagicMock
 import os
+import tempfile
 import tenacity
 from apis import git_api  # <-- updated import
+from utils.disk_cache import DiskCache
 
 class TestGitAPI(unittest.TestCase):
 
@@ -67,10 +69,62 @@ class TestGitAPI(unittest.TestCase):
     def test_get_contributors(self, mock_request, mock_headers):
         """Return JSON from make_request"""
         mock_request.return_value.json.return_value = [{"login": "alice", "contributions": 10}]
-        contributors = git_api.get_contributors("owner/repo")
+        mock_request.return_value.headers = {"ETag": '"v1"'}
+        mock_request.return_value.status_code = 200
+        with tempfile.TemporaryDirectory() as root, \
+                patch.object(git_api, "_contributors_cache", DiskCache("github_contributors", root=root)):
+            contributors = git_api.get_contributors("owner/repo")
         self.assertEqual(contributors[0]["login"], "alice")
         self.assertEqual(contributors[0]["contributions"], 10)
         mock_request.assert_called_once()
 
+
+class TestContributorPagination(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        for target, value in (("_contributors_cache", DiskCache("github_contributors", root=tmp.name)),
+                              ("set_git_headers", lambda: {})):
+            patcher = patch.object(git_api, target, value)
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.pages = {n: [{"login": f"user{n}-{i}", "contributions": 1000 - n * 100 - i} for i in range(100)]
+                      for n in (1, 2, 3)}
+        self.pages[3] = self.pages[3][:5]
+        self.requests = []
+
+    def _page(self, url, headers):
+        self.assertIn("per_page=100", url)
+        page = int(url.rsplit("page=", 1)[1])
+        self.requests.append((page, headers.get("If-None-Match")))
+        if headers.get("If-None-Match") == f'"p{page}-{len(self.pages[page])}"':
+            return MagicMock(status_code=304, headers={})
+        last = max(self.pages)
+        link = f'<https://api.github.com/repositories/1/contributors?per_page=100&page={last}>; rel="last"'
+        return MagicMock(status_code=200, json=lambda: self.pages[page],
+                         headers={"ETag": f'"p{page}-{len(self.pages[page])}"', "Link": link})
+
+    def test_fetches_every_page(self):
+        with patch.object(git_api, "make_request", side_effect=self._page):
+            contributors = git_api.get_contributors("owner/repo")
+        self.assertEqual(len(contributors), 205)
+        self.assertEqual(contributors[100]["login"], "user2-0")
+        self.assertEqual(sorted(page for page, _ in self.requests), [1, 2, 3])
+
+    def test_cached_pages_are_revalidated_with_etags(self):
+        with patch.object(git_api, "make_request", side_effect=self._page):
+            first = git_api.get_contributors("owner/repo")
+            self.requests.clear()
+            self.assertEqual(git_api.get_contributors("owner/repo"), first)
+            self.assertEqual(self.requests, [])  # within GITHUB_CACHE_TTL: no request at all
+
+            self.pages[3].append({"login": "newcomer", "contributions": 1})
+            with patch.object(git_api, "GITHUB_CACHE_TTL", 0):
+                contributors = git_api.get_contributors("owner/repo")
+        self.assertEqual(sorted(self.requests), [(1, '"p1-100"'), (2, '"p2-100"'), (3, '"p3-5"')])
+        self.assertEqual(len(contributors), 206)
+        self.assertEqual(contributors[-1]["login"], "newcomer")
+
 # if __name__ == "__main__":
 #     unittest.main()
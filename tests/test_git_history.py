@@ -0,0 +1,61 @@
+import os
+import subprocess
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from cloning import git_history
+from cloning.mirror_cache import MirrorCache
+from metrics import bus_factor
+
+
+def _commit(repo, email, date=None):
+    env = {**os.environ, "GIT_AUTHOR_NAME": email, "GIT_AUTHOR_EMAIL": email,
+           "GIT_COMMITTER_NAME": email, "GIT_COMMITTER_EMAIL": email}
+    if date:
+        env["GIT_COMMITTER_DATE"] = env["GIT_AUTHOR_DATE"] = date
+    subprocess.run(["git", "commit", "-q", "--allow-empty", "-m", email], cwd=repo, env=env, check=True)
+
+
+class TestGitHistory(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.source = os.path.join(tmp.name, "source")
+        os.makedirs(self.source)
+        subprocess.run(["git", "init", "-q", "-b", "main"], cwd=self.source, check=True)
+        _commit(self.source, "retired@example.com", date="2001-01-01T00:00:00")
+        for email in ["alice@example.com"] * 6 + ["bob@example.com"] * 3 + ["carol@example.com"]:
+            _commit(self.source, email)
+        self.url = "file://" + self.source
+        self.mirrors = MirrorCache(os.path.join(tmp.name, "mirrors"), name="history")
+        patcher = patch.object(git_history, "_mirrors", self.mirrors)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_counts_authors_in_window_and_fetches_incrementally(self):
+        authors = git_history.commit_authors(self.url)
+        self.assertEqual(authors, {"alice@example.com": 6, "bob@example.com": 3, "carol@example.com": 1})
+        _commit(self.source, "dave@example.com")
+        self.assertEqual(git_history.commit_authors(self.url)["dave@example.com"], 1)
+        self.assertEqual(len(os.listdir(self.mirrors.root)), 1)
+        self.assertEqual((self.mirrors.stats()["misses"], self.mirrors.stats()["hits"]), (1, 1))
+
+    def test_history_mode_bus_factor(self):
+        with patch.object(bus_factor, "BUS_FACTOR_MODE", "history"), \
+                patch.object(bus_factor.git_api, "get_contributors") as contributors:
+            score = bus_factor.bus_factor("", self.url, "org/repo", "github")
+            contributors.assert_not_called()
+        self.assertAlmostEqual(score, 1 - 1 / 3)
+
+    def test_unreadable_history_falls_back_to_contributors(self):
+        with patch.object(bus_factor, "BUS_FACTOR_MODE", "history"), \
+                patch.object(bus_factor.git_api, "get_contributors",
+                             return_value=[{"contributions": 5}, {"contributions": 5}]):
+            score = bus_factor.bus_factor("", "file:///does/not/exist", "org/repo", "github")
+        self.assertEqual(score, 0.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
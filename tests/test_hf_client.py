@@ -0,0 +1,78 @@
+import threading
+import types
+import unittest
+from unittest.mock import patch
+
+from apis import hf_client
+from apis.hf_client import HFClient
+from model import Dataset, Model
+from utils import url_parser
+
+
+class TestHFClientCache(unittest.TestCase):
+
+    def setUp(self):
+        hf_client.clear_cache()
+        self.addCleanup(hf_client.clear_cache)
+        patcher = patch.object(hf_client, "HfApi")
+        self.api = patcher.start().return_value
+        self.addCleanup(patcher.stop)
+        self.api.model_info.side_effect = lambda repo_id, token: types.SimpleNamespace(id=repo_id, sha="abc")
+
+    def test_repeated_lookups_share_one_fetch(self):
+        first = HFClient().model_info("org/model")
+        self.assertEqual(HFClient().model_info("org/model"), first)
+        self.assertEqual(self.api.model_info.call_count, 1)
+        HFClient().model_info("org/other")
+        self.assertEqual(self.api.model_info.call_count, 2)
+
+    def test_failures_are_retried_and_entries_expire(self):
+        self.api.model_info.side_effect = RuntimeError("hub down")
+        self.assertEqual(HFClient().model_info("org/model"), {})
+        self.api.model_info.side_effect = lambda repo_id, token: types.SimpleNamespace(sha="abc")
+        self.assertEqual(HFClient().model_info("org/model"), {"sha": "abc"})
+        with patch.object(hf_client.time, "monotonic", return_value=hf_client.time.monotonic() + 10 ** 6):
+            HFClient().model_info("org/model")
+        self.assertEqual(self.api.model_info.call_count, 3)
+
+    def test_warm_up_fetches_each_repo_once_concurrently(self):
+        threads = set()
+        overlapped = threading.Event()
+
+        def card(repo_id, token):
+            threads.add(threading.get_ident())
+            if len(threads) > 1:
+                overlapped.set()
+            overlapped.wait(5)  # held until a second fetch runs alongside
+            return types.SimpleNamespace(text=f"# {repo_id}")
+
+        self.api.dataset_info.side_effect = lambda repo_id, token: types.SimpleNamespace(id=repo_id)
+        with patch.object(hf_client.ModelCard, "load", side_effect=card), \
+                patch.object(hf_client.DatasetCard, "load", side_effect=card):
+            client = HFClient()
+            fetched = client.warm_up(["org/a", "org/b", "org/a"], ["data/x"])
+            self.assertEqual(fetched, 6)
+            self.assertEqual(client.model_card_text("org/b"), "# org/b")
+            self.assertEqual(hf_client.ModelCard.load.call_count, 2)
+        self.assertEqual(self.api.model_info.call_count, 2)
+        self.assertGreater(len(threads), 1)
+
+
+class TestWarmHFMetadata(unittest.TestCase):
+
+    def test_collects_model_and_hf_dataset_ids(self):
+        model = Model("https://huggingface.co/google-bert/bert-base-uncased", id="google-bert/bert-base-uncased")
+        hf_dataset = Dataset("https://huggingface.co/datasets/bookcorpus/bookcorpus")
+        hf_dataset._name = "bookcorpus/bookcorpus"
+        other = Dataset("https://example.com/corpus")
+        other._name = "corpus"
+        model.linkDataset(hf_dataset)
+        with patch.object(url_parser, "HFClient") as client:
+            url_parser.warm_hf_metadata([model], {"bookcorpus/bookcorpus": hf_dataset, "corpus": other})
+        model_ids, dataset_ids = client.return_value.warm_up.call_args.args
+        self.assertEqual(model_ids, ["google-bert/bert-base-uncased"])
+        self.assertEqual(set(dataset_ids), {"bookcorpus/bookcorpus"})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,136 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+from botocore.exceptions import ClientError
+
+from apis import id_allocator
+from apis import fast_api
+from apis.artifact_store import DynamoArtifactStore, MemoryArtifactStore, SqliteArtifactStore
+
+
+class TestSnowflakeIdGenerator(unittest.TestCase):
+
+    def test_ids_are_unique_across_threads(self):
+        """Concurrent allocation from one worker never repeats an ID"""
+        gen = id_allocator.SnowflakeIdGenerator(worker_id=3)
+        results = []
+        lock = threading.Lock()
+
+        def allocate():
+            ids = [gen.next_id() for _ in range(100)]
+            with lock:
+                results.extend(ids)
+
+        threads = [threading.Thread(target=allocate) for _ in range(8)]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        self.assertEqual(len(results), len(set(results)))
+
+    def test_workers_never_collide(self):
+        """Different worker ids produce different IDs at the same instant"""
+        clock = lambda: 1800000000.0
+        a = id_allocator.SnowflakeIdGenerator(worker_id=1, clock=clock)
+        b = id_allocator.SnowflakeIdGenerator(worker_id=2, clock=clock)
+        self.assertTrue(set(a.next_ids(128)).isdisjoint(b.next_ids(128)))
+
+    def test_ids_fit_json_safe_integer(self):
+        """IDs are positive and below 2**53"""
+        gen = id_allocator.SnowflakeIdGenerator(worker_id=31)
+        for new_id in gen.next_ids(1000):
+            self.assertGreater(new_id, 0)
+            self.assertLess(new_id, 2 ** 53)
+
+    def test_restarted_worker_starts_past_previous_ids(self):
+        """A worker started later never reissues IDs from an earlier run"""
+        before = id_allocator.SnowflakeIdGenerator(worker_id=4, clock=lambda: 1800000000.0).next_ids(1000)
+        after = id_allocator.SnowflakeIdGenerator(worker_id=4, clock=lambda: 1800000001.0).next_ids(1000)
+        self.assertGreater(min(after), max(before))
+
+    def test_worker_id_from_environment(self):
+        """ARTIFACT_WORKER_ID pins the worker id"""
+        with patch.dict(os.environ, {"ARTIFACT_WORKER_ID": "7"}):
+            self.assertEqual(id_allocator.default_worker_id(), 7)
+
+    def test_invalid_worker_id(self):
+        with self.assertRaises(ValueError):
+            id_allocator.SnowflakeIdGenerator(worker_id=32)
+
+    def test_out_of_range_environment_worker_id_is_rejected(self):
+        """ARTIFACT_WORKER_ID outside 0-31 raises instead of wrapping"""
+        for value in ("32", "-1", "seven"):
+            with patch.dict(os.environ, {"ARTIFACT_WORKER_ID": value}), self.assertRaises(ValueError):
+                id_allocator.default_worker_id()
+
+
+class TestWorkerLease(unittest.TestCase):
+
+    def test_live_workers_lease_distinct_ids(self):
+        """Every worker sharing a store gets its own slot until all 32 are taken"""
+        with tempfile.TemporaryDirectory() as tmp:
+            store = SqliteArtifactStore(os.path.join(tmp, "artifacts.db"))
+            self.addCleanup(store.close)
+            leases = [id_allocator.WorkerLease(store) for _ in range(id_allocator.MAX_WORKER_ID + 1)]
+            self.assertEqual(sorted(lease.worker_id for lease in leases), list(range(32)))
+            with self.assertRaises(RuntimeError):
+                id_allocator.WorkerLease(store).worker_id
+            for lease in leases:
+                lease.release()
+
+    def test_expired_or_released_slots_are_reused(self):
+        now = [1000.0]
+        store = MemoryArtifactStore()
+        first = id_allocator.WorkerLease(store, ttl=60, clock=lambda: now[0])
+        slot = first.worker_id
+        for other in range(32):
+            if other != slot:
+                store.claim_lease(other, "someone-else", 10 ** 10, now[0])
+        self.assertFalse(store.claim_lease(slot, "intruder", now[0] + 60, now[0]))
+
+        now[0] += 61  # first stopped renewing
+        second = id_allocator.WorkerLease(store, ttl=60, clock=lambda: now[0])
+        self.assertEqual(second.worker_id, slot)
+        first._stop.set()
+
+        second.release()
+        third = id_allocator.WorkerLease(store, ttl=60, clock=lambda: now[0])
+        self.assertEqual(third.worker_id, slot)
+        third.release()
+
+    def test_generator_takes_worker_id_from_lease(self):
+        store = MemoryArtifactStore()
+        lease = id_allocator.WorkerLease(store)
+        with patch.dict(os.environ, {"ARTIFACT_WORKER_ID": ""}):
+            gen = id_allocator.SnowflakeIdGenerator(lease=lease)
+        new_id = gen.next_id()
+        self.assertEqual((new_id >> id_allocator.SEQUENCE_BITS) & id_allocator.MAX_WORKER_ID, lease.worker_id)
+        lease.release()
+
+    def test_dynamo_scan_hides_lease_rows(self):
+        table = MagicMock()
+        table.scan.return_value = {"Items": []}
+        store = DynamoArtifactStore(table)
+        self.assertTrue(store.claim_lease(3, "me", 2000, 1000))
+        self.assertEqual(table.put_item.call_args.kwargs["Item"]["model_id"], -4)
+        store.scan()
+        self.assertIn("FilterExpression", table.scan.call_args.kwargs)
+
+
+class TestPutNewArtifact(unittest.TestCase):
+
+    def test_conflict_allocates_new_id(self):
+        """A conditional-put conflict retries the insert under a fresh ID"""
+        conflict = ClientError({"Error": {"Code": "ConditionalCheckFailedException"}}, "PutItem")
+        table = MagicMock()
+        table.put_item.side_effect = [conflict, None]
+        item = {"model_id": 1, "url": "https://huggingface.co/org/model"}
+        with patch.object(fast_api, "artifact_store", DynamoArtifactStore(table)), \
+                patch.object(fast_api, "id_allocator", id_allocator.SnowflakeIdGenerator(worker_id=1)):
+            stored_id = fast_api._put_new_artifact(item)
+        self.assertNotEqual(stored_id, 1)
+        self.assertEqual(item["model_id"], stored_id)
+        self.assertEqual(table.put_item.call_args.kwargs["ConditionExpression"], "attribute_not_exists(model_id)")
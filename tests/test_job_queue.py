@@ -0,0 +1,107 @@
+import os
+import tempfile
+import threading
+import unittest
+
+from apis.job_queue import RatingJobQueue, DONE, FAILED, QUEUED
+
+
+class TestRatingJobQueue(unittest.TestCase):
+
+    def test_job_runs_and_reports_done(self):
+        """A submitted job is executed by a worker and marked done"""
+        seen = []
+        jobs = RatingJobQueue(seen.append, max_workers=1)
+        jobs.submit(1)
+        jobs.join()
+        self.assertEqual(seen, [1])
+        self.assertEqual(jobs.status(1)["state"], DONE)
+
+    def test_failed_job_records_error(self):
+        """Exceptions from the worker are captured in the job record"""
+        def boom(artifact_id):
+            raise RuntimeError("no such model")
+
+        jobs = RatingJobQueue(boom, max_workers=1)
+        jobs.submit(2)
+        jobs.join()
+        status = jobs.status(2)
+        self.assertEqual(status["state"], FAILED)
+        self.assertIn("no such model", status["error"])
+
+    def test_duplicate_submissions_are_merged(self):
+        """Queued duplicates collapse into one job; a running job reruns once"""
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def worker(artifact_id):
+            calls.append(artifact_id)
+            started.set()
+            release.wait(5)
+
+        jobs = RatingJobQueue(worker, max_workers=1)
+        jobs.submit(3)
+        self.assertTrue(started.wait(5))
+        # Job 3 is running: these collapse into a single rerun
+        jobs.submit(3)
+        jobs.submit(3)
+        # Job 4 is queued behind it: the duplicate is merged
+        jobs.submit(4)
+        self.assertEqual(jobs.submit(4)["state"], QUEUED)
+        release.set()
+        jobs.join()
+        self.assertEqual(sorted(calls), [3, 3, 4])
+
+    def test_unfinished_jobs_are_resumed_from_store(self):
+        """Jobs persisted as queued are picked up again by a new queue"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "jobs.db")
+            blocked = threading.Event()
+            first = RatingJobQueue(lambda artifact_id: blocked.wait(5), max_workers=1, store_path=path)
+            first.submit(5)
+            first.submit(6)  # stays queued while 5 blocks the only worker
+
+            seen = []
+            second = RatingJobQueue(seen.append, max_workers=1, store_path=path)
+            second.start()
+            second.join()
+            blocked.set()
+            first.join()
+            self.assertIn(6, seen)
+
+    def test_stop_finishes_running_job_and_keeps_queued_ones(self):
+        """stop() waits for the running job; queued jobs stay persisted as queued and run after restart"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "jobs.db")
+            started, release = threading.Event(), threading.Event()
+            calls = []
+
+            def worker(artifact_id):
+                calls.append(artifact_id)
+                started.set()
+                release.wait(5)
+
+            jobs = RatingJobQueue(worker, max_workers=1, store_path=path)
+            jobs.submit(8)
+            self.assertTrue(started.wait(5))
+            jobs.submit(9)
+            threading.Timer(0.2, release.set).start()
+            jobs.stop(timeout=5)
+            self.assertEqual(jobs.status(8)["state"], DONE)
+            self.assertEqual(jobs.status(9)["state"], QUEUED)
+            self.assertEqual(calls, [8])
+
+            resumed = []
+            restarted = RatingJobQueue(resumed.append, max_workers=1, store_path=path)
+            restarted.start()
+            restarted.join()
+            self.assertEqual(resumed, [9])
+
+    def test_clear_forgets_jobs(self):
+        """clear() drops job records"""
+        jobs = RatingJobQueue(lambda artifact_id: None, max_workers=1)
+        jobs.submit(7)
+        jobs.join()
+        jobs.clear()
+        self.assertIsNone(jobs.status(7))
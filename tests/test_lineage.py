@@ -0,0 +1,68 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from apis import lineage
+
+
+def _edges(graph):
+    return {(e["from_node_artifact_id"], e["to_node_artifact_id"], e["relationship"]) for e in graph["edges"]}
+
+
+class TestLineageIndex(unittest.TestCase):
+
+    def setUp(self):
+        self.index = lineage.LineageIndex()
+        self.index.load([
+            {"model_id": 1, "name": "bert-base-uncased", "type": "model", "dataset_id": Decimal(2), "code_id": "3"},
+            {"model_id": 2, "name": "bookcorpus", "type": "dataset"},
+            {"model_id": 3, "name": "bert", "type": "code"},
+            {"model_id": 4, "name": "distilbert", "type": "model", "base_model": ["google-bert/bert-base-uncased"]},
+            {"model_id": 5, "name": "distilbert-squad", "type": "model", "base_model_id": 4, "dataset_id": None},
+        ])
+
+    def test_upstream_is_transitive(self):
+        graph = self.index.graph(5, direction="upstream")
+        self.assertEqual(graph["nodes"][0], {"artifact_id": 5, "name": "distilbert-squad", "source": "model"})
+        self.assertEqual({n["artifact_id"] for n in graph["nodes"]}, {1, 2, 3, 4, 5})
+        self.assertEqual(_edges(graph), {
+            (4, 5, "base_model"), (1, 4, "base_model"), (2, 1, "dataset"), (3, 1, "code"),
+        })
+
+    def test_depth_limit_and_downstream(self):
+        graph = self.index.graph(5, depth=1)
+        self.assertEqual(_edges(graph), {(4, 5, "base_model")})
+        graph = self.index.graph(2, direction="downstream")
+        self.assertEqual(_edges(graph), {(2, 1, "dataset"), (1, 4, "base_model"), (4, 5, "base_model")})
+        graph = self.index.graph(4, depth=1, direction="both")
+        self.assertEqual(_edges(graph), {(1, 4, "base_model"), (4, 5, "base_model")})
+
+    def test_base_model_ingested_after_its_children(self):
+        self.index.upsert({"model_id": 6, "name": "llama-ft", "type": "model", "base_model": "meta/llama-7b"})
+        self.assertEqual(self.index.graph(6)["edges"], [])
+        self.index.upsert({"model_id": 7, "name": "llama-7b", "type": "model"})
+        self.assertEqual(_edges(self.index.graph(6)), {(7, 6, "base_model")})
+
+    def test_update_and_remove(self):
+        self.index.upsert({"model_id": 1, "name": "bert-base-uncased", "type": "model", "dataset_id": 2})
+        self.assertEqual(_edges(self.index.graph(1)), {(2, 1, "dataset")})
+        self.index.remove(4)
+        self.assertEqual(_edges(self.index.graph(5)), set())
+        self.assertEqual(_edges(self.index.graph(1, direction="downstream")), set())
+        self.assertIsNone(self.index.graph(4))
+        self.index.clear()
+        self.assertEqual(len(self.index), 0)
+
+    def test_fetch_base_models_from_card_data(self):
+        info = {"card_data": {"base_model": "google-bert/bert-base-uncased"}}
+        with patch.object(lineage.HFClient, "__init__", return_value=None), \
+                patch.object(lineage.HFClient, "model_info", return_value=info):
+            self.assertEqual(
+                lineage.fetch_base_models("https://huggingface.co/distilbert/distilbert-base-uncased"),
+                ["google-bert/bert-base-uncased"],
+            )
+        self.assertEqual(lineage.fetch_base_models("https://github.com/google/bert"), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,80 @@
+import threading
+import unittest
+from unittest.mock import MagicMock, patch
+
+import requests
+
+from metrics import dataset_and_code_score
+from utils import liveness
+from utils.liveness import LivenessChecker
+
+
+class _Session:
+    """Answers HEAD requests from a status table, optionally waiting at a barrier first."""
+
+    def __init__(self, statuses, barrier=None):
+        self.statuses, self.barrier = statuses, barrier
+        self.max_redirects = 30
+        self.calls = []
+        self.lock = threading.Lock()
+
+    def head(self, url, timeout, allow_redirects):
+        with self.lock:
+            self.calls.append(url)
+        if self.barrier:
+            self.barrier.wait(timeout=5)
+        status = self.statuses[url]
+        if isinstance(status, Exception):
+            raise status
+        return MagicMock(status_code=status)
+
+
+class TestLivenessChecker(unittest.TestCase):
+
+    def _checker(self, statuses, **kwargs):
+        checker = LivenessChecker(**kwargs)
+        checker.session = _Session(statuses)
+        return checker
+
+    def test_urls_are_probed_concurrently(self):
+        urls = {"https://a.example": 200, "https://b.example": 404, "https://c.example": 302}
+        checker = LivenessChecker(timeout=1)
+        # The barrier breaks (so every probe fails) unless all three probes run at once
+        checker.session = _Session(urls, threading.Barrier(3))
+        probes = checker.check(list(urls) + ["", None])
+        self.assertEqual({url: p.alive for url, p in probes.items()},
+                         {"https://a.example": True, "https://b.example": False, "https://c.example": True})
+        self.assertEqual(probes["https://b.example"].status_code, 404)
+        self.assertGreaterEqual(probes["https://a.example"].latency_ms, 0)
+
+    def test_live_and_dead_results_have_separate_ttls(self):
+        checker = self._checker({"https://up.example": 200, "https://down.example": requests.ConnectionError()},
+                                ttl=100, negative_ttl=10)
+        checker.check(["https://up.example", "https://down.example"])
+        checker.check(["https://up.example", "https://down.example"])
+        self.assertEqual(len(checker.session.calls), 2)
+        later = liveness.time.monotonic() + 50
+        with patch.object(liveness.time, "monotonic", return_value=later):
+            checker.check(["https://up.example", "https://down.example"])
+        self.assertEqual(checker.session.calls[2:], ["https://down.example"])
+
+    def test_redirect_limit_counts_redirect_status(self):
+        error = requests.TooManyRedirects(response=MagicMock(status_code=301))
+        checker = self._checker({"https://loop.example": error})
+        probe = checker.check(["https://loop.example"])["https://loop.example"]
+        self.assertEqual((probe.alive, probe.status_code), (True, 301))
+        self.assertEqual(LivenessChecker(max_redirects=3).session.max_redirects, 3)
+
+    def test_check_availability_uses_shared_checker(self):
+        checker = self._checker({"https://github.com/org/repo": 200,
+                                 "https://huggingface.co/datasets/org/data": 404,
+                                 "https://huggingface.co/org/model": 200})
+        with patch.object(dataset_and_code_score, "get_checker", return_value=checker):
+            result = dataset_and_code_score.check_availability(
+                "https://github.com/org/repo", "https://huggingface.co/datasets/org/data",
+                "https://huggingface.co/org/model")
+        self.assertEqual(result, {"has_code": True, "has_dataset": False, "has_model": True, "links_ok": True})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -9,6 +9,7 @@ class TestMainCLI(unittest.TestCase):
 
     @patch("main.requests.get")  # Mock the FastAPI request
     @patch("main.check_environment", return_value=True)
+    @patch("main.warm_hf_metadata")
     @patch("main.setup_logger")
     @patch("main.get_prompt_key")
     @patch("main.parse_URL_file")
@@ -17,7 +18,7 @@ class TestMainCLI(unittest.TestCase):
     @patch("main.json.dumps", side_effect=lambda x, **kwargs: str(x))
     def test_main_success(
         self, mock_json, mock_exists, mock_print_summary,
-        mock_parse, mock_get_key, mock_logger, mock_env, mock_requests_get
+        mock_parse, mock_get_key, mock_logger, mock_warm_up, mock_env, mock_requests_get
     ):
         """
         Test the normal successful execution of main():
@@ -44,6 +45,8 @@ class TestMainCLI(unittest.TestCase):
                 main.main()
                 # Ensure evaluate() was called on the model
                 mock_model.evaluate.assert_called_once()
+                # The batch's HuggingFace metadata is fetched before any evaluation
+                mock_warm_up.assert_called_once_with([mock_model], {"dataset1": "info"})
                 # Ensure print() was called with the evaluated metrics
                 mock_print.assert_called_with(str({"metric": 0.9}))
 
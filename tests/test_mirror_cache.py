@@ -0,0 +1,121 @@
+import os
+import subprocess
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from cloning import clone_bridge, mirror_cache
+from cloning.mirror_cache import MirrorCache
+
+
+def _commit(repo, name, size=0):
+    with open(os.path.join(repo, name), "wb") as f:
+        f.write(os.urandom(size))
+    env = {**os.environ, "GIT_AUTHOR_NAME": "a", "GIT_AUTHOR_EMAIL": "a@example.com",
+           "GIT_COMMITTER_NAME": "a", "GIT_COMMITTER_EMAIL": "a@example.com"}
+    subprocess.run(["git", "add", name], cwd=repo, check=True)
+    subprocess.run(["git", "commit", "-q", "-m", name], cwd=repo, env=env, check=True)
+
+
+class TestMirrorCache(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.tmp = tmp.name
+        self.cache = MirrorCache(os.path.join(tmp.name, "mirrors"), max_bytes=10 * 1024 * 1024)
+
+    def _repo(self, name, size=0):
+        path = os.path.join(self.tmp, name)
+        os.makedirs(path)
+        subprocess.run(["git", "init", "-q", "-b", "main"], cwd=path, check=True)
+        _commit(path, "README.md", size)
+        return "file://" + path
+
+    def test_second_request_fetches_only_new_objects(self):
+        url = self._repo("repo", size=200_000)
+        target = os.path.join(self.tmp, "work", "repo")
+        self.cache.checkout(url, target)
+        first = self.cache.stats()
+        self.assertEqual((first["misses"], first["hits"]), (1, 0))
+        self.assertGreater(first["bytes_fetched"], 200_000)
+
+        _commit(url[len("file://"):], "CHANGELOG.md", size=1000)
+        self.cache.checkout(url, target)
+        second = self.cache.stats()
+        self.assertEqual((second["misses"], second["hits"]), (1, 1))
+        self.assertLess(second["bytes_fetched"] - first["bytes_fetched"], 100_000)
+        self.assertTrue(os.path.exists(os.path.join(target, "CHANGELOG.md")))
+        self.assertEqual(len(os.listdir(self.cache.root)), 1)
+
+    def test_concurrent_requests_share_one_clone(self):
+        url = self._repo("repo")
+        real_git = mirror_cache.git
+        started = threading.Event()
+
+        def slow_git(*args, **kwargs):
+            if args[0] == "clone":
+                started.set()
+                threading.Event().wait(0.3)
+            return real_git(*args, **kwargs)
+
+        paths = []
+        with patch.object(mirror_cache, "git", side_effect=slow_git) as git:
+            def use():
+                with self.cache.use(url) as path:
+                    paths.append(path)
+            first = threading.Thread(target=use)
+            first.start()
+            started.wait(5)
+            others = [threading.Thread(target=use) for _ in range(3)]
+            for thread in others:
+                thread.start()
+            for thread in [first] + others:
+                thread.join()
+        self.assertEqual([call.args[0] for call in git.call_args_list].count("clone"), 1)
+        self.assertEqual(len(set(paths)), 1)
+        stats = self.cache.stats()
+        self.assertEqual((stats["misses"], stats["shared"]), (1, 3))
+
+    def test_least_recently_used_mirror_is_evicted(self):
+        urls = [self._repo(name, size=100_000) for name in ("a", "b", "c")]
+        for url in urls:
+            with self.cache.use(url):
+                pass
+        with self.cache.use(urls[0]):
+            pass  # "b" is now the least recently used
+        mtimes = {url: os.stat(self.cache.path(url)).st_mtime for url in urls}
+        os.utime(self.cache.path(urls[1]), (mtimes[urls[1]] - 10, mtimes[urls[1]] - 10))
+
+        self.cache.max_bytes = mirror_cache._disk_bytes(self.cache.root) - 1
+        self.assertEqual(self.cache.evict(), 1)
+        self.assertFalse(os.path.exists(self.cache.path(urls[1])))
+        self.assertTrue(os.path.exists(self.cache.path(urls[0])))
+        self.assertEqual(self.cache.stats()["evictions"], 1)
+
+    def test_mirrors_in_use_are_not_evicted(self):
+        url = self._repo("repo", size=100_000)
+        self.cache.max_bytes = 0
+        with self.cache.use(url) as path:
+            self.assertEqual(self.cache.evict(), 0)
+            self.assertTrue(os.path.exists(path))
+        self.assertFalse(os.path.exists(path))  # evicted once released
+
+    def test_failed_clone_leaves_no_mirror(self):
+        with self.assertRaises(RuntimeError):
+            self.cache.checkout("file:///does/not/exist", os.path.join(self.tmp, "work"))
+        self.assertEqual(os.listdir(self.cache.root), [])
+        self.assertEqual(self.cache.stats()["misses"], 0)
+
+    def test_clone_with_isogit_uses_mirror_cache(self):
+        url = self._repo("model-repo.git")
+        with patch.object(clone_bridge, "get_mirror_cache", return_value=self.cache), \
+                patch.object(clone_bridge, "subprocess") as node:
+            clone_bridge.clone_with_isogit(url, os.path.join(self.tmp, "models"))
+        node.run.assert_not_called()
+        self.assertTrue(os.path.exists(os.path.join(self.tmp, "models", "model-repo", "README.md")))
+
+
+if __name__ == "__main__":
+    unittest.main()
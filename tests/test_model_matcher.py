@@ -0,0 +1,61 @@
+import threading
+import time
+import unittest
+
+from apis import model_matcher
+
+
+MODELS = [
+    {"model_id": 1, "url": "https://huggingface.co/openai/whisper-tiny"},
+    {"model_id": 2, "url": "https://huggingface.co/google-bert/bert-base-uncased"},
+    {"model_id": 3, "url": "https://huggingface.co/microsoft/resnet-50"},
+    {"model_id": 4, "url": "https://huggingface.co/vikhyatk/moondream2"},
+]
+
+
+class TestModelMatcher(unittest.TestCase):
+
+    def test_candidate_score_prefers_related_urls(self):
+        """Token overlap ranks the related model above unrelated ones"""
+        related = model_matcher.candidate_score("https://github.com/openai/whisper", MODELS[0]["url"])
+        unrelated = model_matcher.candidate_score("https://github.com/openai/whisper", MODELS[2]["url"])
+        self.assertGreater(related, unrelated)
+        self.assertGreaterEqual(related, 0.0)
+        self.assertLessEqual(related, 1.0)
+
+    def test_top_candidates_keeps_k_most_plausible(self):
+        """Only k candidates are kept, most plausible first"""
+        candidates = model_matcher.top_candidates("https://github.com/google-research/bert", MODELS, k=2)
+        self.assertEqual(len(candidates), 2)
+        self.assertEqual(candidates[0]["model_id"], 2)
+
+    def test_best_match_picks_highest_rating(self):
+        """The highest-rated candidate wins; None/invalid ratings are skipped"""
+        ratings = {1: 0.2, 2: None, 3: 0.7, 4: "bad"}
+        best, rating = model_matcher.best_match(MODELS, lambda m: ratings[m["model_id"]], threshold=1.1)
+        self.assertEqual(best["model_id"], 3)
+        self.assertEqual(rating, 0.7)
+
+    def test_best_match_no_positive_rating(self):
+        """No candidate is returned when every rating is zero or missing"""
+        best, rating = model_matcher.best_match(MODELS, lambda m: 0.0)
+        self.assertIsNone(best)
+        self.assertEqual(rating, 0.0)
+
+    def test_best_match_stops_early_over_threshold(self):
+        """Queued calls are cancelled once a rating crosses the threshold"""
+        calls = []
+        lock = threading.Lock()
+
+        def rate(m):
+            with lock:
+                calls.append(m["model_id"])
+            if m["model_id"] == 1:
+                return 0.95
+            time.sleep(0.05)
+            return 0.1
+
+        best, rating = model_matcher.best_match(MODELS, rate, max_workers=1, threshold=0.9)
+        self.assertEqual(best["model_id"], 1)
+        self.assertEqual(rating, 0.95)
+        self.assertLess(len(calls), len(MODELS))
@@ -0,0 +1,66 @@
+import unittest
+from decimal import Decimal
+from unittest.mock import MagicMock
+
+from apis import pagination
+from apis import fast_api
+from apis.artifact_store import DynamoArtifactStore
+
+
+class TestPagination(unittest.TestCase):
+
+    def test_cursor_round_trip(self):
+        """Decimal keys from DynamoDB survive encode/decode as plain numbers"""
+        token = pagination.encode_cursor({"model_id": Decimal("1731000000123")})
+        self.assertIsInstance(token, str)
+        self.assertNotIn("model_id", token)  # opaque
+        self.assertEqual(pagination.decode_cursor(token), {"model_id": 1731000000123})
+
+    def test_empty_cursor(self):
+        """No key means no cursor; empty/legacy tokens mean start of table"""
+        self.assertIsNone(pagination.encode_cursor(None))
+        self.assertIsNone(pagination.decode_cursor(None))
+        self.assertIsNone(pagination.decode_cursor(""))
+        self.assertIsNone(pagination.decode_cursor("0"))
+
+    def test_invalid_cursor(self):
+        """Garbage tokens are rejected"""
+        with self.assertRaises(ValueError):
+            pagination.decode_cursor("not-a-cursor!")
+        with self.assertRaises(ValueError):
+            pagination.decode_cursor(pagination.encode_cursor({"a": 1})[:-3] + "@@@")
+
+
+class TestArtifactPages(unittest.TestCase):
+
+    def _item(self, i):
+        return {"model_id": Decimal(i), "name": f"m{i}", "type": "model"}
+
+    def test_page_stops_when_full(self):
+        """A full page resumes after its last item even mid-scan-page"""
+        table = MagicMock()
+        table.scan.side_effect = [
+            {"Items": [self._item(1), self._item(2)], "LastEvaluatedKey": {"model_id": Decimal(3)}},
+            {"Items": [self._item(3), self._item(4), self._item(5)], "LastEvaluatedKey": {"model_id": Decimal(5)}},
+        ]
+        items, next_key = DynamoArtifactStore(table).scan(limit=3)
+        self.assertEqual([int(i["model_id"]) for i in items], [1, 2, 3])
+        self.assertEqual(next_key, {"model_id": Decimal(3)})
+        self.assertEqual(table.scan.call_count, 2)
+        self.assertEqual(table.scan.call_args_list[1].kwargs["ExclusiveStartKey"], {"model_id": Decimal(3)})
+
+    def test_last_page_has_no_cursor(self):
+        """The end of the table yields no next key"""
+        table = MagicMock()
+        table.scan.return_value = {"Items": [self._item(1)]}
+        items, next_key = DynamoArtifactStore(table).scan(limit=3, start_key={"model_id": 0})
+        self.assertEqual(len(items), 1)
+        self.assertIsNone(next_key)
+        self.assertEqual(table.scan.call_args.kwargs["ExclusiveStartKey"], {"model_id": 0})
+
+    def test_wildcard_query_filter(self):
+        """'*' without types matches everything, otherwise a filter is built"""
+        everything = fast_api._artifact_query_filter([fast_api.ArtifactQuery(name="*")])
+        self.assertIsNone(everything)
+        named = fast_api._artifact_query_filter([fast_api.ArtifactQuery(name="bert", types=["model"])])
+        self.assertIsNotNone(named)
@@ -0,0 +1,52 @@
+import asyncio
+import unittest
+
+from apis import password_hasher
+
+
+class TestPasswordHasher(unittest.TestCase):
+
+    def setUp(self):
+        self.hasher = password_hasher.PasswordHasher(workers=2, max_pending=4, rounds=4)
+
+    def tearDown(self):
+        self.hasher.close()
+
+    def test_hash_and_check_in_pool(self):
+        async def roundtrip():
+            hashed = await self.hasher.hash("hunter2")
+            return hashed, await self.hasher.check("hunter2", hashed), await self.hasher.check("wrong", hashed)
+
+        hashed, good, bad = asyncio.run(roundtrip())
+        self.assertTrue(hashed.startswith("$2b$04$"))
+        self.assertTrue(good)
+        self.assertFalse(bad)
+        self.assertEqual(self.hasher.stats.snapshot()["count"], 3)
+
+    def test_rejects_beyond_admission_limit(self):
+        """Operations past max_pending fail fast instead of queueing"""
+        hasher = password_hasher.PasswordHasher(workers=1, max_pending=1, rounds=10)
+
+        async def burst():
+            return await asyncio.gather(*(hasher.hash("pw") for _ in range(3)), return_exceptions=True)
+
+        try:
+            results = asyncio.run(burst())
+        finally:
+            hasher.close()
+        rejected = [r for r in results if isinstance(r, password_hasher.HasherBusyError)]
+        self.assertEqual(len(rejected), 2)
+        self.assertEqual(hasher.stats.snapshot()["rejected"], 2)
+
+    def test_latency_snapshot(self):
+        stats = password_hasher.LatencyStats(window=10)
+        for ms in range(1, 21):
+            stats.record(ms / 1000)
+        snap = stats.snapshot()
+        self.assertEqual(snap["count"], 20)
+        self.assertEqual(snap["max_ms"], 20.0)
+        self.assertEqual(snap["p50_ms"], 16.0)
+
+
+if __name__ == "__main__":
+    unittest.main()
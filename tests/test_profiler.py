@@ -0,0 +1,75 @@
+import asyncio
+import os
+import tempfile
+import time
+import unittest
+
+from utils.profiler import ProfilingMiddleware, SamplingProfiler
+
+
+def _busy_handler(seconds):
+    end = time.perf_counter() + seconds
+    while time.perf_counter() < end:
+        pass
+
+
+async def _app(scope, receive, send):
+    _busy_handler(0.05)
+    await send({"type": "http.response.start", "status": 200, "headers": []})
+    await send({"type": "http.response.body", "body": b"ok"})
+
+
+def _call(middleware, headers):
+    sent = []
+
+    async def send(message):
+        sent.append(message)
+
+    async def receive():
+        return {"type": "http.request", "body": b""}
+
+    scope = {"type": "http", "method": "GET", "path": "/health", "headers": headers}
+    asyncio.run(middleware(scope, receive, send))
+    return sent
+
+
+class TestProfiler(unittest.TestCase):
+
+    def test_sampler_collapses_stacks(self):
+        profiler = SamplingProfiler(interval=0.001).start()
+        _busy_handler(0.05)
+        stacks = profiler.stop()
+        self.assertGreater(profiler.samples, 0)
+        self.assertTrue(any("_busy_handler (test_profiler.py" in stack for stack in stacks))
+        for line in profiler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            self.assertTrue(count.isdigit())
+            self.assertNotIn("\n", stack)
+
+    def test_header_triggers_profile_with_request_id(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            middleware = ProfilingMiddleware(_app, enabled=True, sample_rate=0, directory=tmp, interval=0.001)
+            sent = _call(middleware, [(b"x-profile", b"1"), (b"x-request-id", b"req-42")])
+            self.assertIn((b"x-request-id", b"req-42"), sent[0]["headers"])
+            path = os.path.join(tmp, "req-42.collapsed")
+            self.assertTrue(os.path.exists(path))
+            with open(path) as f:
+                self.assertIn("_busy_handler", f.read())
+
+    def test_not_profiled_without_trigger_or_when_disabled(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            _call(ProfilingMiddleware(_app, enabled=True, sample_rate=0, directory=tmp), [])
+            _call(ProfilingMiddleware(_app, enabled=False, sample_rate=1, directory=tmp), [(b"x-profile", b"1")])
+            self.assertEqual(os.listdir(tmp), [])
+
+    def test_sample_rate_and_unsafe_request_id(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            middleware = ProfilingMiddleware(_app, enabled=True, sample_rate=1, directory=tmp, interval=0.001)
+            _call(middleware, [(b"x-request-id", b"../../etc/passwd")])
+            files = os.listdir(tmp)
+            self.assertEqual(len(files), 1)
+            self.assertRegex(files[0], r"^[0-9a-f]{32}\.collapsed$")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,111 @@
+import asyncio
+import json
+import threading
+import unittest
+from unittest.mock import patch
+
+from apis import fast_api, rating_store
+from apis.artifact_store import ArtifactNotFoundError, MemoryArtifactStore
+
+
+class TestRatingStore(unittest.TestCase):
+
+    def test_fingerprint_changes_with_inputs(self):
+        """Fingerprint is stable for equal inputs and changes when a link changes"""
+        a = rating_store.rating_fingerprint("https://huggingface.co/org/model", None, None)
+        b = rating_store.rating_fingerprint("https://huggingface.co/org/model", None, None)
+        c = rating_store.rating_fingerprint("https://huggingface.co/org/model", "https://github.com/org/repo", None)
+        self.assertEqual(a, b)
+        self.assertNotEqual(a, c)
+
+    def test_load_rating_missing(self):
+        """Items without a stored rating return None"""
+        self.assertIsNone(rating_store.load_rating({"model_id": 1}))
+        self.assertIsNone(rating_store.load_rating({"model_id": 1, "rating_json": "{not json"}))
+
+    def test_save_then_load_round_trip(self):
+        """save_rating writes JSON + timestamp + fingerprint that load_rating reads back"""
+        store = MemoryArtifactStore()
+        store.put({"model_id": 7, "type": "model"})
+        rating = {"name": "model", "net_score": 0.42}
+        record = rating_store.save_rating(store, 7, rating, "abc")
+
+        item = store.get(7)
+        self.assertEqual(item["type"], "model")
+        loaded = rating_store.load_rating(item)
+        self.assertEqual(loaded["rating"], rating)
+        self.assertEqual(loaded["fingerprint"], "abc")
+        self.assertEqual(loaded["computed_at"], record["computed_at"])
+        self.assertEqual(json.loads(item["rating_json"])["net_score"], 0.42)
+
+    def test_save_does_not_recreate_a_deleted_artifact(self):
+        store = MemoryArtifactStore()
+        with self.assertRaises(ArtifactNotFoundError):
+            rating_store.save_rating(store, 7, {"net_score": 0.42}, "abc")
+        self.assertIsNone(store.get(7))
+
+    def test_is_stale(self):
+        """Ratings older than the TTL are stale"""
+        record = {"computed_at": 1000}
+        self.assertFalse(rating_store.is_stale(record, ttl=60, now=1030))
+        self.assertTrue(rating_store.is_stale(record, ttl=60, now=1061))
+
+
+class TestRatingJob(unittest.TestCase):
+
+    def test_model_deleted_mid_rating_is_not_recreated(self):
+        """A /reset while a rating job runs drops the result instead of leaving a nameless ghost item"""
+        store = MemoryArtifactStore()
+        store.put({"model_id": 3, "type": "model", "url": "https://huggingface.co/org/model", "name": "model"})
+
+        def evaluate(use_cache=True):
+            store.delete_all()
+            return {"name": "model", "net_score": 0.5}
+
+        with patch.object(fast_api, "artifact_store", store), \
+                patch.object(fast_api, "_genai_single_url", return_value=None), \
+                patch.object(fast_api, "populate_model_info"), \
+                patch.object(fast_api, "Model") as model:
+            model.return_value.evaluate.side_effect = evaluate
+            fast_api._run_rating_job(3)
+        self.assertIsNone(store.get(3))
+        self.assertEqual(store.scan()[0], [])
+
+
+class TestRateEndpoint(unittest.TestCase):
+
+    def test_cache_miss_is_computed_off_the_event_loop(self):
+        """A rating that must be computed runs in a worker thread, not on the event loop"""
+        store = MemoryArtifactStore()
+        store.put({"model_id": 3, "type": "model", "url": "https://huggingface.co/org/model", "name": "model"})
+        threads = []
+
+        def compute(model_id, item, code_url, dataset_url, fingerprint, refresh=False):
+            threads.append(threading.current_thread())
+            return {"name": "model", "net_score": 0.5}
+
+        async def rate():
+            loop_thread = threading.current_thread()
+            response = await fast_api.rate_model("3", refresh=False, authorization=None, x_authorization=None)
+            return loop_thread, response
+
+        with patch.object(fast_api, "artifact_store", store), \
+                patch.object(fast_api, "_compute_rating", side_effect=compute):
+            loop_thread, response = asyncio.run(rate())
+        self.assertEqual(json.loads(response.body)["net_score"], 0.5)
+        self.assertEqual(len(threads), 1)
+        self.assertIsNot(threads[0], loop_thread)
+
+    def test_refresh_bypasses_the_evaluation_cache(self):
+        """?refresh=true recomputes every metric instead of reusing cached evaluations"""
+        store = MemoryArtifactStore()
+        store.put({"model_id": 3, "type": "model", "url": "https://huggingface.co/org/model", "name": "model"})
+        with patch.object(fast_api, "artifact_store", store), \
+                patch.object(fast_api, "_genai_single_url", return_value=None), \
+                patch.object(fast_api, "populate_model_info"), \
+                patch.object(fast_api, "Model") as model:
+            model.return_value.evaluate.return_value = {"name": "model", "net_score": 0.5}
+            asyncio.run(fast_api.rate_model("3", refresh=False, authorization=None, x_authorization=None))
+            model.return_value.evaluate.assert_called_with(use_cache=True)
+            asyncio.run(fast_api.rate_model("3", refresh=True, authorization=None, x_authorization=None))
+            model.return_value.evaluate.assert_called_with(use_cache=False)
@@ -0,0 +1,38 @@
+import json
+import unittest
+from decimal import Decimal
+from unittest.mock import patch
+
+from apis import responses
+
+
+class TestFastJSONResponse(unittest.TestCase):
+
+    def test_renders_decimals(self):
+        """DynamoDB Decimals serialize as plain numbers"""
+        body = responses.FastJSONResponse(content=[{"id": Decimal("1731000000123"), "score": Decimal("0.5")}]).body
+        self.assertEqual(json.loads(body), [{"id": 1731000000123, "score": 0.5}])
+
+    def test_stdlib_fallback_matches(self):
+        content = {"name": "bért", "id": Decimal(3), "tags": ["a"]}
+        fast = responses.dumps(content)
+        with patch.object(responses, "orjson", None):
+            fallback = responses.dumps(content)
+        self.assertEqual(json.loads(fast), json.loads(fallback))
+
+
+class TestResponseShape(unittest.TestCase):
+
+    def test_build_fills_defaults_and_ignores_extras(self):
+        shape = responses.ResponseShape({"name": "string", "net_score": 0, "size_score": {"aws_server": 0}})
+        first = shape.build({"net_score": 0.7, "unknown": 1}, name="bert")
+        self.assertEqual(first, {"name": "bert", "net_score": 0.7, "size_score": {"aws_server": 0}})
+        self.assertEqual(list(first), ["name", "net_score", "size_score"])
+
+        # Nested defaults are not shared between responses
+        first["size_score"]["aws_server"] = 1
+        self.assertEqual(shape.build({})["size_score"], {"aws_server": 0})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,135 @@
+import json
+import re
+import struct
+import tempfile
+import threading
+import unittest
+from unittest.mock import patch
+
+from metrics import size_score
+from utils import safetensors_header
+from utils.disk_cache import DiskCache
+
+
+def _safetensors(tensors, padding=0):
+    header = json.dumps({"__metadata__": {"format": "pt"}, **tensors}).encode() + b" " * padding
+    return struct.pack("<Q", len(header)) + header + b"\0" * (1 << 20)  # weights are never read
+
+
+class _Response:
+    def __init__(self, body, status):
+        self.body, self.status_code = body, status
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    def iter_content(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            yield self.body[i:i + chunk_size]
+
+
+class _RangeSession:
+    """Serves in-memory files, honouring Range unless ignore_range is set."""
+
+    def __init__(self, files, ignore_range=False):
+        self.files, self.ignore_range = files, ignore_range
+        self.ranges = []
+        self.lock = threading.Lock()
+
+    def get(self, url, headers, stream, timeout):
+        data = self.files[url.rsplit("/", 1)[-1]]
+        start, end = map(int, re.match(r"bytes=(\d+)-(\d+)", headers["Range"]).groups())
+        with self.lock:
+            self.ranges.append((url.rsplit("/", 1)[-1], start, end))
+        if self.ignore_range:
+            return _Response(data, 200)
+        return _Response(data[start:end + 1], 206)
+
+
+class TestSafetensorsHeader(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        patcher = patch.object(safetensors_header, "_cache", DiskCache("safetensors", root=tmp.name))
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.files = {
+            "model-00001-of-00002.safetensors": _safetensors({
+                "embed.weight": {"dtype": "BF16", "shape": [1000, 64], "data_offsets": [0, 0]},
+                "norm.weight": {"dtype": "F32", "shape": [64], "data_offsets": [0, 0]},
+            }),
+            # Header larger than the prefetch window needs a second range read
+            "model-00002-of-00002.safetensors": _safetensors({
+                "lm_head.weight": {"dtype": "BF16", "shape": [64, 1000], "data_offsets": [0, 0]},
+            }, padding=safetensors_header.HEADER_PREFETCH_BYTES),
+        }
+        self.filenames = ["config.json", *self.files]
+
+    def test_counts_parameters_per_shard_and_dtype(self):
+        session = _RangeSession(self.files)
+        result = safetensors_header.analyze_safetensors("org/model", "abc123", self.filenames, session=session)
+        self.assertEqual(result["parameters"], 128064)
+        self.assertEqual(result["dtypes"], {"BF16": 128000, "F32": 64})
+        self.assertEqual(result["shards"]["model-00001-of-00002.safetensors"]["parameters"], 64064)
+        # Only header bytes are requested, never config.json or the weights
+        self.assertEqual(len(session.ranges), 3)
+        fetched = sum(end - start + 1 for _, start, end in session.ranges)
+        self.assertTrue(all(filename.endswith(".safetensors") for filename, _, _ in session.ranges))
+        self.assertLess(fetched, 4 * safetensors_header.HEADER_PREFETCH_BYTES)
+
+    def test_result_is_cached_by_sha(self):
+        session = _RangeSession(self.files)
+        first = safetensors_header.analyze_safetensors("org/model", "abc123", self.filenames, session=session)
+        requests_made = len(session.ranges)
+        self.assertEqual(
+            safetensors_header.analyze_safetensors("org/model", "abc123", self.filenames, session=session), first)
+        self.assertEqual(len(session.ranges), requests_made)
+        safetensors_header.analyze_safetensors("org/model", "def456", self.filenames, session=session)
+        self.assertGreater(len(session.ranges), requests_made)
+
+    def test_server_ignoring_range(self):
+        session = _RangeSession(self.files, ignore_range=True)
+        result = safetensors_header.analyze_safetensors("org/model", "abc123", self.filenames, session=session)
+        self.assertEqual(result["parameters"], 128064)
+
+    def test_no_shards_or_bad_header(self):
+        self.assertIsNone(safetensors_header.analyze_safetensors("org/model", "abc123", ["pytorch_model.bin"]))
+        session = _RangeSession({"model.safetensors": struct.pack("<Q", 10 ** 12)})
+        self.assertIsNone(
+            safetensors_header.analyze_safetensors("org/model", "abc123", ["model.safetensors"], session=session))
+
+
+class TestSizeScoreFromParameters(unittest.TestCase):
+
+    def test_smaller_models_score_higher(self):
+        tiny = size_score.score_from_parameters(0.004)
+        small = size_score.score_from_parameters(0.11)
+        large = size_score.score_from_parameters(70)
+        self.assertEqual(tiny, {"raspberry_pi": 1.0, "jetson_nano": 1.0, "desktop_pc": 1.0, "aws_server": 1.0})
+        for plat in size_score.PLATFORM_SIZE_LIMITS:
+            self.assertGreaterEqual(small[plat], large[plat])
+        self.assertEqual(large["raspberry_pi"], 0.01)
+        self.assertGreater(large["aws_server"], 0.01)
+
+    def test_uses_safetensors_count_before_file_sizes(self):
+        info = {"sha": "abc", "siblings": [{"rfilename": "model.safetensors"}]}
+        with patch.object(size_score, "HFClient") as client, \
+                patch.object(size_score, "analyze_safetensors",
+                             return_value={"sha": "abc", "parameters": 110_000_000, "dtypes": {}}) as analyze, \
+                patch.object(size_score, "get_size") as get_size:
+            client.return_value.model_info.return_value = info
+            result = size_score.size_score("org/model")
+        analyze.assert_called_once_with("org/model", "abc", ["model.safetensors"])
+        get_size.assert_not_called()
+        self.assertEqual(result, size_score.score_from_parameters(0.11))
+
+
+if __name__ == "__main__":
+    unittest.main()
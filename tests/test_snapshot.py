@@ -0,0 +1,86 @@
+import dataclasses
+import gzip
+import os
+import tempfile
+import types
+import unittest
+from unittest.mock import MagicMock, patch
+
+from apis import git_api, hf_client
+from apis.hf_client import HFClient
+from utils import snapshot
+
+
+@dataclasses.dataclass
+class _Sibling:
+    rfilename: str
+
+
+class TestSnapshot(unittest.TestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.addCleanup(snapshot.configure, None)
+        self.addCleanup(hf_client.clear_cache)
+        self.dir = tmp.name
+
+    def _replay(self):
+        snapshot.write_manifest(llm_provider="purdue_genai")
+        hf_client.clear_cache()
+        snapshot.configure(snapshot.REPLAY, self.dir)
+
+    def test_hf_calls_replay_without_network(self):
+        snapshot.configure(snapshot.RECORD, self.dir)
+        with patch("apis.hf_client.HfApi") as api:
+            api.return_value.model_info.return_value = types.SimpleNamespace(
+                sha="abc", siblings=[_Sibling("model.safetensors")])
+            recorded = HFClient().model_info("org/model")
+        self._replay()
+        with patch("apis.hf_client.HfApi") as api:
+            replayed = HFClient().model_info("org/model")
+            api.return_value.model_info.assert_not_called()
+        self.assertEqual(replayed, {"sha": "abc", "siblings": [{"rfilename": "model.safetensors"}]})
+        self.assertEqual(replayed, recorded)
+        self.assertEqual(snapshot.load_manifest(self.dir)["recorded"], 1)
+
+    @patch("apis.git_api.requests.get")
+    def test_http_responses_replay_without_credentials(self, mock_get):
+        mock_get.return_value = MagicMock(status_code=200, headers={"ETag": "x"}, text="a" * 40,
+                                          url="https://api.github.com/repos/org/repo/commits/HEAD")
+        snapshot.configure(snapshot.RECORD, self.dir)
+        with patch.dict(os.environ, {"GITHUB_TOKEN": "secret-token"}):
+            self.assertEqual(git_api.get_head_sha("org/repo"), "a" * 40)
+        self._replay()
+        mock_get.reset_mock()
+        self.assertEqual(git_api.get_head_sha("org/repo"), "a" * 40)
+        mock_get.assert_not_called()
+
+        for directory, _, files in os.walk(self.dir):
+            for name in files:
+                if name.endswith(".json.gz"):
+                    with gzip.open(os.path.join(directory, name), "rt") as f:
+                        self.assertNotIn("secret-token", f.read())
+
+    def test_missing_entry_fails_like_a_network_error(self):
+        snapshot.configure(snapshot.RECORD, self.dir)
+        self._replay()
+        fetch = MagicMock()
+        with self.assertRaises(snapshot.SnapshotMissError):
+            snapshot.cached_call("hf_model_card", "org/unknown", fetch)
+        fetch.assert_not_called()
+        # HFClient reports the miss as an unavailable card
+        self.assertIsNone(HFClient().model_card_text("org/unknown"))
+        self.assertEqual(snapshot.stats()["missed"], 2)
+
+    def test_replay_requires_a_snapshot(self):
+        with self.assertRaises(FileNotFoundError):
+            snapshot.configure(snapshot.REPLAY, self.dir)
+
+    def test_live_mode_stores_nothing(self):
+        self.assertEqual(snapshot.cached_call("hf_model_card", "org/model", lambda: "text"), "text")
+        self.assertEqual(os.listdir(self.dir), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,63 @@
+import asyncio
+import unittest
+
+from utils import telemetry
+
+
+class TestTelemetry(unittest.TestCase):
+
+    def test_histogram_exposition(self):
+        """Buckets are cumulative and end with +Inf, _sum and _count"""
+        registry = telemetry.Registry()
+        hist = registry.register(telemetry.Histogram("job_seconds", "Job time.", ("kind",), buckets=(0.1, 1.0)))
+        for value in (0.05, 0.5, 5.0):
+            hist.observe(value, kind="a")
+        text = registry.render()
+        self.assertIn("# TYPE job_seconds histogram", text)
+        self.assertIn('job_seconds_bucket{kind="a",le="0.1"} 1', text)
+        self.assertIn('job_seconds_bucket{kind="a",le="1"} 2', text)
+        self.assertIn('job_seconds_bucket{kind="a",le="+Inf"} 3', text)
+        self.assertIn('job_seconds_sum{kind="a"} 5.55', text)
+        self.assertIn('job_seconds_count{kind="a"} 3', text)
+
+    def test_label_escaping_and_validation(self):
+        counter = telemetry.Counter("c_total", "C.", ("route",))
+        counter.inc(route='a"b')
+        self.assertIn('c_total{route="a\\"b"} 1', counter.render())
+        with self.assertRaises(ValueError):
+            counter.inc(path="/")
+
+    def test_track_call_records_outcome(self):
+        before_ok = telemetry.EXTERNAL_CALLS.value(service="test", operation="op", outcome="ok")
+        with telemetry.track_call("test", "op"):
+            pass
+        with self.assertRaises(RuntimeError):
+            with telemetry.track_call("test", "op"):
+                raise RuntimeError("boom")
+        self.assertEqual(telemetry.EXTERNAL_CALLS.value(service="test", operation="op", outcome="ok"), before_ok + 1)
+        self.assertGreaterEqual(telemetry.EXTERNAL_CALLS.value(service="test", operation="op", outcome="error"), 1)
+
+    def test_observe_latencies(self):
+        before = telemetry.EVALUATION_DURATION.count(metric="license")
+        telemetry.observe_latencies({"license_latency": 120, "size_score_latency": 40})
+        self.assertEqual(telemetry.EVALUATION_DURATION.count(metric="license"), before + 1)
+
+    def test_middleware_labels_route_and_status(self):
+        async def app(scope, receive, send):
+            scope["endpoint"] = "handler"
+            await send({"type": "http.response.start", "status": 404})
+            await send({"type": "http.response.body", "body": b""})
+
+        async def send(message):
+            pass
+
+        middleware = telemetry.MetricsMiddleware(app, route_name=lambda scope: "/things/{id}")
+        labels = {"method": "GET", "route": "/things/{id}", "status": "404"}
+        before = telemetry.HTTP_REQUESTS.value(**labels)
+        asyncio.run(middleware({"type": "http", "method": "GET", "path": "/things/1"}, None, send))
+        self.assertEqual(telemetry.HTTP_REQUESTS.value(**labels), before + 1)
+        self.assertEqual(telemetry.HTTP_IN_FLIGHT.value(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Small on-disk JSON cache shared by the CLI and the API.
+
+Entries live under MODELREUSE_CACHE_DIR (default ./.cache), one file per key
+in a directory per namespace. File names are a hash of the key, so any string
+(repo ids, URLs, commit shas) can be used as a key. Writes go to a temporary
+file that is then renamed, so concurrent readers never see a partial entry.
+Entries are only as fresh as their key: callers put a commit sha, ETag or
+version in the key rather than relying on expiry.
+"""
+
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from typing import Any, Optional
+
+
+logger = logging.getLogger('cli_logger')
+
+MODELREUSE_CACHE_DIR = os.getenv("MODELREUSE_CACHE_DIR", ".cache")
+
+
+class DiskCache:
+    def __init__(self, namespace: str, root: Optional[str] = None) -> None:
+        """
+        Args:
+            namespace (str): sub-directory holding this cache's entries
+            root (str): cache root; defaults to MODELREUSE_CACHE_DIR
+        """
+        self.directory = os.path.join(root or MODELREUSE_CACHE_DIR, namespace)
+
+    def _path(self, key: str) -> str:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, f"{digest}.json")
+
+    def get(self, key: str) -> Optional[Any]:
+        """Cached value for `key`, or None if missing or unreadable."""
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                return json.load(f)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError) as e:
+            logger.debug(f"Ignoring unreadable cache entry for {key}: {e}")
+            return None
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a JSON-serializable value; failures are logged, not raised."""
+        tmp = None
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(dir=self.directory, suffix=".tmp")
+            with os.fdopen(fd, "w", encoding="utf-8") as f:
+                json.dump(value, f)
+            os.replace(tmp, self._path(key))
+        except (OSError, TypeError, ValueError) as e:
+            logger.debug(f"Failed to write cache entry for {key}: {e}")
+            if tmp and os.path.exists(tmp):
+                os.remove(tmp)
+
+    def delete(self, key: str) -> None:
+        try:
+            os.remove(self._path(key))
+        except FileNotFoundError:
+            pass
@@ -6,10 +6,13 @@ import logging
 logger = logging.getLogger('cli_logger')
 
 
-def check_environment() -> bool:
+def check_environment(offline: bool = False) -> bool:
     '''
         Function to check the validity of the GITHUB_TOKEN and if the LOG_FILE path exists.
 
+        Args:
+            offline (bool): replaying a snapshot; GitHub is never called, so no token is needed
+
         Returns:
             bool: True if GitHub token is valid and log file exists or was created, False otherwise.
     '''
@@ -26,6 +29,9 @@ def check_environment() -> bool:
     except:
         return False
 
+    if offline:
+        return True
+
     if not git_token:
         # logger.error("GITHUB_TOKEN environment variable is not set.")
         return False
@@ -0,0 +1,360 @@
+"""
+Evaluation cache keyed by the revisions a model evaluation reads.
+
+Before scoring, Model.evaluate() resolves the current commit sha of the
+Hugging Face model, of the linked GitHub repository's HEAD and of the linked
+Hugging Face dataset. That takes one cheap request each, made concurrently.
+When every input resolves, the full result is looked up in a local DiskCache
+under those shas plus metrics_version(): a hash of the metric source code, of
+the helper modules the metrics call into, and of the settings that change
+scores (bus factor mode, history window, LLM provider). Editing a metric, a
+helper or the net score formula, or changing a setting, invalidates old
+entries. If any input can't be pinned to a sha (a GitLab link, an API outage,
+a missing token), the cache is bypassed rather than risk serving a stale score.
+An evaluation in which a metric fell back to a default score (see
+utils.metric_failures) is not stored.
+
+When the full result misses, evaluation is incremental: every metric module
+declares the inputs it reads (INPUTS, names from INPUT_READERS) and the
+settings it depends on (CONFIG, names from SETTINGS). The last result for the
+same model and links is kept as a record holding each metric's value,
+latency, whether it succeeded, its version (module source, helper modules and
+declared settings) and a content hash of each of its inputs. Only the inputs
+some metric declares are read, and only metrics that failed last time or
+whose input hashes or version changed are recomputed. The rest are reused
+with their original latencies.
+
+Stored evaluations and per-metric values expire after EVAL_CACHE_TTL seconds,
+so scores that depend on more than the pinned inputs (LLM grading, link
+liveness) are eventually recomputed. Set EVAL_CACHE=0 to always recompute. Snapshot export and offline runs also
+bypass the cache, so every input is fetched (or replayed) and scored.
+"""
+
+import functools
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+from apis.git_api import get_contributors, get_head_sha
+from apis.hf_client import HFClient
+from cloning.git_history import GIT_HISTORY_DAYS
+from metrics.bus_factor import BUS_FACTOR_MODE
+from utils import snapshot
+from utils.disk_cache import DiskCache
+from utils.prompt_key import prompt_provider
+
+
+logger = logging.getLogger('cli_logger')
+
+EVAL_CACHE = os.getenv("EVAL_CACHE", "true").lower() in ("1", "true", "yes")
+EVAL_CACHE_TTL = float(os.getenv("EVAL_CACHE_TTL", "86400"))  # seconds; default to one day
+
+_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Modules the metrics read their inputs through
+HELPER_SOURCES = (
+    "apis/hf_client.py", "apis/git_api.py", "apis/gemini.py", "apis/purdue_genai.py",
+    "cloning/git_history.py", "utils/liveness.py", "utils/prompt_key.py", "utils/safetensors_header.py",
+)
+# Source that decides a score: the metric modules, their helpers and the Model wiring / net score formula
+METRIC_SOURCES = ("metrics", "model.py") + HELPER_SOURCES
+
+# Settings that change a score without any source change; metric modules name theirs in CONFIG
+SETTINGS: Dict[str, Callable[[], Any]] = {
+    "bus_factor_mode": lambda: BUS_FACTOR_MODE,
+    "git_history_days": lambda: GIT_HISTORY_DAYS,
+    "llm_provider": prompt_provider,
+}
+
+# utils.url_parser imports model, so the two URL shapes needed here are matched locally
+_GITHUB_REPO = re.compile(r"github\.com/([^/]+/[^/?#]+?)(?:\.git)?(?:[/?#]|$)", re.IGNORECASE)
+_HF_DATASET = re.compile(r"huggingface\.co/datasets/([^/?#]+(?:/[^/?#]+)?)", re.IGNORECASE)
+
+_cache = DiskCache("evaluations")
+_records = DiskCache("evaluation_records")
+
+
+def cache_enabled() -> bool:
+    return EVAL_CACHE and snapshot.mode() is None
+
+
+@functools.lru_cache(maxsize=1)
+def settings() -> Dict[str, Any]:
+    """Current value of every entry of SETTINGS, read once per process."""
+    return {name: read() for name, read in SETTINGS.items()}
+
+
+def _source_paths(sources: Iterable[str]) -> List[str]:
+    """Python files of `sources` (files or directories relative to the repo root), sorted."""
+    paths = []
+    for source in sources:
+        full = os.path.join(_ROOT, source)
+        if os.path.isdir(full):
+            for directory, _, files in os.walk(full):
+                paths.extend(os.path.join(directory, f) for f in files if f.endswith(".py"))
+        elif os.path.exists(full):
+            paths.append(full)
+    return sorted(paths)
+
+
+@functools.lru_cache(maxsize=1)
+def metrics_version() -> str:
+    """Hash of the metric source code, its helpers and the score settings; part of every cache key."""
+    digest = hashlib.sha256()
+    for path in _source_paths(METRIC_SOURCES):
+        digest.update(os.path.relpath(path, _ROOT).encode("utf-8"))
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    digest.update(json.dumps(settings(), sort_keys=True).encode("utf-8"))
+    return digest.hexdigest()[:16]
+
+
+def _model_sha(model_id: str) -> Optional[str]:
+    return HFClient().model_info(model_id).get("sha")
+
+
+def _dataset_sha(url: str) -> Optional[str]:
+    match = _HF_DATASET.search(url)
+    return HFClient().dataset_info(match.group(1)).get("sha") if match else None
+
+
+def _code_sha(url: str) -> Optional[str]:
+    match = _GITHUB_REPO.search(url)
+    return get_head_sha(match.group(1)) if match else None
+
+
+def resolve_revisions(model) -> Optional[Dict[str, Any]]:
+    """
+    Current revisions of everything `model`'s evaluation reads.
+
+    Returns:
+        dict: model id plus model/code/dataset urls and shas, or None if any
+        linked input could not be resolved to a sha
+    """
+    code_url = model.code.getURL() if model.code else None
+    dataset_url = model.dataset.getURL() if model.dataset else None
+    if not model.id:
+        return None
+
+    with ThreadPoolExecutor(max_workers=3) as pool:
+        model_sha = pool.submit(_model_sha, model.id)
+        code_sha = pool.submit(_code_sha, code_url) if code_url else None
+        dataset_sha = pool.submit(_dataset_sha, dataset_url) if dataset_url else None
+        revisions = {
+            "model": model.id,
+            "model_sha": model_sha.result(),
+            "code": code_url,
+            "code_sha": code_sha.result() if code_sha else None,
+            "dataset": dataset_url,
+            "dataset_sha": dataset_sha.result() if dataset_sha else None,
+        }
+
+    unresolved = [
+        field for field, url in (("model", model.id), ("code", code_url), ("dataset", dataset_url))
+        if url and not revisions[f"{field}_sha"]
+    ]
+    if unresolved:
+        logger.info(f"Evaluation cache bypassed for {model.id}: no sha for {', '.join(unresolved)}")
+        return None
+    return revisions
+
+
+def evaluation_key(model) -> Optional[str]:
+    """Cache key for `model`'s evaluation, or None if the cache must be bypassed."""
+    try:
+        revisions = resolve_revisions(model)
+    except Exception as e:
+        logger.info(f"Evaluation cache bypassed for {model.id}: {e}")
+        return None
+    if revisions is None:
+        return None
+    return json.dumps({**revisions, "metrics_version": metrics_version()}, sort_keys=True)
+
+
+def load_evaluation(key: str) -> Optional[Dict[str, Any]]:
+    """Stored result for `key`, or None if missing or older than EVAL_CACHE_TTL."""
+    entry = _cache.get(key)
+    if not isinstance(entry, dict) or time.time() - entry.get("stored_at", 0) >= EVAL_CACHE_TTL:
+        return None
+    return entry.get("result")
+
+
+def store_evaluation(key: str, result: Dict[str, Any]) -> None:
+    _cache.set(key, {"stored_at": time.time(), "result": result})
+
+
+def _hash(value: Any) -> str:
+    return hashlib.sha256(json.dumps(value, sort_keys=True, default=str).encode("utf-8")).hexdigest()[:16]
+
+
+def source_version(module) -> str:
+    """Hash of one metric module's source file."""
+    return _file_version(module.__file__)
+
+
+@functools.lru_cache(maxsize=1)
+def helpers_version() -> str:
+    """Hash of the HELPER_SOURCES files."""
+    return _hash([(os.path.relpath(path, _ROOT), _file_version(path)) for path in _source_paths(HELPER_SOURCES)])
+
+
+def metric_version(module) -> str:
+    """Version of one metric: its module source, the helper modules and the settings it names in CONFIG."""
+    current = settings()
+    config = {name: current[name] for name in module.CONFIG}
+    return _hash([source_version(module), helpers_version(), config])
+
+
+@functools.lru_cache(maxsize=None)
+def _file_version(path: str) -> str:
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()[:16]
+
+
+class _InputReader:
+    """Reads metric inputs for one model, sharing the model_info call between them."""
+
+    def __init__(self, model) -> None:
+        self.model = model
+        self.code_url = model.code.getURL() if model.code else None
+        self.dataset_url = model.dataset.getURL() if model.dataset else None
+        self._info: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+
+    def model_info(self) -> Dict[str, Any]:
+        with self._lock:
+            if self._info is None:
+                self._info = HFClient().model_info(self.model.id)
+            return self._info
+
+    def card(self) -> Any:
+        return HFClient().model_card_text(self.model.id)
+
+    def file_tree(self) -> Any:
+        siblings = self.model_info().get("siblings") or []
+        return sorted(getattr(s, "rfilename", None) or (s.get("rfilename") if isinstance(s, dict) else str(s))
+                      for s in siblings)
+
+    def license(self) -> Any:
+        info = self.model_info()
+        card = info.get("card_data") or {}
+        declared = card.get("license") if isinstance(card, dict) else getattr(card, "license", None)
+        tags = sorted(t for t in info.get("tags") or [] if str(t).startswith("license:"))
+        return [info.get("license"), declared, tags]
+
+    def contributors(self) -> Any:
+        match = _GITHUB_REPO.search(self.code_url or "")
+        if not match:
+            return [self.model.url, self.code_url]  # scored by the LLM from the URLs
+        return sorted((c.get("login"), c.get("contributions")) for c in get_contributors(match.group(1)) or [])
+
+    def code(self) -> Any:
+        sha = _code_sha(self.code_url) if self.code_url else None
+        return [self.code_url, sha]
+
+    def dataset_card(self) -> Any:
+        match = _HF_DATASET.search(self.dataset_url or "")
+        if not match:
+            return self.dataset_url
+        return HFClient().dataset_card_text(match.group(1))
+
+    def dataset_info(self) -> Any:
+        # Any commit to the dataset repo (metadata, split files) changes its sha
+        if not _HF_DATASET.search(self.dataset_url or ""):
+            return self.dataset_url
+        sha = _dataset_sha(self.dataset_url)
+        if not sha:
+            raise ValueError(f"no sha for {self.dataset_url}")
+        return [self.dataset_url, sha]
+
+    def links(self) -> Any:
+        return [self.model.url, self.code_url, self.dataset_url]
+
+
+INPUT_READERS: Dict[str, Callable[[_InputReader], Any]] = {
+    "card": _InputReader.card,
+    "file_tree": _InputReader.file_tree,
+    "license": _InputReader.license,
+    "contributors": _InputReader.contributors,
+    "code": _InputReader.code,
+    "dataset_card": _InputReader.dataset_card,
+    "dataset_info": _InputReader.dataset_info,
+    "links": _InputReader.links,
+}
+
+
+def input_fingerprints(model, names: Iterable[str]) -> Dict[str, Optional[str]]:
+    """
+    Content hashes of the named inputs, read concurrently.
+
+    Returns:
+        dict: input name -> hash, or None for an input that could not be read
+        (metrics depending on it are always recomputed)
+    """
+    reader = _InputReader(model)
+    names = sorted(set(names))
+
+    def fingerprint(name: str) -> Optional[str]:
+        try:
+            return _hash(INPUT_READERS[name](reader))
+        except Exception as e:
+            logger.info(f"Failed to read input {name} for {model.id}: {e}")
+            return None
+
+    with ThreadPoolExecutor(max_workers=max(1, len(names))) as pool:
+        return dict(zip(names, pool.map(fingerprint, names)))
+
+
+def _record_key(model) -> str:
+    return json.dumps({
+        "model": model.id,
+        "code": model.code.getURL() if model.code else None,
+        "dataset": model.dataset.getURL() if model.dataset else None,
+    }, sort_keys=True)
+
+
+def load_record(model) -> Dict[str, Any]:
+    """Per-metric record of the last evaluation of `model` with the same links ({} if none)."""
+    return _records.get(_record_key(model)) or {}
+
+
+def store_record(model, record: Dict[str, Any]) -> None:
+    _records.set(_record_key(model), record)
+
+
+def stale_metrics(record: Dict[str, Any], versions: Dict[str, str], inputs: Dict[str, Iterable[str]],
+                  fingerprints: Dict[str, Optional[str]]) -> List[str]:
+    """
+    Metrics that must be recomputed.
+
+    Args:
+        record (dict): load_record() result
+        versions (dict): metric -> metric_version() of its module
+        inputs (dict): metric -> declared input names
+        fingerprints (dict): input_fingerprints() result
+
+    Returns:
+        list: metrics with no usable record entry, an entry that failed or is
+        older than EVAL_CACHE_TTL, a changed version, or an input that
+        changed or could not be read
+    """
+    now = time.time()
+    stale = []
+    for metric, names in inputs.items():
+        entry = record.get(metric)
+        current = {name: fingerprints.get(name) for name in names}
+        if (
+            not entry
+            or not entry.get("ok")
+            or now - entry.get("computed_at", 0) >= EVAL_CACHE_TTL
+            or entry.get("version") != versions[metric]
+            or None in current.values()
+            or entry.get("inputs") != current
+        ):
+            stale.append(metric)
+    return stale
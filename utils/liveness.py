@@ -0,0 +1,126 @@
+"""
+Concurrent, cached URL liveness checks.
+
+dataset_and_code_score only needs to know whether a model's code, dataset
+and model URLs resolve. LivenessChecker probes them in parallel over one
+pooled requests.Session, follows at most LIVENESS_MAX_REDIRECTS redirects,
+and remembers each answer. Live URLs are kept for LIVENESS_TTL seconds and
+dead ones for the shorter LIVENESS_NEGATIVE_TTL, so a transient outage is
+retried soon. Models sharing links (and concurrent probes of the same URL)
+cost one request per URL. Every probe's latency is kept on its result and
+reported to telemetry under the URL's host.
+"""
+
+import logging
+import os
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, NamedTuple, Optional
+from urllib.parse import urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from utils import snapshot
+from utils.telemetry import track_call
+
+
+logger = logging.getLogger('cli_logger')
+
+LIVENESS_TIMEOUT = float(os.getenv("LIVENESS_TIMEOUT", "5"))
+LIVENESS_TTL = float(os.getenv("LIVENESS_TTL", "3600"))
+LIVENESS_NEGATIVE_TTL = float(os.getenv("LIVENESS_NEGATIVE_TTL", "300"))
+LIVENESS_MAX_REDIRECTS = int(os.getenv("LIVENESS_MAX_REDIRECTS", "5"))
+LIVENESS_WORKERS = int(os.getenv("LIVENESS_WORKERS", "8"))
+# Statuses counted as live: the final response, or a redirect beyond the limit
+LIVE_STATUSES = (200, 301, 302)
+
+
+class Probe(NamedTuple):
+    alive: bool
+    status_code: Optional[int]
+    latency_ms: int
+    checked_at: float
+
+
+class LivenessChecker:
+    def __init__(self, timeout: float = LIVENESS_TIMEOUT, ttl: float = LIVENESS_TTL,
+                 negative_ttl: float = LIVENESS_NEGATIVE_TTL, max_redirects: int = LIVENESS_MAX_REDIRECTS,
+                 workers: int = LIVENESS_WORKERS) -> None:
+        self.timeout = timeout
+        self.ttl = ttl
+        self.negative_ttl = negative_ttl
+        self.session = requests.Session()
+        self.session.max_redirects = max_redirects
+        adapter = HTTPAdapter(pool_connections=workers, pool_maxsize=workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="liveness")
+        self._results: Dict[str, Probe] = {}
+        self._pending: Dict[str, Future] = {}
+        self._lock = threading.Lock()
+
+    def check(self, urls: Iterable[str]) -> Dict[str, Probe]:
+        """
+        Liveness of each URL, probing those without a fresh cached result concurrently.
+
+        Args:
+            urls (Iterable[str]): URLs to check; blank entries are skipped
+
+        Returns:
+            dict: url -> Probe
+        """
+        futures = {url: self._submit(url) for url in dict.fromkeys(u.strip() for u in urls if u and u.strip())}
+        return {url: future.result() for url, future in futures.items()}
+
+    def _submit(self, url: str) -> Future:
+        now = time.monotonic()
+        with self._lock:
+            probe = self._results.get(url)
+            if probe is not None and now - probe.checked_at < (self.ttl if probe.alive else self.negative_ttl):
+                done: Future = Future()
+                done.set_result(probe)
+                return done
+            future = self._pending.get(url)
+            if future is None:
+                future = self._pool.submit(self._probe, url)
+                self._pending[url] = future
+            return future
+
+    def _probe(self, url: str) -> Probe:
+        start = time.perf_counter()
+        status = None
+        try:
+            with track_call("liveness", urlparse(url).netloc or "unknown"):
+                response = snapshot.request("HEAD", url, session=self.session,
+                                            timeout=self.timeout, allow_redirects=True)
+            status = response.status_code
+        except requests.TooManyRedirects as e:
+            status = e.response.status_code if e.response is not None else None
+            logger.debug(f"Stopped following redirects for {url} after {self.session.max_redirects}")
+        except Exception as e:
+            logger.debug(f"Failed to check URL {url}: {e}")
+        probe = Probe(status in LIVE_STATUSES, status, int((time.perf_counter() - start) * 1000), time.monotonic())
+        logger.debug(f"Liveness of {url}: status={status} alive={probe.alive} latency={probe.latency_ms}ms")
+        with self._lock:
+            self._results[url] = probe
+            self._pending.pop(url, None)
+        return probe
+
+    def clear(self) -> None:
+        with self._lock:
+            self._results.clear()
+
+
+_checker: Optional[LivenessChecker] = None
+_checker_lock = threading.Lock()
+
+
+def get_checker() -> LivenessChecker:
+    """Process-wide checker, so results are shared by every evaluation."""
+    global _checker
+    with _checker_lock:
+        if _checker is None:
+            _checker = LivenessChecker()
+        return _checker
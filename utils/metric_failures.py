@@ -0,0 +1,40 @@
+"""
+Per-thread record of metric failures.
+
+Metrics don't raise when an input can't be read or an LLM reply can't be
+parsed; they fall back to a default score (0, 0.5, a heuristic). Such a score
+must not be cached as if it were real. Each fallback calls report(), and
+Model runs every metric inside track(), which collects the reports made by
+its thread. An evaluation with any reported failure is not stored in the
+evaluation cache, and the failed metric is recomputed on the next run.
+"""
+
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List
+
+
+_local = threading.local()
+
+
+@contextmanager
+def track() -> Iterator[List[str]]:
+    """
+    Collect the failures reported by this thread while the block runs.
+
+    Yields:
+        list: reasons passed to report(), in order
+    """
+    previous = getattr(_local, "failures", None)
+    _local.failures = failures = []
+    try:
+        yield failures
+    finally:
+        _local.failures = previous
+
+
+def report(reason: str) -> None:
+    """Record that the running metric fell back to a default; a no-op outside track()."""
+    failures = getattr(_local, "failures", None)
+    if failures is not None:
+        failures.append(reason)
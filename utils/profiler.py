@@ -0,0 +1,172 @@
+"""
+Opt-in sampling profiler for individual API requests.
+
+SamplingProfiler runs a daemon thread that snapshots every thread's Python
+stack with sys._current_frames() at a fixed interval and counts identical
+stacks. Nothing is installed into the profiled code, so the overhead is one
+stack walk per thread per interval, and it is paid only while a profile is
+running.
+
+ProfilingMiddleware profiles a request when PROFILE_ENABLED is set and either
+the request carries the PROFILE_HEADER header or it is picked by
+PROFILE_SAMPLE_RATE. The profile is written in collapsed-stack format (one
+"frame;frame;frame count" line per stack, as consumed by flamegraph.pl and
+speedscope) to PROFILE_DIR/{request_id}.collapsed. Every thread is sampled,
+with the thread name as the root frame, so work the request hands to worker
+threads (such as the parallel metric computation) is included. So is anything
+else the process is doing at the same time.
+"""
+
+import logging
+import os
+import random
+import re
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from typing import Dict, Optional
+
+
+logger = logging.getLogger("api")
+
+PROFILE_ENABLED = os.getenv("PROFILE_ENABLED", "false").lower() in ("1", "true", "yes")
+PROFILE_SAMPLE_RATE = float(os.getenv("PROFILE_SAMPLE_RATE", "0"))
+PROFILE_HEADER = os.getenv("PROFILE_HEADER", "X-Profile")
+PROFILE_DIR = os.getenv("PROFILE_DIR", "./profiles")
+PROFILE_INTERVAL_MS = float(os.getenv("PROFILE_INTERVAL_MS", "5"))
+PROFILE_MAX_CONCURRENT = int(os.getenv("PROFILE_MAX_CONCURRENT", "2"))
+
+_REQUEST_ID_RE = re.compile(r"^[A-Za-z0-9._-]{1,64}$")
+
+
+def _frame_name(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    def __init__(self, interval: float = PROFILE_INTERVAL_MS / 1000.0) -> None:
+        """
+        Args:
+            interval (float): seconds between samples
+        """
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self) -> None:
+        own = threading.get_ident()
+        names = {t.ident: t.name for t in threading.enumerate()}
+        for thread_id, frame in sys._current_frames().items():
+            if thread_id == own:
+                continue
+            stack = []
+            while frame is not None:
+                stack.append(_frame_name(frame))
+                frame = frame.f_back
+            stack.append(names.get(thread_id, f"thread-{thread_id}"))
+            self.stacks[";".join(reversed(stack))] += 1
+        self.samples += 1
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            self._sample()
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="request-profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> Counter:
+        """Stop sampling and return the stack counts."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        return self.stacks
+
+    def collapsed(self) -> str:
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+    def write(self, path: str) -> None:
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.collapsed())
+
+
+class ProfilingMiddleware:
+    def __init__(self, app, enabled: bool = PROFILE_ENABLED, sample_rate: float = PROFILE_SAMPLE_RATE,
+                 header: str = PROFILE_HEADER, directory: str = PROFILE_DIR,
+                 interval: float = PROFILE_INTERVAL_MS / 1000.0,
+                 max_concurrent: int = PROFILE_MAX_CONCURRENT) -> None:
+        """
+        ASGI middleware that profiles selected requests.
+
+        Args:
+            app: the wrapped ASGI app
+            enabled (bool): master switch; nothing is profiled when False
+            sample_rate (float): fraction of requests profiled without the header
+            header (str): request header that asks for a profile ("1"/"true")
+            directory (str): where {request_id}.collapsed files are written
+            interval (float): seconds between stack samples
+            max_concurrent (int): profiles allowed to run at once
+        """
+        self.app = app
+        self.enabled = enabled
+        self.sample_rate = sample_rate
+        self.header = header.lower().encode("latin-1")
+        self.directory = directory
+        self.interval = interval
+        self._slots = threading.BoundedSemaphore(max(1, max_concurrent))
+
+    def _wanted(self, headers: Dict[bytes, bytes]) -> bool:
+        requested = headers.get(self.header, b"").lower() in (b"1", b"true", b"yes")
+        return requested or (self.sample_rate > 0 and random.random() < self.sample_rate)
+
+    @staticmethod
+    def _request_id(headers: Dict[bytes, bytes]) -> str:
+        given = headers.get(b"x-request-id", b"").decode("latin-1")
+        return given if _REQUEST_ID_RE.match(given) else uuid.uuid4().hex
+
+    async def __call__(self, scope, receive, send) -> None:
+        if not self.enabled or scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        headers = dict(scope.get("headers") or [])
+        if not self._wanted(headers) or not self._slots.acquire(blocking=False):
+            await self.app(scope, receive, send)
+            return
+
+        request_id = self._request_id(headers)
+
+        async def send_wrapper(message):
+            if message["type"] == "http.response.start":
+                message = dict(message)
+                message["headers"] = list(message.get("headers") or []) + [
+                    (b"x-request-id", request_id.encode("latin-1"))
+                ]
+            await send(message)
+
+        profiler = SamplingProfiler(self.interval).start()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            profiler.stop()
+            self._slots.release()
+            path = os.path.join(self.directory, f"{request_id}.collapsed")
+            try:
+                profiler.write(path)
+                logger.info(
+                    f"Profiled {scope.get('method')} {scope.get('path')} in "
+                    f"{time.perf_counter() - start:.3f}s ({profiler.samples} samples) -> {path}"
+                )
+            except OSError as e:
+                logger.warning(f"Failed to write profile {path}: {e}")
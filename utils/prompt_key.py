@@ -1,6 +1,6 @@
 import logging
 import sys
-from typing import Dict
+from typing import Dict, Optional
 from apis.gemini import get_gemini_key
 from apis.purdue_genai import get_purdue_genai_key
 
@@ -35,3 +35,17 @@ def get_prompt_key() -> Dict[str, str]:
     if not purdue_genai_token and not gemini_api_key:
         logger.error("No API keys found for Gemini or Purdue GenAI Studio. Exiting.")
         sys.exit(1)
+
+
+def prompt_provider() -> Optional[str]:
+    """
+    Name of the LLM that get_prompt_key() selects, without exiting when there is none.
+
+    Returns:
+        provider (str): "purdue_genai", "gemini", or None if no key is available
+    """
+    if get_purdue_genai_key():
+        return "purdue_genai"
+    if get_gemini_key():
+        return "gemini"
+    return None
@@ -0,0 +1,157 @@
+"""
+Parameter counts for Hugging Face models from their .safetensors headers.
+
+A .safetensors file starts with an 8-byte little-endian header length followed
+by a JSON header that lists every tensor's dtype and shape. Reading just those
+bytes with HTTP Range requests gives exact parameter counts (per shard and per
+dtype) without downloading any weights. Shards are read in parallel, and the
+result is cached on disk under the repo's commit sha, so a model is only read
+again after it changes.
+"""
+
+import json
+import logging
+import os
+import struct
+from concurrent.futures import ThreadPoolExecutor
+from math import prod
+from typing import Any, Dict, Iterable, List, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from apis.hf_client import resolve_hf_token
+from utils import metric_failures, snapshot
+from utils.disk_cache import DiskCache
+from utils.telemetry import track_call
+
+
+logger = logging.getLogger('cli_logger')
+
+HF_RESOLVE_URL = "https://huggingface.co/{repo_id}/resolve/{revision}/{filename}"
+SAFETENSORS_WORKERS = int(os.getenv("SAFETENSORS_WORKERS", "8"))
+SAFETENSORS_TIMEOUT = float(os.getenv("SAFETENSORS_TIMEOUT", "15"))
+# Most headers fit in the first request; larger ones take a second range read
+HEADER_PREFETCH_BYTES = 64 * 1024
+MAX_HEADER_BYTES = 100 * 1024 * 1024  # limit from the safetensors format spec
+
+_cache = DiskCache("safetensors")
+
+
+def _read_range(session: requests.Session, url: str, start: int, end: int, headers: Dict[str, str]) -> bytes:
+    """Bytes start..end (inclusive) of `url`, tolerating servers that ignore Range."""
+    wanted = end - start + 1
+    with session.get(url, headers={**headers, "Range": f"bytes={start}-{end}"},
+                     stream=True, timeout=SAFETENSORS_TIMEOUT) as response:
+        response.raise_for_status()
+        skip = start if response.status_code == 200 else 0
+        data = bytearray()
+        for chunk in response.iter_content(chunk_size=64 * 1024):
+            data.extend(chunk)
+            if len(data) >= skip + wanted:
+                break
+    return bytes(data[skip:skip + wanted])
+
+
+def read_header(session: requests.Session, url: str, headers: Optional[Dict[str, str]] = None) -> Dict[str, Any]:
+    """
+    Fetch and parse the JSON header of a remote .safetensors file.
+
+    Raises:
+        ValueError: if the file is not a valid safetensors file
+        requests.RequestException: on HTTP errors
+    """
+    headers = headers or {}
+    prefix = _read_range(session, url, 0, HEADER_PREFETCH_BYTES - 1, headers)
+    if len(prefix) < 8:
+        raise ValueError(f"{url} is too short to be a safetensors file")
+    (length,) = struct.unpack("<Q", prefix[:8])
+    if length > MAX_HEADER_BYTES:
+        raise ValueError(f"{url} declares a {length}-byte header")
+    raw = prefix[8:8 + length]
+    if len(raw) < length:
+        raw += _read_range(session, url, 8 + len(raw), 8 + length - 1, headers)
+    if len(raw) != length:
+        raise ValueError(f"{url} ended inside its header")
+    return json.loads(raw)
+
+
+def count_parameters(header: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Parameter totals for one parsed header.
+
+    Returns:
+        dict: {"parameters": int, "dtypes": {dtype: parameters}}
+    """
+    dtypes: Dict[str, int] = {}
+    for name, tensor in header.items():
+        if name == "__metadata__":
+            continue
+        dtypes[tensor["dtype"]] = dtypes.get(tensor["dtype"], 0) + prod(tensor["shape"])
+    return {"parameters": sum(dtypes.values()), "dtypes": dtypes}
+
+
+def analyze_safetensors(repo_id: str, sha: str, filenames: Iterable[str],
+                        session: Optional[requests.Session] = None) -> Optional[Dict[str, Any]]:
+    """
+    Exact parameter counts of a model revision from its safetensors shards.
+
+    Args:
+        repo_id (str): Hugging Face model id, e.g. "google-bert/bert-base-uncased"
+        sha (str): commit sha of the revision; also the cache key
+        filenames (Iterable[str]): repo file names; only *.safetensors are read
+        session (requests.Session): optional session to read with
+
+    Returns:
+        dict: {"sha", "parameters", "dtypes", "shards": {filename: {"parameters", "dtypes"}}},
+        or None if the revision has no readable safetensors files
+    """
+    shards = sorted(f for f in filenames if f.endswith(".safetensors"))
+    if not shards or not sha:
+        return None
+    cache_key = f"{repo_id}@{sha}"
+    try:
+        # Recorded around the disk cache so an export captures cache hits too
+        return snapshot.cached_call("safetensors", cache_key, lambda: _analyze(repo_id, sha, shards, session))
+    except snapshot.SnapshotMissError:
+        metric_failures.report(f"safetensors headers of {cache_key} not in the snapshot")
+        return None
+
+
+def _analyze(repo_id: str, sha: str, shards: List[str],
+             session: Optional[requests.Session]) -> Optional[Dict[str, Any]]:
+    cache_key = f"{repo_id}@{sha}"
+    cached = _cache.get(cache_key)
+    if cached is not None:
+        return cached
+
+    own_session = session is None
+    if own_session:
+        session = requests.Session()
+        session.mount("https://", HTTPAdapter(pool_maxsize=SAFETENSORS_WORKERS))
+    token = resolve_hf_token()
+    headers = {"Authorization": f"Bearer {token}"} if token else {}
+
+    def read_shard(filename: str) -> Dict[str, Any]:
+        url = HF_RESOLVE_URL.format(repo_id=repo_id, revision=sha, filename=filename)
+        with track_call("huggingface", "safetensors_header"):
+            return count_parameters(read_header(session, url, headers))
+
+    try:
+        with ThreadPoolExecutor(max_workers=min(SAFETENSORS_WORKERS, len(shards))) as pool:
+            counts = dict(zip(shards, pool.map(read_shard, shards)))
+    except (requests.RequestException, ValueError, KeyError, TypeError) as e:
+        logger.info(f"Failed to read safetensors headers for {repo_id}@{sha}: {e}")
+        metric_failures.report(f"safetensors headers of {repo_id}@{sha} unreadable: {e}")
+        return None
+    finally:
+        if own_session:
+            session.close()
+
+    dtypes: Dict[str, int] = {}
+    for shard in counts.values():
+        for dtype, parameters in shard["dtypes"].items():
+            dtypes[dtype] = dtypes.get(dtype, 0) + parameters
+    result = {"sha": sha, "parameters": sum(dtypes.values()), "dtypes": dtypes, "shards": counts}
+    _cache.set(cache_key, result)
+    return result
@@ -0,0 +1,193 @@
+"""
+Record and replay of the CLI's network calls, for offline evaluation.
+
+Every call the evaluation pipeline makes to Hugging Face, GitHub or an LLM
+goes through cached_call() (or request(), its HTTP form). Normally these just
+make the call. With `--export-snapshot DIR`, each result is also written to
+DIR as gzip-compressed JSON, one file per call. With `--offline DIR`, results
+are read back from DIR and nothing touches the network. A call the snapshot
+does not contain raises SnapshotMissError, a requests ConnectionError, so
+callers handle it like any other network failure.
+
+Keys identify a call by what was asked (repo id, URL, request body), never by
+credentials, and request headers are not stored, so a snapshot holds no
+tokens or API keys.
+"""
+
+import dataclasses
+import datetime
+import gzip
+import hashlib
+import json
+import logging
+import os
+import tempfile
+import threading
+from typing import Any, Callable, Dict, Optional
+
+import requests
+from requests.structures import CaseInsensitiveDict
+
+
+logger = logging.getLogger('cli_logger')
+
+MANIFEST = "manifest.json"
+RECORD = "record"
+REPLAY = "replay"
+
+_mode: Optional[str] = None
+_directory: Optional[str] = None
+_stats = {"recorded": 0, "replayed": 0, "missed": 0}
+_stats_lock = threading.Lock()
+
+
+class SnapshotMissError(requests.exceptions.ConnectionError):
+    """An offline run asked for a call that the snapshot does not contain."""
+
+
+def configure(mode: Optional[str], directory: Optional[str] = None) -> None:
+    """
+    Switch snapshot mode for the process.
+
+    Args:
+        mode (str): RECORD, REPLAY or None (live network, nothing stored)
+        directory (str): snapshot directory
+
+    Raises:
+        FileNotFoundError: if replaying a directory without a manifest
+    """
+    global _mode, _directory
+    if mode not in (None, RECORD, REPLAY):
+        raise ValueError(f"Unknown snapshot mode {mode}")
+    if mode == REPLAY and not os.path.exists(os.path.join(directory, MANIFEST)):
+        raise FileNotFoundError(f"{directory} is not a snapshot (no {MANIFEST})")
+    if mode == RECORD:
+        os.makedirs(directory, exist_ok=True)
+    _mode, _directory = mode, directory
+    with _stats_lock:
+        _stats.update(recorded=0, replayed=0, missed=0)
+
+
+def mode() -> Optional[str]:
+    return _mode
+
+
+def stats() -> Dict[str, int]:
+    with _stats_lock:
+        return dict(_stats)
+
+
+def _count(field: str) -> None:
+    with _stats_lock:
+        _stats[field] += 1
+
+
+def _default(value: Any) -> Any:
+    # huggingface_hub returns dataclasses (RepoSibling, SafeTensorsInfo), card data and datetimes
+    if dataclasses.is_dataclass(value) and not isinstance(value, type):
+        return dataclasses.asdict(value)
+    if isinstance(value, (datetime.datetime, datetime.date)):
+        return value.isoformat()
+    if isinstance(value, (set, frozenset, tuple)):
+        return list(value)
+    if hasattr(value, "to_dict"):
+        return value.to_dict()
+    if hasattr(value, "__dict__"):
+        return vars(value)
+    return str(value)
+
+
+def _path(kind: str, key: str) -> str:
+    digest = hashlib.sha256(f"{kind}\0{key}".encode("utf-8")).hexdigest()
+    return os.path.join(_directory, kind, f"{digest}.json.gz")
+
+
+def _write(path: str, entry: Dict[str, Any]) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+    with os.fdopen(fd, "wb") as raw, gzip.GzipFile(fileobj=raw, mode="wb", mtime=0) as f:
+        f.write(json.dumps(entry, default=_default).encode("utf-8"))
+    os.replace(tmp, path)
+
+
+def cached_call(kind: str, key: str, fn: Callable[[], Any]) -> Any:
+    """
+    Run `fn`, or record / replay its result in snapshot mode.
+
+    Args:
+        kind (str): call type, e.g. "hf_model_info"; also the snapshot sub-directory
+        key (str): identifies the call within its kind (repo id, URL, ...)
+        fn (Callable): makes the call; its result must be JSON-serializable
+            after _default() conversion
+
+    Returns:
+        The call's result. While recording or replaying it is the JSON form of
+        the result (dataclasses become dicts), so both runs see the same values.
+
+    Raises:
+        SnapshotMissError: when replaying a call that was not recorded
+    """
+    if _mode is None:
+        return fn()
+    path = _path(kind, key)
+    if _mode == REPLAY:
+        try:
+            with gzip.open(path, "rt", encoding="utf-8") as f:
+                entry = json.load(f)
+        except FileNotFoundError:
+            _count("missed")
+            logger.warning(f"Offline snapshot has no {kind} entry for {key}")
+            raise SnapshotMissError(f"{kind} {key} is not in the snapshot")
+        _count("replayed")
+        return entry["value"]
+
+    value = json.loads(json.dumps(fn(), default=_default))
+    _write(path, {"kind": kind, "key": key, "value": value})
+    _count("recorded")
+    return value
+
+
+def _response(entry: Dict[str, Any]) -> requests.Response:
+    response = requests.Response()
+    response.status_code = entry["status"]
+    response.headers = CaseInsensitiveDict(entry["headers"])
+    response._content = entry["body"].encode("utf-8")
+    response.encoding = "utf-8"
+    response.url = entry["url"]
+    return response
+
+
+def request(method: str, url: str, session: Optional[requests.Session] = None, **kwargs: Any) -> requests.Response:
+    """
+    requests.get/post/head(url, **kwargs), recorded / replayed in snapshot mode.
+
+    The key is the method, URL and request body; headers (credentials) are
+    neither part of the key nor stored.
+
+    Args:
+        session (requests.Session): optional session to send live requests with
+    """
+    send = getattr(session or requests, method.lower())
+    if _mode is None:
+        return send(url, **kwargs)
+
+    def fetch() -> Dict[str, Any]:
+        response = send(url, **kwargs)
+        return {"status": response.status_code, "headers": dict(response.headers),
+                "body": response.text, "url": response.url}
+
+    key = json.dumps([method.upper(), url, kwargs.get("params"), kwargs.get("json"), kwargs.get("data")],
+                     sort_keys=True, default=str)
+    return _response(cached_call("http", key, fetch))
+
+
+def write_manifest(**fields: Any) -> None:
+    """Finish an export: record what the snapshot holds and how it was made."""
+    manifest = {"created": datetime.datetime.now(datetime.timezone.utc).isoformat(), **stats(), **fields}
+    with open(os.path.join(_directory, MANIFEST), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+
+def load_manifest(directory: str) -> Dict[str, Any]:
+    with open(os.path.join(directory, MANIFEST), "r", encoding="utf-8") as f:
+        return json.load(f)
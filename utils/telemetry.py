@@ -0,0 +1,255 @@
+"""
+In-process metrics in the Prometheus text exposition format.
+
+A small dependency-free registry of counters, gauges and histograms, plus the
+metrics the API exports on GET /metrics:
+
+    http_requests_total / http_request_duration_seconds   per method, route and status
+    http_requests_in_flight                               requests being served
+    external_calls_total / external_call_duration_seconds per service (dynamodb, llm,
+                                                          github, huggingface) and operation
+    evaluation_metric_duration_seconds                    per metric, from Model.latencies
+    clone_cache_requests_total / clone_cache_fetched_bytes_total / clone_cache_evictions_total
+    clone_cache_disk_bytes                                per repository mirror cache
+
+Use track_call() / timed_call() around outbound calls and MetricsMiddleware
+around the ASGI app.
+"""
+
+import bisect
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Any, Awaitable, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    parts = [f'{name}="{_escape(str(value))}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class _Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[str]:
+        raise NotImplementedError
+
+    def render(self) -> str:
+        header = f"# HELP {self.name} {self.documentation}\n# TYPE {self.name} {self.kind}\n"
+        return header + "".join(line + "\n" for line in self.samples())
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> None:
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: Any) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted(self._values.items())
+        return [f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(v)}" for key, v in values]
+
+
+class Gauge(Counter):
+    kind = "gauge"
+
+    def dec(self, amount: float = 1.0, **labels: Any) -> None:
+        self.inc(-amount, **labels)
+
+    def set(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+
+class Histogram(_Metric):
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS) -> None:
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # key -> [per-bucket counts (last is +Inf), sum]
+        self._values: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [[0] * (len(self.buckets) + 1), 0.0]
+            state[0][index] += 1
+            state[1] += value
+
+    def count(self, **labels: Any) -> int:
+        state = self._values.get(self._key(labels))
+        return sum(state[0]) if state else 0
+
+    def samples(self) -> List[str]:
+        with self._lock:
+            values = sorted((key, (list(counts), total)) for key, (counts, total) in self._values.items())
+        lines = []
+        for key, (counts, total) in values:
+            cumulative = 0
+            for bound, count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += count
+                le = f'le="{_format_value(bound)}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {cumulative}")
+        return lines
+
+
+class Registry:
+    def __init__(self) -> None:
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def render(self) -> str:
+        """All registered metrics in the Prometheus text format (version 0.0.4)."""
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "".join(metric.render() for metric in metrics)
+
+
+REGISTRY = Registry()
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+HTTP_REQUESTS = REGISTRY.register(Counter(
+    "http_requests_total", "HTTP requests served.", ("method", "route", "status")))
+HTTP_DURATION = REGISTRY.register(Histogram(
+    "http_request_duration_seconds", "HTTP request latency.", ("method", "route", "status")))
+HTTP_IN_FLIGHT = REGISTRY.register(Gauge(
+    "http_requests_in_flight", "HTTP requests currently being served."))
+EXTERNAL_CALLS = REGISTRY.register(Counter(
+    "external_calls_total", "Calls to external services.", ("service", "operation", "outcome")))
+EXTERNAL_DURATION = REGISTRY.register(Histogram(
+    "external_call_duration_seconds", "Latency of calls to external services.", ("service", "operation")))
+EVALUATION_DURATION = REGISTRY.register(Histogram(
+    "evaluation_metric_duration_seconds", "Time spent computing each evaluation metric.", ("metric",)))
+CLONE_CACHE_REQUESTS = REGISTRY.register(Counter(
+    "clone_cache_requests_total", "Repository mirror lookups (hit, miss or shared).", ("cache", "result")))
+CLONE_CACHE_FETCHED = REGISTRY.register(Counter(
+    "clone_cache_fetched_bytes_total", "Bytes added to repository mirrors by clones and fetches.", ("cache",)))
+CLONE_CACHE_EVICTIONS = REGISTRY.register(Counter(
+    "clone_cache_evictions_total", "Repository mirrors evicted to stay under the disk quota.", ("cache",)))
+CLONE_CACHE_DISK = REGISTRY.register(Gauge(
+    "clone_cache_disk_bytes", "Disk used by repository mirrors after the last eviction pass.", ("cache",)))
+
+
+@contextmanager
+def track_call(service: str, operation: str) -> Iterator[None]:
+    """Count and time one call to an external service; exceptions count as outcome="error"."""
+    start = time.perf_counter()
+    outcome = "error"
+    try:
+        yield
+        outcome = "ok"
+    finally:
+        EXTERNAL_CALLS.inc(service=service, operation=operation, outcome=outcome)
+        EXTERNAL_DURATION.observe(time.perf_counter() - start, service=service, operation=operation)
+
+
+def timed_call(service: str, operation: str) -> Callable:
+    """Decorator form of track_call()."""
+    def decorator(fn: Callable) -> Callable:
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with track_call(service, operation):
+                return fn(*args, **kwargs)
+        return wrapper
+    return decorator
+
+
+def observe_latencies(latencies: Dict[str, Any]) -> None:
+    """
+    Record a Model.latencies dict (milliseconds per "<metric>_latency" key).
+    """
+    for key, millis in latencies.items():
+        if isinstance(millis, (int, float)):
+            metric = key[:-len("_latency")] if key.endswith("_latency") else key
+            EVALUATION_DURATION.observe(millis / 1000.0, metric=metric)
+
+
+class MetricsMiddleware:
+    def __init__(self, app: Callable[..., Awaitable[None]],
+                 route_name: Optional[Callable[[Dict[str, Any]], str]] = None) -> None:
+        """
+        ASGI middleware recording request counts, latency and in-flight requests.
+
+        Args:
+            app: the wrapped ASGI app
+            route_name (Callable): maps a served request's scope to its route
+                template, keeping label cardinality bounded; defaults to the raw path
+        """
+        self.app = app
+        self.route_name = route_name or (lambda scope: scope.get("path", ""))
+
+    async def __call__(self, scope, receive, send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        status = 500
+
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+
+        HTTP_IN_FLIGHT.inc()
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            HTTP_IN_FLIGHT.dec()
+            labels = {"method": scope.get("method", ""), "route": self.route_name(scope), "status": str(status)}
+            HTTP_REQUESTS.inc(**labels)
+            HTTP_DURATION.observe(time.perf_counter() - start, **labels)
@@ -7,6 +7,7 @@ import re
 from typing import List, Tuple, Dict
 from model import Model, Code, Dataset
 import logging
+from apis.hf_client import HFClient
 from apis.purdue_genai import prompt_purdue_genai
 from utils.prompt_key import get_prompt_key
 import logging
@@ -404,6 +405,30 @@ def parse_URL_file(file_path: str) -> Tuple[List[Model], Dict[str, Dataset]]:
     return models, dataset_registry
 
 
+def warm_hf_metadata(models: List[Model], dataset_registry: Dict[str, Dataset]) -> int:
+    """
+    Fetch HuggingFace info and cards for every model and dataset of a parsed batch
+    concurrently, so the metrics read them from HFClient's cache instead of
+    fetching them one model at a time.
+
+    Args:
+        models (List[Model]): Models returned by parse_URL_file
+        dataset_registry (Dict[str, Dataset]): Dataset registry returned by parse_URL_file
+
+    Returns:
+        int: Number of fetches that returned data
+    """
+    model_ids = [model.id for model in models if model.id]
+    datasets = list(dataset_registry.values()) + [model.dataset for model in models if model.dataset]
+    # Datasets identified by the LLM ('check' URLs) are not HuggingFace repos
+    dataset_ids = [dataset.getName() for dataset in datasets
+                   if dataset.getName() and classify_url(dataset.getURL()) == 'dataset']
+    fetched = HFClient().warm_up(model_ids, dataset_ids)
+    logger.info(f"Warmed HuggingFace cache for {len(set(model_ids))} models and {len(set(dataset_ids))} datasets "
+                f"({fetched} fetches returned data)")
+    return fetched
+
+
 def print_model_summary(models: List[Model], dataset_registry: Dict[str, Dataset]) -> None:
     """
     Print a summary of parsed models and dataset registry for debugging